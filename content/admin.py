@@ -1,13 +1,25 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
 from django.utils.html import format_html
+from django.db import IntegrityError, transaction
 from django.db.models import Avg, Count
-from .models import Service, Project, Testimonial
+from django.urls import path, reverse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.utils import timezone
+from .models import Service, Project, Testimonial, BulkActionJob, BackgroundJob, ImageUpload
+from .bulk_actions import start_bulk_action, resume_bulk_action
+from .ordering import InvalidOrdering, reorder_services
+from .uploads import UploadError, complete_upload, verify_upload
 
 @admin.register(Service)
 class ServiceAdmin(admin.ModelAdmin):
     list_display = ['title', 'display_order', 'is_active', 'created_at']
     list_filter = ['is_active', 'created_at']
-    list_editable = ['display_order', 'is_active']
+    # L'ordre se modifie par glisser-déposer (reorder_view) : une seule requête
+    list_editable = ['is_active']
+    change_list_template = 'admin/content/service/change_list.html'
     search_fields = ['title', 'description']
     ordering = ['display_order', 'title']
     
@@ -22,10 +34,73 @@ class ServiceAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related()
+    
+    def get_urls(self):
+        urls = [
+            path(
+                'reorder/',
+                self.admin_site.admin_view(self.reorder_view),
+                name='content_service_reorder',
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def reorder_view(self, request):
+        """Réordonne tous les services par glisser-déposer"""
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        if request.method == 'POST':
+            order = [pk for pk in request.POST.get('order', '').split(',') if pk]
+            try:
+                moved = reorder_services(order)
+            except InvalidOrdering as exc:
+                self.message_user(request, str(exc), level=messages.ERROR)
+                return redirect('admin:content_service_reorder')
+            self.message_user(request, f'{moved} service(s) déplacé(s).')
+            return redirect('admin:content_service_changelist')
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': "Réordonner les services",
+            'services': Service.objects.order_by('display_order', 'title'),
+        }
+        return TemplateResponse(request, 'admin/content/service/reorder.html', context)
+
+
+class ProjectAdminForm(forms.ModelForm):
+    """Image envoyée directement ou par morceaux (widget du formulaire de projet)"""
+    chunked_upload = forms.UUIDField(required=False, widget=forms.HiddenInput)
+
+    class Meta:
+        model = Project
+        fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['image'].required = False
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload_id = cleaned_data.get('chunked_upload')
+        if upload_id:
+            upload = ImageUpload.objects.filter(pk=upload_id, status='pending').first()
+            if upload is None:
+                raise forms.ValidationError("Envoi d'image introuvable ou déjà rattaché.")
+            if upload.offset != upload.size:
+                raise forms.ValidationError("L'envoi de l'image n'est pas terminé.")
+            # Avant toute sauvegarde : un envoi invalide ne crée pas de projet sans image
+            try:
+                verify_upload(upload)
+            except UploadError as exc:
+                raise forms.ValidationError(str(exc))
+        elif not cleaned_data.get('image'):
+            self.add_error('image', "Ce champ est obligatoire.")
+        return cleaned_data
 
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
+    form = ProjectAdminForm
     list_display = ['name', 'completion_date', 'display_technologies', 'has_demo', 'has_github']
     list_filter = ['completion_date', 'created_at']
     search_fields = ['name', 'description', 'technologies']
@@ -33,7 +108,7 @@ class ProjectAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('Informations du projet', {
-            'fields': ('name', 'description', 'image')
+            'fields': ('name', 'description', 'image', 'chunked_upload')
         }),
         ('Technologies et liens', {
             'fields': ('technologies', 'demo_url', 'github_url')
@@ -64,12 +139,39 @@ class ProjectAdmin(admin.ModelAdmin):
             return format_html('<span style="color: green;">✓</span>')
         return format_html('<span style="color: red;">✗</span>')
     has_github.short_description = "GitHub"
+    
+    def save_model(self, request, obj, form, change):
+        """
+        Rattache l'image envoyée par morceaux, vérifiée par le formulaire ;
+        la vue de l'admin est transactionnelle : un échec annule aussi la
+        sauvegarde du projet
+        """
+        super().save_model(request, obj, form, change)
+        upload_id = form.cleaned_data.get('chunked_upload')
+        if upload_id:
+            complete_upload(upload_id, obj, verify=False)
+
+
+class SuspectedDuplicateFilter(admin.SimpleListFilter):
+    """Filtre des témoignages proches d'un témoignage plus ancien (content.minhash)"""
+    title = "doublon suspecté"
+    parameter_name = 'duplicate'
+
+    def lookups(self, request, model_admin):
+        return [('yes', "Oui"), ('no', "Non")]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return queryset.filter(suspected_duplicate_of__isnull=False)
+        if self.value() == 'no':
+            return queryset.filter(suspected_duplicate_of__isnull=True)
+        return queryset
 
 
 @admin.register(Testimonial)
 class TestimonialAdmin(admin.ModelAdmin):
-    list_display = ['author', 'company', 'rating_display', 'is_approved', 'created_at']
-    list_filter = ['is_approved', 'rating', 'created_at', 'company']
+    list_display = ['author', 'company', 'rating_display', 'is_approved', 'duplicate_display', 'created_at']
+    list_filter = ['is_approved', SuspectedDuplicateFilter, 'rating', 'created_at', 'company']
     list_editable = ['is_approved']
     search_fields = ['author', 'company', 'content']
     actions = ['approve_testimonials', 'unapprove_testimonials']
@@ -94,24 +196,105 @@ class TestimonialAdmin(admin.ModelAdmin):
         )
     rating_display.short_description = "Note"
     
+    def duplicate_display(self, obj):
+        """Lien vers le témoignage d'origine (identifiant seul : aucune requête)"""
+        if obj.suspected_duplicate_of_id is None:
+            return ''
+        url = reverse('admin:content_testimonial_change', args=[obj.suspected_duplicate_of_id])
+        return format_html('<a href="{}">Doublon de n°{}</a>', url, obj.suspected_duplicate_of_id)
+    duplicate_display.short_description = "Doublon suspecté"
+    
     def approve_testimonials(self, request, queryset):
         """Action pour approuver les témoignages sélectionnés"""
-        updated = queryset.update(is_approved=True)
-        self.message_user(
-            request, 
-            f'{updated} témoignage(s) approuvé(s) avec succès.'
-        )
+        self._start_bulk_action(request, queryset, 'approve', 'approuvé(s)')
     approve_testimonials.short_description = "Approuver les témoignages sélectionnés"
     
     def unapprove_testimonials(self, request, queryset):
         """Action pour désapprouver les témoignages sélectionnés"""
-        updated = queryset.update(is_approved=False)
-        self.message_user(
-            request, 
-            f'{updated} témoignage(s) désapprouvé(s) avec succès.'
-        )
+        self._start_bulk_action(request, queryset, 'unapprove', 'désapprouvé(s)')
     unapprove_testimonials.short_description = "Désapprouver les témoignages sélectionnés"
     
+    def _start_bulk_action(self, request, queryset, action, done_label):
+        """Lance l'action par lots hors de la requête et renvoie vers son suivi"""
+        pks = list(queryset.values_list('pk', flat=True))
+        job = start_bulk_action(action, pks, request.user)
+        url = reverse('admin:content_bulkactionjob_change', args=[job.pk])
+        if job.status == 'done':
+            message = format_html(
+                '{} témoignage(s) {} avec succès (<a href="{}">tâche n°{}</a>).',
+                job.total, done_label, url, job.pk
+            )
+        else:
+            message = format_html(
+                '{} témoignage(s) en cours de traitement : <a href="{}">suivre la tâche n°{}</a>.',
+                job.total, url, job.pk
+            )
+        self.message_user(request, message)
+    
     def get_queryset(self, request):
         """Optimise les requêtes"""
-        return super().get_queryset(request).select_related()
\ No newline at end of file
+        return super().get_queryset(request).select_related()
+
+
+@admin.register(BulkActionJob)
+class BulkActionJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'action', 'status', 'progress_display', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'action']
+    list_select_related = ['created_by']
+    readonly_fields = [
+        'action', 'status', 'progress_display', 'total', 'processed', 'error',
+        'created_by', 'created_at', 'started_at', 'finished_at',
+    ]
+    exclude = ['object_ids']
+    actions = ['resume_jobs']
+
+    def has_add_permission(self, request):
+        return False
+
+    def progress_display(self, obj):
+        """Barre d'avancement"""
+        return format_html(
+            '<progress value="{}" max="100"></progress> {} / {}',
+            obj.progress, obj.processed, obj.total
+        )
+    progress_display.short_description = "Avancement"
+
+    def resume_jobs(self, request, queryset):
+        """Reprend les tâches échouées ou interrompues là où elles se sont arrêtées"""
+        resumed = sum(
+            resume_bulk_action(job)
+            for job in queryset.filter(status__in=('failed', 'running')).defer('object_ids')
+        )
+        self.message_user(request, f'{resumed} tâche(s) relancée(s).')
+    resume_jobs.short_description = "Reprendre les tâches sélectionnées"
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'task', 'status', 'attempts', 'run_at', 'locked_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'task']
+    search_fields = ['dedup_key']
+    readonly_fields = [
+        'task', 'payload', 'dedup_key', 'status', 'attempts', 'max_attempts', 'run_at',
+        'locked_at', 'locked_by', 'last_error', 'created_at', 'finished_at',
+    ]
+    actions = ['retry_jobs']
+
+    def has_add_permission(self, request):
+        return False
+
+    def retry_jobs(self, request, queryset):
+        """Remet en file les tâches échouées sélectionnées, pour une nouvelle série de tentatives"""
+        count = 0
+        for job in queryset.filter(status='failed'):
+            try:
+                with transaction.atomic():
+                    BackgroundJob.objects.filter(pk=job.pk).update(
+                        status='queued', attempts=0, run_at=timezone.now(), finished_at=None
+                    )
+                count += 1
+            except IntegrityError:
+                # Une tâche de même clé est déjà en attente
+                continue
+        self.message_user(request, f'{count} tâche(s) remise(s) en file.')
+    retry_jobs.short_description = "Relancer les tâches échouées sélectionnées"
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ContentConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "content"
+
+    def ready(self):
+        # Branche les signaux d'invalidation du contenu et leurs abonnés,
+        # et déclare les tâches de fond
+        from . import signals, read_model, indexes, slow_queries, tasks  # noqa: F401
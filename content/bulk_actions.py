@@ -0,0 +1,137 @@
+"""
+Actions d'administration en masse exécutées par lots.
+
+L'action de l'admin ne fait que figer la liste des identifiants dans un
+``BulkActionJob`` et mettre en file une tâche ``bulk_action`` (content.jobs) ;
+le traitement a lieu dans un worker, par lots de
+``CONTENT_BULK_ACTION_CHUNK_SIZE`` lignes, chacun dans sa propre transaction
+courte. L'avancement est enregistré après chaque lot : une tâche interrompue
+reprend là où elle s'était arrêtée. Les caches dérivés des témoignages sont
+invalidés une seule fois, en fin de traitement, puis le préchauffage des
+caches est mis en file.
+
+L'admin ne relance (``resume_bulk_action``) que les tâches échouées, ou
+restées ``running`` sans signe de vie depuis ``CONTENT_JOB_LOCK_TIMEOUT`` :
+relancer une tâche encore active ferait traiter les mêmes lots deux fois.
+
+Avec ``CONTENT_BULK_ACTIONS_ASYNC`` désactivé (tests), la tâche s'exécute
+immédiatement dans le processus appelant.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import BackgroundJob, BulkActionJob, Testimonial
+from .invalidation import mark_changed
+from .jobs import enqueue, heartbeat
+
+logger = logging.getLogger(__name__)
+
+# Action -> (modèle, valeurs appliquées)
+ACTIONS = {
+    'approve': (Testimonial, {'is_approved': True}),
+    'unapprove': (Testimonial, {'is_approved': False}),
+}
+
+
+def start_bulk_action(action, pks, user=None):
+    """Crée la tâche et la lance (en arrière-plan si configuré)"""
+    if action not in ACTIONS:
+        raise ValueError(f"Action inconnue : {action}")
+    pks = sorted(pks)
+    job = BulkActionJob.objects.create(
+        action=action, object_ids=pks, total=len(pks),
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+    dispatch(job.pk)
+    job.refresh_from_db()
+    return job
+
+
+def dispatch(job_id):
+    """Met la tâche en file (visible des workers à la validation de la transaction)"""
+    if not getattr(settings, 'CONTENT_BULK_ACTIONS_ASYNC', True):
+        run_bulk_action(job_id)
+        return
+    enqueue('bulk_action', {'job_id': job_id}, dedup_key=job_key(job_id))
+
+
+def job_key(job_id):
+    return f'bulk-action:{job_id}'
+
+
+def resume_bulk_action(job):
+    """
+    Relance une tâche échouée ou interrompue et retourne True ; retourne
+    False si elle est terminée, en attente ou encore active.
+    """
+    if job.status == 'failed':
+        dispatch(job.pk)
+        return True
+    if job.status != 'running':
+        return False
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, 'CONTENT_JOB_LOCK_TIMEOUT', 600))
+    background = BackgroundJob.objects.filter(
+        dedup_key=job_key(job.pk), status__in=('queued', 'running')
+    )
+    if background.filter(Q(status='queued') | Q(locked_at__gte=stale)).exists():
+        return False
+    # Exécution synchrone (sans tâche de fond) : seule l'ancienneté la départage
+    if not background.exists() and (job.started_at is None or job.started_at >= stale):
+        return False
+    with transaction.atomic():
+        # Le worker disparu ne reprendra pas l'ancienne tâche en parallèle de la nouvelle
+        background.filter(locked_at__lt=stale).update(
+            status='failed', locked_at=None, finished_at=now,
+            last_error="Tâche reprise depuis l'administration",
+        )
+        dispatch(job.pk)
+    return True
+
+
+def run_bulk_action(job_id):
+    """Traite les lots restants d'une tâche puis invalide les caches une fois"""
+    job = BulkActionJob.objects.get(pk=job_id)
+    if job.status == 'done':
+        return job
+    model, values = ACTIONS[job.action]
+    chunk_size = max(1, getattr(settings, 'CONTENT_BULK_ACTION_CHUNK_SIZE', 500))
+
+    BulkActionJob.objects.filter(pk=job.pk).update(
+        status='running', started_at=job.started_at or timezone.now(), error=''
+    )
+    position = job.processed
+    try:
+        while position < job.total:
+            chunk = job.object_ids[position:position + chunk_size]
+            with transaction.atomic():
+                # updated_at change aussi la clé des fragments en cache (content.fragments)
+                model.objects.filter(pk__in=chunk).update(**values, updated_at=timezone.now())
+                BulkActionJob.objects.filter(pk=job.pk).update(
+                    processed=position + len(chunk)
+                )
+            position += len(chunk)
+            # Worker toujours actif : la tâche de fond n'est pas reprise ailleurs
+            heartbeat()
+    except Exception as exc:
+        logger.exception("Échec de l'action en masse %s", job.pk)
+        BulkActionJob.objects.filter(pk=job.pk).update(
+            status='failed', error=str(exc), finished_at=timezone.now()
+        )
+    else:
+        BulkActionJob.objects.filter(pk=job.pk).update(
+            status='done', finished_at=timezone.now()
+        )
+    finally:
+        # Les lots validés sont visibles : une seule invalidation pour toute la tâche
+        if position > job.processed:
+            mark_changed(model, job.object_ids[job.processed:position])
+            enqueue('warm_caches', dedup_key='warm-caches')
+            enqueue('refresh_stats', dedup_key='refresh-stats')
+    job.refresh_from_db()
+    return job
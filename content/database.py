@@ -0,0 +1,92 @@
+"""
+Limite de durée des instructions SQL pendant une requête HTTP.
+
+Sur PostgreSQL, ``StatementTimeoutMiddleware`` applique ``statement_timeout``
+à la connexion de la requête : serrée pour les lectures publiques, large pour
+l'admin. Le ``SET`` n'est émis qu'à la première requête SQL (une réponse
+servie depuis la mémoire n'ouvre pas de connexion) et annulé en fin de
+requête, la connexion pouvant ensuite servir ailleurs (pool, threads).
+
+Une vue fixe sa propre limite avec le décorateur ``statement_timeout`` ::
+
+    @statement_timeout(10000)
+    @api_view(['GET'])
+    def export(request): ...
+"""
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+
+def statement_timeout(milliseconds):
+    """Limite propre à une vue (fonction ou classe), 0 pour aucune limite"""
+    def decorator(view):
+        view.statement_timeout_ms = milliseconds
+        return view
+    return decorator
+
+
+def timeout_for(request, view_func):
+    """Limite (ms) applicable à la vue, ou None"""
+    for target in (view_func, getattr(view_func, 'view_class', None), getattr(view_func, 'cls', None)):
+        if target is not None and hasattr(target, 'statement_timeout_ms'):
+            return target.statement_timeout_ms or None
+    match = request.resolver_match
+    namespace = match.namespace if match else ''
+    if namespace == 'admin':
+        timeout = getattr(settings, 'CONTENT_STATEMENT_TIMEOUT_ADMIN_MS', 30000)
+    elif namespace == 'content' and request.method in ('GET', 'HEAD'):
+        timeout = getattr(settings, 'CONTENT_STATEMENT_TIMEOUT_PUBLIC_MS', 2000)
+    else:
+        timeout = getattr(settings, 'CONTENT_STATEMENT_TIMEOUT_MS', 5000)
+    return timeout or None
+
+
+class StatementTimeout:
+    """
+    execute_wrapper qui pose ``statement_timeout`` avant la première
+    instruction suivant le choix de la limite (``milliseconds``, None tant
+    que la vue n'est pas résolue) ; ``restore()`` rétablit la valeur par défaut.
+
+    Un ``SET`` émis dans une transaction est annulé par son retour arrière :
+    il est alors réémis avant l'instruction suivante.
+    """
+
+    def __init__(self, connection, milliseconds=None):
+        self.connection = connection
+        self.milliseconds = milliseconds
+        self.applied = None
+        self.uncommitted = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.uncommitted and not any(
+            func == self.committed for _, func, _ in self.connection.run_on_commit
+        ):
+            # Callback abandonné : transaction ou point de sauvegarde annulé
+            self.applied = None
+        if self.milliseconds is not None and self.applied != self.milliseconds:
+            self.applied = self.milliseconds
+            # Curseur brut : pas de nouveau passage dans les execute_wrappers
+            context['cursor'].cursor.execute(f"SET statement_timeout = {int(self.milliseconds)}")
+            self.uncommitted = self.connection.in_atomic_block
+            if self.uncommitted:
+                self.connection.on_commit(self.committed)
+        return execute(sql, params, many, context)
+
+    def committed(self):
+        self.uncommitted = False
+
+    def restore(self):
+        if self.applied is None or self.connection.connection is None:
+            return
+        try:
+            # Curseur brut, comme le SET : hors des execute_wrappers et du
+            # décompte des requêtes de la vue
+            with self.connection.wrap_database_errors, self.connection.connection.cursor() as cursor:
+                cursor.execute("RESET statement_timeout")
+        except DatabaseError:
+            # Connexion inutilisable : elle sera fermée en fin de requête
+            logger.warning("Impossible de rétablir statement_timeout", exc_info=True)
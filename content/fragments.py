@@ -0,0 +1,70 @@
+"""
+Cache des fragments sérialisés, objet par objet.
+
+Chaque objet est sérialisé une fois puis mis en cache sous la clé
+``(modèle, pk, updated_at, jeu de champs)`` : une modification change
+``updated_at`` et donc la clé, sans invalidation explicite. Une page de liste
+est assemblée avec une requête étroite (pk, updated_at), une lecture groupée
+du cache, puis une seule requête et une sérialisation pour les objets absents.
+
+Les fragments sont sérialisés sans requête : ``image_url`` y reste relative
+et doit être rendue absolue à chaque réponse (``with_absolute_image_urls``).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+
+CACHE_PREFIX = 'content:fragment'
+# Les fragments des versions précédentes ne sont plus lus : ils expirent seuls
+CACHE_TIMEOUT = 24 * 3600
+
+
+def field_set_key(serializer_class):
+    """Empreinte courte du sérialiseur, de ses champs et du format des dates"""
+    fields = ','.join(serializer_class.Meta.fields)
+    signature = (
+        f"{serializer_class.__module__}.{serializer_class.__qualname__}:{fields}"
+        f":{api_settings.DATETIME_FORMAT}"
+    )
+    return hashlib.md5(signature.encode()).hexdigest()[:12]
+
+
+def fragment_key(model, pk, updated_at, field_set):
+    return f"{CACHE_PREFIX}:{model._meta.label_lower}:{pk}:{updated_at.isoformat()}:{field_set}"
+
+
+def fragments_enabled():
+    return getattr(settings, 'CONTENT_FRAGMENT_CACHE_ENABLED', True)
+
+
+def render_fragments(serializer_class, model, rows):
+    """
+    Retourne les données sérialisées des objets ``rows`` [(pk, updated_at)],
+    dans le même ordre. Seuls les objets absents du cache sont relus et
+    sérialisés.
+    """
+    rows = list(rows)
+    field_set = field_set_key(serializer_class)
+    keys = [fragment_key(model, pk, updated_at, field_set) for pk, updated_at in rows]
+    cached = cache.get_many(keys)
+
+    missing = [pk for (pk, _), key in zip(rows, keys) if key not in cached]
+    fresh = {}
+    if missing:
+        to_store = {}
+        for obj in model._default_manager.filter(pk__in=missing):
+            data = dict(serializer_class(obj).data)
+            fresh[obj.pk] = data
+            # Clé de la version relue, qui peut être plus récente que la liste
+            to_store[fragment_key(model, obj.pk, obj.updated_at, field_set)] = data
+        cache.set_many(to_store, timeout=CACHE_TIMEOUT)
+
+    results = []
+    for (pk, _), key in zip(rows, keys):
+        data = cached.get(key) or fresh.get(pk)
+        # Objet supprimé entre les deux requêtes : ignoré
+        if data is not None:
+            results.append(data)
+    return results
@@ -0,0 +1,423 @@
+"""
+Index en mémoire maintenus de façon incrémentale.
+
+Chaque index est propre au processus. Il est construit paresseusement à la
+première lecture, puis mis à jour ligne par ligne quand ``content_changed``
+signale une écriture locale, une fois sa transaction validée. Les écritures
+des autres workers sont détectées via ``ContentVersion`` (au plus une
+vérification toutes les ``CONTENT_INDEX_CHECK_INTERVAL`` secondes) et
+provoquent une reconstruction.
+"""
+import bisect
+import heapq
+import random
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import receiver
+
+from .models import Project, Testimonial
+from .invalidation import content_changed, get_versions, SCOPES
+
+
+class VersionedIndex:
+    """Base des index versionnés ; les sous-classes fournissent load() et apply()"""
+
+    model = None
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._version = None
+        self._local_changes = 0
+        self._checked_at = 0.0
+
+    @property
+    def scope(self):
+        return SCOPES[self.model]
+
+    def load(self):
+        """Reconstruit tout l'index depuis la base"""
+        raise NotImplementedError
+
+    def apply(self, pks):
+        """Recharge les lignes ``pks`` (les lignes absentes ont été supprimées)"""
+        raise NotImplementedError
+
+    def reset(self):
+        with self._lock:
+            self._loaded = False
+            self._version = None
+            self._local_changes = 0
+            self._checked_at = 0.0
+
+    def ensure_fresh(self):
+        """Garantit un index construit et à jour des écritures des autres workers"""
+        interval = getattr(settings, 'CONTENT_INDEX_CHECK_INTERVAL', 2)
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded and now - self._checked_at < interval:
+                return
+            version = get_versions()[self.scope]
+            # Les écritures locales déjà appliquées expliquent l'écart de version
+            if not self._loaded or version != self._version + self._local_changes:
+                self.load()
+                self._loaded = True
+            self._version = version
+            self._local_changes = 0
+            self._checked_at = now
+
+    def changed(self, pks):
+        """
+        Applique une écriture locale (appelé via content_changed) une fois sa
+        transaction validée : une transaction annulée ne laisse aucune ligne
+        fantôme dans l'index, et sa version annulée n'est pas comptée.
+        """
+        transaction.on_commit(lambda: self.apply_committed(pks))
+
+    def apply_committed(self, pks):
+        with self._lock:
+            if not self._loaded:
+                return
+            if pks is None:
+                # Modification en masse sans détail : reconstruction à la prochaine lecture
+                self._loaded = False
+                return
+            self.apply(pks)
+            self._local_changes += 1
+
+
+def normalize(value):
+    """Clé de recherche : minuscules, sans accents"""
+    value = unicodedata.normalize('NFKD', value.casefold())
+    return ''.join(char for char in value if not unicodedata.combining(char))
+
+
+class PrefixIndex:
+    """
+    Valeurs distinctes triées avec leur fréquence, pour l'autocomplétion.
+    Une recherche par préfixe est deux bissections dans le tableau trié puis
+    une sélection des ``limit`` plus fréquentes.
+    """
+
+    def __init__(self):
+        self.keys = []      # clés normalisées, triées
+        self.counts = {}    # clé -> fréquence
+        self.labels = {}    # clé -> libellé affiché
+
+    def add(self, label):
+        key = normalize(label)
+        if key not in self.counts:
+            bisect.insort(self.keys, key)
+            self.counts[key] = 0
+            self.labels[key] = label
+        self.counts[key] += 1
+
+    def remove(self, label):
+        key = normalize(label)
+        if key not in self.counts:
+            return
+        self.counts[key] -= 1
+        if self.counts[key] <= 0:
+            del self.counts[key]
+            del self.labels[key]
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def complete(self, prefix, limit):
+        """[(libellé, fréquence)] des valeurs commençant par ``prefix``"""
+        prefix = normalize(prefix)
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + '\U0010ffff') if prefix else len(self.keys)
+        best = heapq.nsmallest(
+            limit, self.keys[start:end], key=lambda key: (-self.counts[key], key)
+        )
+        return [(self.labels[key], self.counts[key]) for key in best]
+
+
+def split_technologies(value):
+    """Même découpage que Project.technologies_list"""
+    return [tech.strip() for tech in value.split(',') if tech.strip()]
+
+
+class TechnologyIndex(VersionedIndex):
+    """
+    Index inversé technologie -> projets, avec les dates d'achèvement et les
+    agrégats des facettes (cooccurrences de technologies, projets par année,
+    années par technologie), tenus à jour projet par projet.
+    """
+
+    model = Project
+
+    def __init__(self):
+        super().__init__()
+        self.projects = {}       # id -> (frozenset des technologies en minuscules, date)
+        self.postings = {}       # technologie en minuscules -> set(id)
+        self.labels = {}         # technologie en minuscules -> libellé d'origine
+        self.cooccurrence = {}   # technologie -> Counter(technologie -> projets communs)
+        self.years = Counter()   # année d'achèvement -> projets
+        self.tech_years = {}     # technologie -> Counter(année -> projets)
+        self.prefixes = PrefixIndex()
+
+    def load(self):
+        self.projects, self.postings, self.labels = {}, {}, {}
+        self.cooccurrence, self.years, self.tech_years = {}, Counter(), {}
+        self.prefixes = PrefixIndex()
+        rows = Project.objects.values_list('id', 'technologies', 'completion_date')
+        for pk, technologies, completion_date in rows:
+            self._add(pk, technologies, completion_date)
+
+    def apply(self, pks):
+        for pk in pks:
+            self._remove(pk)
+        rows = Project.objects.filter(pk__in=pks).values_list(
+            'id', 'technologies', 'completion_date'
+        )
+        for pk, technologies, completion_date in rows:
+            self._add(pk, technologies, completion_date)
+
+    def _add(self, pk, technologies, completion_date):
+        keys = set()
+        for tech in split_technologies(technologies):
+            key = tech.lower()
+            keys.add(key)
+            self.labels.setdefault(key, tech)
+            self.postings.setdefault(key, set()).add(pk)
+        self.projects[pk] = (frozenset(keys), completion_date)
+        self._count(keys, completion_date.year, 1)
+        for key in keys:
+            self.prefixes.add(self.labels[key])
+
+    def _remove(self, pk):
+        entry = self.projects.pop(pk, None)
+        if entry is None:
+            return
+        for key in entry[0]:
+            self.prefixes.remove(self.labels[key])
+            ids = self.postings.get(key)
+            if ids is not None:
+                ids.discard(pk)
+                if not ids:
+                    del self.postings[key]
+                    del self.labels[key]
+        self._count(entry[0], entry[1].year, -1)
+
+    def _count(self, keys, year, delta):
+        """Ajoute (ou retire) un projet des agrégats des facettes"""
+        _increment(self.years, year, delta)
+        for key in keys:
+            _increment(self.tech_years.setdefault(key, Counter()), year, delta)
+            co = self.cooccurrence.setdefault(key, Counter())
+            for other in keys:
+                _increment(co, other, delta)
+            if not co:
+                del self.cooccurrence[key]
+            if not self.tech_years[key]:
+                del self.tech_years[key]
+
+    def complete(self, prefix, limit=8):
+        """Technologies commençant par ``prefix``, les plus utilisées d'abord"""
+        self.ensure_fresh()
+        with self._lock:
+            return self.prefixes.complete(prefix, limit)
+
+    def facets(self, technology=None):
+        """
+        Nombre de projets par technologie et par année d'achèvement pour le
+        filtre ``technology`` (même sens que ``technologies__icontains``).
+        Lu dans les agrégats quand le filtre désigne une seule technologie ;
+        sinon calculé sur les seuls projets retenus.
+        """
+        self.ensure_fresh()
+        needle = technology.lower() if technology else ''
+        # Virgule ou espace en bord : le filtre porte sur le texte complet
+        # (« Django, React »), que les clés de l'index, sans espaces, ne couvrent pas
+        full_text = ',' in needle or needle != needle.strip()
+        if needle and full_text:
+            # Même filtre que la liste, exécuté hors du verrou de l'index
+            matched = set(
+                Project.objects.filter(technologies__icontains=technology)
+                .values_list('id', flat=True)
+            )
+        with self._lock:
+            if not needle:
+                tech_counts = {key: len(ids) for key, ids in self.postings.items()}
+                year_counts = dict(self.years)
+                total = len(self.projects)
+            else:
+                keys = None if full_text else [key for key in self.postings if needle in key]
+                if keys is not None and len(keys) == 1:
+                    tech_counts = dict(self.cooccurrence[keys[0]])
+                    year_counts = dict(self.tech_years[keys[0]])
+                    total = len(self.postings[keys[0]])
+                else:
+                    if keys is not None:
+                        matched = set().union(*(self.postings[key] for key in keys))
+                    tech_counts, year_counts = Counter(), Counter()
+                    for pk in matched:
+                        entry = self.projects.get(pk)
+                        if entry is not None:
+                            tech_counts.update(entry[0])
+                            year_counts[entry[1].year] += 1
+                    total = len(matched)
+            technologies = sorted(
+                ({'name': self.labels[key], 'count': count} for key, count in tech_counts.items()),
+                key=lambda item: (-item['count'], item['name'].lower())
+            )
+        years = [{'year': year, 'count': year_counts[year]} for year in sorted(year_counts, reverse=True)]
+        return {'total': total, 'technologies': technologies, 'years': years}
+
+    def similar(self, pk, limit=5):
+        """
+        Projets les plus proches de ``pk`` (Jaccard sur les technologies,
+        puis date d'achèvement la plus récente). Seuls les projets partageant
+        au moins une technologie sont examinés. Retourne [(id, score)] ou
+        None si le projet est inconnu.
+        """
+        self.ensure_fresh()
+        with self._lock:
+            entry = self.projects.get(pk)
+            if entry is None:
+                return None
+            techs = entry[0]
+            candidates = set()
+            for key in techs:
+                candidates.update(self.postings.get(key, ()))
+            candidates.discard(pk)
+
+            scored = []
+            for other in candidates:
+                other_techs, completion_date = self.projects[other]
+                shared = len(techs & other_techs)
+                score = shared / (len(techs) + len(other_techs) - shared)
+                scored.append((-score, -completion_date.toordinal(), other, score))
+        best = heapq.nsmallest(limit, scored)
+        return [(other, round(score, 4)) for _, _, other, score in best]
+
+
+def _increment(counter, key, delta):
+    counter[key] += delta
+    if counter[key] <= 0:
+        del counter[key]
+
+
+class RatingBandIndex(VersionedIndex):
+    """
+    Identifiants des témoignages approuvés, par note. Chaque bande est une
+    liste (retrait par échange avec le dernier élément) : un tirage aléatoire
+    coûte O(count), quelle que soit la taille de la table.
+    """
+
+    model = Testimonial
+
+    def __init__(self):
+        super().__init__()
+        self.bands = {}      # note -> [id]
+        self.positions = {}  # id -> (note, position dans la bande)
+
+    def load(self):
+        self.bands, self.positions = {}, {}
+        rows = Testimonial.objects.filter(is_approved=True).order_by('id').values_list('id', 'rating')
+        for pk, rating in rows:
+            self._add(pk, rating)
+
+    def apply(self, pks):
+        for pk in pks:
+            self._remove(pk)
+        rows = Testimonial.objects.filter(pk__in=pks, is_approved=True).order_by('id').values_list(
+            'id', 'rating'
+        )
+        for pk, rating in rows:
+            self._add(pk, rating)
+
+    def _add(self, pk, rating):
+        band = self.bands.setdefault(rating, [])
+        self.positions[pk] = (rating, len(band))
+        band.append(pk)
+
+    def _remove(self, pk):
+        entry = self.positions.pop(pk, None)
+        if entry is None:
+            return
+        rating, position = entry
+        band = self.bands[rating]
+        last = band.pop()
+        if position < len(band):
+            band[position] = last
+            self.positions[last] = (rating, position)
+
+    def sample(self, count, min_rating=None, seed=None):
+        """Jusqu'à ``count`` identifiants distincts tirés parmi les notes >= min_rating"""
+        self.ensure_fresh()
+        rng = random.Random(seed) if seed is not None else random
+        with self._lock:
+            bands = [
+                self.bands[rating] for rating in sorted(self.bands)
+                if rating >= (min_rating or 1) and self.bands[rating]
+            ]
+            offsets = []
+            total = 0
+            for band in bands:
+                offsets.append(total)
+                total += len(band)
+            drawn = rng.sample(range(total), min(count, total))
+            ids = []
+            for position in drawn:
+                band = bisect.bisect_right(offsets, position) - 1
+                ids.append(bands[band][position - offsets[band]])
+        return ids
+
+
+class CompanyIndex(VersionedIndex):
+    """Entreprises des témoignages approuvés et leur nombre de témoignages"""
+
+    model = Testimonial
+
+    def __init__(self):
+        super().__init__()
+        self.companies = {}  # id -> entreprise
+        self.prefixes = PrefixIndex()
+
+    def load(self):
+        self.companies, self.prefixes = {}, PrefixIndex()
+        rows = Testimonial.objects.filter(is_approved=True).values_list('id', 'company')
+        for pk, company in rows:
+            self._add(pk, company)
+
+    def apply(self, pks):
+        for pk in pks:
+            company = self.companies.pop(pk, None)
+            if company is not None:
+                self.prefixes.remove(company)
+        rows = Testimonial.objects.filter(pk__in=pks, is_approved=True).values_list('id', 'company')
+        for pk, company in rows:
+            self._add(pk, company)
+
+    def _add(self, pk, company):
+        company = company.strip()
+        if company:
+            self.companies[pk] = company
+            self.prefixes.add(company)
+
+    def complete(self, prefix, limit=8):
+        """Entreprises commençant par ``prefix``, les plus citées d'abord"""
+        self.ensure_fresh()
+        with self._lock:
+            return self.prefixes.complete(prefix, limit)
+
+
+technology_index = TechnologyIndex()
+rating_band_index = RatingBandIndex()
+company_index = CompanyIndex()
+
+INDEXES = [technology_index, rating_band_index, company_index]
+
+
+@receiver(content_changed)
+def update_indexes(sender, pks=None, **kwargs):
+    for index in INDEXES:
+        if index.model is sender:
+            index.changed(pks)
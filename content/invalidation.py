@@ -0,0 +1,128 @@
+"""
+Versionnement du contenu public et notification des modifications.
+
+Chaque modèle public possède un compteur dans ``ContentVersion`` qui est
+incrémenté à chaque écriture. Les workers comparent ce compteur (une seule
+requête très légère) pour savoir si leurs données en mémoire sont à jour.
+Le signal ``content_changed`` prévient les composants du processus courant
+dès qu'une écriture a lieu, sans attendre la prochaine vérification.
+
+``current_versions()`` relit les compteurs au plus une fois toutes les
+``CONTENT_INDEX_CHECK_INTERVAL`` secondes, comme les index en mémoire
+(content.indexes), pour les clés de cache calculées à chaque requête.
+"""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.db.models import F
+from django.dispatch import Signal, receiver
+
+from .models import ContentVersion, Service, Project, Testimonial
+
+# Périmètre de version associé à chaque modèle public
+SCOPES = {
+    Service: 'service',
+    Project: 'project',
+    Testimonial: 'testimonial',
+}
+
+# Envoyé avec sender=<modèle>, pks=<liste d'identifiants ou None> et
+# lists=<False si l'écriture ne change ni l'appartenance aux listes ni leur ordre>
+content_changed = Signal()
+
+
+def get_versions():
+    """Retourne les versions courantes sous la forme {périmètre: version}"""
+    versions = dict.fromkeys(SCOPES.values(), 0)
+    versions.update(ContentVersion.objects.values_list('scope', 'version'))
+    return versions
+
+
+def bump_version(scope):
+    """Incrémente le compteur d'un périmètre en une seule requête"""
+    updated = ContentVersion.objects.filter(scope=scope).update(
+        version=F('version') + 1
+    )
+    if not updated:
+        version, created = ContentVersion.objects.get_or_create(
+            scope=scope, defaults={'version': 1}
+        )
+        if not created:
+            ContentVersion.objects.filter(pk=version.pk).update(
+                version=F('version') + 1
+            )
+
+
+def mark_changed(model, pks=None, lists=True):
+    """
+    Signale une écriture sur ``model``.
+
+    À appeler explicitement après les mises à jour en masse
+    (``queryset.update``) qui ne déclenchent pas les signaux des modèles.
+    ``lists=False`` indique que seuls des champs affichés ont changé
+    (content.surrogate_keys ne purge alors que les objets concernés).
+    """
+    scope = SCOPES.get(model)
+    if scope is None:
+        return
+    bump_version(scope)
+    content_changed.send(sender=model, pks=list(pks) if pks is not None else None, lists=lists)
+
+
+class VersionCheck:
+    """
+    Versions de ``get_versions`` relues au plus une fois par intervalle.
+
+    Une écriture locale est visible aussitôt, sans requête : la version du
+    périmètre reçoit un suffixe propre à l'écriture (``7+<jeton>``). Une clé
+    de cache construite ainsi ne peut donc pas désigner le contenu écrit par
+    un autre worker, ni celui d'une transaction annulée, sous le même numéro.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = None
+        self._local = {}
+        self._checked_at = 0.0
+
+    def reset(self):
+        with self._lock:
+            self._versions = None
+            self._local = {}
+            self._checked_at = 0.0
+
+    def get(self):
+        """Retourne {périmètre: version} (chaînes, à n'utiliser que dans des clés)"""
+        interval = getattr(settings, 'CONTENT_INDEX_CHECK_INTERVAL', 2)
+        with self._lock:
+            now = time.monotonic()
+            if self._versions is None or now - self._checked_at >= interval:
+                self._versions = get_versions()
+                self._local = {}
+                self._checked_at = now
+            return {
+                scope: f"{version}+{self._local[scope]}" if scope in self._local else str(version)
+                for scope, version in self._versions.items()
+            }
+
+    def changed(self, scope):
+        with self._lock:
+            if self._versions is not None:
+                self._local[scope] = uuid.uuid4().hex[:12]
+
+
+version_check = VersionCheck()
+
+
+def current_versions():
+    """Versions courantes, vérifiées au plus toutes les ``CONTENT_INDEX_CHECK_INTERVAL`` secondes"""
+    return version_check.get()
+
+
+@receiver(content_changed)
+def note_local_change(sender, **kwargs):
+    scope = SCOPES.get(sender)
+    if scope is not None:
+        version_check.changed(scope)
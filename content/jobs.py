@@ -0,0 +1,193 @@
+"""
+File de tâches de fond stockée en base, sans broker externe.
+
+``enqueue()`` insère une ligne ``BackgroundJob`` dans la transaction de
+l'appelant : la tâche n'est visible des workers qu'une fois celle-ci validée.
+Une ``dedup_key`` limite à une tâche en attente par clé ; une nouvelle
+demande rejoint la tâche en attente. Une tâche déjà en cours ne compte pas :
+elle a pu lire les données avant la modification qui motive la demande.
+
+Les workers (commande ``run_worker``) prennent les tâches par
+``SELECT ... FOR UPDATE SKIP LOCKED`` sur PostgreSQL : plusieurs workers se
+partagent la file sans se bloquer. Une mise à jour conditionnelle du statut
+garantit la même exclusivité sur SQLite, qui ignore ``FOR UPDATE``. Un échec
+replanifie la tâche avec un délai exponentiel jusqu'à ``max_attempts`` ; une
+tâche restée ``running`` au-delà de ``CONTENT_JOB_LOCK_TIMEOUT`` (worker
+arrêté net) est reprise ; les tâches longues appellent ``heartbeat()`` pour
+signaler qu'elles progressent.
+
+Les fonctions exécutables sont déclarées avec ``@task`` (content.tasks).
+"""
+import logging
+import random
+import threading
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# Nom -> fonction(**payload)
+TASKS = {}
+
+
+def task(name):
+    """Déclare une fonction exécutable par les workers"""
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, dedup_key=None, delay=0, max_attempts=None):
+    """
+    Met une tâche en file et la retourne ; avec ``dedup_key``, retourne la
+    tâche en attente de même clé s'il y en a une.
+    """
+    if name not in TASKS:
+        raise ValueError(f"Tâche inconnue : {name}")
+    fields = {
+        'task': name,
+        'payload': payload or {},
+        'dedup_key': dedup_key,
+        'run_at': timezone.now() + timedelta(seconds=delay),
+        'max_attempts': max_attempts or getattr(settings, 'CONTENT_JOB_MAX_ATTEMPTS', 5),
+    }
+    if dedup_key is None:
+        return BackgroundJob.objects.create(**fields)
+    existing = _queued(dedup_key)
+    if existing is not None:
+        return existing
+    try:
+        # Point de sauvegarde : un doublon concurrent ne doit pas annuler la transaction appelante
+        with transaction.atomic():
+            return BackgroundJob.objects.create(**fields)
+    except IntegrityError:
+        existing = _queued(dedup_key)
+        if existing is None:
+            raise
+        return existing
+
+
+def _queued(dedup_key):
+    return BackgroundJob.objects.filter(dedup_key=dedup_key, status='queued').first()
+
+
+def backoff_delay(attempts):
+    """Délai (secondes) avant la tentative suivante : exponentiel, avec gigue"""
+    base = getattr(settings, 'CONTENT_JOB_BACKOFF_BASE', 10)
+    ceiling = getattr(settings, 'CONTENT_JOB_BACKOFF_MAX', 3600)
+    delay = min(ceiling, base * 2 ** max(0, attempts - 1))
+    # Moitié fixe, moitié aléatoire : les échecs simultanés ne reviennent pas ensemble
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def claim(worker_id):
+    """Prend la prochaine tâche exécutable, ou None si la file est vide"""
+    # Sans SKIP LOCKED (SQLite), pas de transaction : la lecture suivie d'une
+    # écriture y provoquerait des « database is locked » entre workers
+    locking = connection.features.has_select_for_update_skip_locked
+    while True:
+        now = timezone.now()
+        stale = now - timedelta(seconds=getattr(settings, 'CONTENT_JOB_LOCK_TIMEOUT', 600))
+        with transaction.atomic() if locking else nullcontext():
+            job = (
+                BackgroundJob.objects
+                .select_for_update(skip_locked=True)
+                .filter(Q(status='queued', run_at__lte=now) | Q(status='running', locked_at__lt=stale))
+                .order_by('run_at', 'pk')
+                .first()
+            )
+            if job is None:
+                return None
+            current = BackgroundJob.objects.filter(pk=job.pk, status=job.status, attempts=job.attempts)
+            if job.status == 'running' and job.attempts >= job.max_attempts:
+                # Worker arrêté pendant la dernière tentative : abandon
+                current.update(
+                    status='failed', locked_at=None, finished_at=now,
+                    last_error=f"Worker {job.locked_by} interrompu pendant la tâche",
+                )
+                continue
+            claimed = current.update(
+                status='running', locked_at=now, locked_by=worker_id, attempts=F('attempts') + 1
+            )
+        if not claimed:
+            # Prise par un autre worker entre-temps (SQLite)
+            continue
+        job.refresh_from_db()
+        return job
+
+
+class CurrentJob(threading.local):
+    """Tâche exécutée par le thread courant, pour ``heartbeat``"""
+
+    def __init__(self):
+        self.job = None
+
+
+_current = CurrentJob()
+
+
+def heartbeat():
+    """
+    Repousse la reprise de la tâche en cours (``locked_at``) : à appeler
+    régulièrement par les tâches longues, sinon une tâche dépassant
+    ``CONTENT_JOB_LOCK_TIMEOUT`` serait relancée par un autre worker pendant
+    qu'elle s'exécute encore. Sans effet hors d'un worker.
+    """
+    job = _current.job
+    if job is not None:
+        BackgroundJob.objects.filter(
+            pk=job.pk, status='running', locked_by=job.locked_by, attempts=job.attempts
+        ).update(
+            locked_at=timezone.now()
+        )
+
+
+def run_job(job):
+    """Exécute une tâche prise en charge et enregistre son issue"""
+    func = TASKS.get(job.task)
+    _current.job = job
+    try:
+        if func is None:
+            raise LookupError(f"Tâche inconnue : {job.task}")
+        func(**job.payload)
+    except Exception as exc:
+        logger.exception("Échec de la tâche %s (tentative %s/%s)", job, job.attempts, job.max_attempts)
+        error = f"{type(exc).__name__}: {exc}"
+        if job.attempts < job.max_attempts and func is not None:
+            try:
+                with transaction.atomic():
+                    BackgroundJob.objects.filter(pk=job.pk).update(
+                        status='queued', locked_at=None, locked_by='', last_error=error,
+                        run_at=timezone.now() + timedelta(seconds=backoff_delay(job.attempts)),
+                    )
+                return False
+            except IntegrityError:
+                # Une tâche de même clé a été mise en file entre-temps : elle fera le travail
+                error += " (remplacée par une tâche plus récente)"
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status='failed', locked_at=None, last_error=error, finished_at=timezone.now()
+        )
+        return False
+    finally:
+        _current.job = None
+    BackgroundJob.objects.filter(pk=job.pk).update(
+        status='done', locked_at=None, finished_at=timezone.now()
+    )
+    return True
+
+
+def run_next(worker_id):
+    """Prend et exécute une tâche ; retourne False si la file était vide"""
+    job = claim(worker_id)
+    if job is None:
+        return False
+    run_job(job)
+    return True
@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from content.models import Testimonial
+from content.minhash import assign_signature, cluster, index_testimonials
+
+
+class Command(BaseCommand):
+    help = (
+        "Regroupe les témoignages quasi dupliqués (MinHash + LSH) sur toute la table, "
+        "en temps quasi linéaire"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help="Recalcule signatures et seaux LSH (témoignages antérieurs à la détection)",
+        )
+        parser.add_argument(
+            '--update-flags', action='store_true',
+            help="Marque chaque membre d'un groupe comme doublon du plus ancien",
+        )
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument('--show', type=int, default=20, help="Nombre de groupes affichés")
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            self.rebuild(options['chunk_size'])
+
+        rows = Testimonial.objects.values_list('pk', 'minhash_signature').iterator(
+            chunk_size=options['chunk_size']
+        )
+        clusters = cluster(rows)
+        duplicates = sum(len(members) - 1 for members in clusters)
+        self.stdout.write(f"{len(clusters)} groupe(s), {duplicates} doublon(s) suspecté(s).")
+
+        if clusters and options['show']:
+            shown = clusters[:options['show']]
+            labels = Testimonial.objects.in_bulk(
+                [pk for members in shown for pk in members]
+            )
+            for members in shown:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Groupe de {len(members)} :"))
+                for pk in members:
+                    testimonial = labels.get(pk)
+                    if testimonial is not None:
+                        excerpt = testimonial.content[:60].replace('\n', ' ')
+                        self.stdout.write(f"  n°{pk} {testimonial} : {excerpt}")
+
+        if options['update_flags']:
+            self.update_flags(clusters)
+
+    def rebuild(self, chunk_size):
+        batch = []
+        total = 0
+        for testimonial in Testimonial.objects.order_by('pk').iterator(chunk_size=chunk_size):
+            assign_signature(testimonial)
+            batch.append(testimonial)
+            if len(batch) >= chunk_size:
+                total += self.save_batch(batch)
+                batch = []
+        total += self.save_batch(batch)
+        self.stdout.write(f"{total} signature(s) recalculée(s).")
+
+    def save_batch(self, batch):
+        if not batch:
+            return 0
+        with transaction.atomic():
+            Testimonial.objects.bulk_update(batch, ['minhash_signature'])
+            index_testimonials(batch)
+        return len(batch)
+
+    def update_flags(self, clusters):
+        originals = {}
+        for members in clusters:
+            for pk in members[1:]:
+                originals[pk] = members[0]
+        with transaction.atomic():
+            cleared = Testimonial.objects.filter(
+                suspected_duplicate_of__isnull=False
+            ).exclude(pk__in=list(originals)).update(suspected_duplicate_of=None)
+            by_original = {}
+            for pk, original in originals.items():
+                by_original.setdefault(original, []).append(pk)
+            for original, pks in by_original.items():
+                Testimonial.objects.filter(pk__in=pks).update(suspected_duplicate_of=original)
+        self.stdout.write(
+            f"{len(originals)} doublon(s) marqué(s), {cleared} marque(s) retirée(s)."
+        )
@@ -0,0 +1,82 @@
+import statistics
+import time
+from copy import deepcopy
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare la latence d'une requête avec une connexion ouverte à chaque fois "
+        "et avec la configuration courante (pool ou connexions persistantes)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument(
+            '--sql', default='SELECT 1',
+            help="Requête exécutée à chaque itération (une « requête HTTP » simulée)",
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError("--iterations doit être positif.")
+        configured = connections[options['database']]
+        # Connexions dédiées : celle de l'appelant (transaction en cours,
+        # tests) n'est jamais fermée par les mesures
+        fresh = self.fresh_connection(configured)
+        persistent = self.copy_connection(configured)
+        try:
+            results = [
+                ('nouvelle connexion', self.measure(fresh, options['sql'], options['iterations'])),
+                ('configuration courante', self.measure(persistent, options['sql'], options['iterations'])),
+            ]
+        finally:
+            fresh.close()
+            # Avec un pool (partagé par alias), la connexion y est simplement rendue
+            persistent.close()
+
+        if 'pool' in configured.settings_dict.get('OPTIONS', {}):
+            mode = 'pool'
+        else:
+            mode = f"CONN_MAX_AGE={configured.settings_dict.get('CONN_MAX_AGE')}"
+        self.stdout.write(f"Base {configured.vendor}, {options['iterations']} itération(s), {mode}")
+        for label, timings in results:
+            self.stdout.write(
+                f"  {label:<24} p50 {self.percentile(timings, 50):8.3f} ms   "
+                f"p95 {self.percentile(timings, 95):8.3f} ms   "
+                f"moyenne {statistics.fmean(timings):8.3f} ms"
+            )
+        saved = self.percentile(results[0][1], 50) - self.percentile(results[1][1], 50)
+        self.stdout.write(self.style.SUCCESS(f"Gain sur p50 : {saved:.3f} ms par requête."))
+
+    def fresh_connection(self, configured):
+        """Connexion sans pool ni persistance, fermée après chaque requête"""
+        wrapper = self.copy_connection(configured)
+        wrapper.settings_dict['CONN_MAX_AGE'] = 0
+        wrapper.settings_dict.get('OPTIONS', {}).pop('pool', None)
+        return wrapper
+
+    def copy_connection(self, configured):
+        """Connexion distincte avec la configuration courante (pool ou persistance)"""
+        return configured.__class__(deepcopy(configured.settings_dict), configured.alias)
+
+    def measure(self, wrapper, sql, iterations):
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            with wrapper.cursor() as cursor:
+                cursor.execute(sql)
+                cursor.fetchall()
+            # Fin de requête HTTP : même traitement que le signal request_finished
+            wrapper.close_if_unusable_or_obsolete()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    @staticmethod
+    def percentile(values, percent):
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+        return ordered[index]
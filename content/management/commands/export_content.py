@@ -0,0 +1,75 @@
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models
+
+from content.models import Project, Service, Testimonial
+
+MODELS = {
+    'services': Service,
+    'projects': Project,
+    'testimonials': Testimonial,
+}
+
+
+def export_fields(model):
+    """Champs exportés : colonnes concrètes, sans les données binaires"""
+    return [
+        field.attname for field in model._meta.concrete_fields
+        if not isinstance(field, models.BinaryField)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporte une table en CSV ou JSONL, en flux : sur PostgreSQL, .iterator() lit "
+        "les lignes par un curseur côté serveur et la mémoire reste bornée"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(MODELS))
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv')
+        parser.add_argument('--output', help="Fichier de sortie (sortie standard par défaut)")
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help="Lignes lues par aller-retour avec la base",
+        )
+
+    def handle(self, *args, **options):
+        model = MODELS[options['model']]
+        fields = export_fields(model)
+        rows = model._default_manager.order_by('pk').values_list(*fields).iterator(
+            chunk_size=options['chunk_size']
+        )
+        output = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else sys.stdout
+        try:
+            count = self.write(output, options['format'], fields, rows)
+        finally:
+            if options['output']:
+                output.close()
+
+        server_side = (
+            connection.features.can_use_chunked_reads
+            and connection.vendor == 'postgresql'
+            and not connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS')
+        )
+        self.stderr.write(
+            f"{count} ligne(s) exportée(s) "
+            f"({'curseur côté serveur' if server_side else 'lecture par blocs'})."
+        )
+
+    def write(self, output, export_format, fields, rows):
+        count = 0
+        if export_format == 'csv':
+            writer = csv.writer(output)
+            writer.writerow(fields)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in rows:
+                output.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False, default=str) + '\n')
+                count += 1
+        return count
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from content.write_behind import submission_buffer
+
+
+class Command(BaseCommand):
+    help = "Insère en base les témoignages soumis encore présents dans le spool"
+
+    def handle(self, *args, **options):
+        created = submission_buffer.flush()
+        self.stdout.write(self.style.SUCCESS(f"{created} témoignage(s) inséré(s)."))
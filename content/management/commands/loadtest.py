@@ -0,0 +1,306 @@
+"""
+Générateur de charge asyncio pour la planification de capacité.
+
+Rejoue un journal d'accès (format common/combined, ou un chemin par ligne)
+ou un mélange pondéré des endpoints publics, à débit cible (--rps, boucle
+ouverte) ou à concurrence fixe (--concurrency seul, boucle fermée). Le client
+HTTP/1.1 est minimal (keep-alive, Content-Length ou chunked) pour ne dépendre
+que de la bibliothèque standard.
+
+En boucle ouverte, la latence est mesurée depuis l'instant d'envoi prévu :
+l'attente d'une connexion libre est comptée, ce qui évite de masquer la
+saturation du serveur (« coordinated omission »).
+"""
+import asyncio
+import bisect
+import random
+import re
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+LOG_LINE_RE = re.compile(r'"(?:GET|HEAD) (\S+) HTTP/[\d.]+"')
+
+# Bornes supérieures (ms) de l'histogramme de latence
+HISTOGRAM_BOUNDS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf')]
+
+# Mélange par défaut : (poids, gabarit de chemin)
+DEFAULT_MIX = [
+    (25, '/api/services/'),
+    (20, '/api/projects/'),
+    (12, '/api/projects/?technology={technology}'),
+    (8, '/api/projects/?page={page}'),
+    (5, '/api/projects/?page_size={page_size}&page={page}'),
+    (20, '/api/testimonials/?min_rating={min_rating}'),
+    (10, '/api/dashboard/stats/'),
+]
+
+
+def parse_access_log(lines):
+    """Extrait les chemins des requêtes GET/HEAD d'un journal d'accès"""
+    paths = []
+    for line in lines:
+        match = LOG_LINE_RE.search(line)
+        if match:
+            paths.append(match.group(1))
+        elif line.strip().startswith('/'):
+            paths.append(line.strip().split()[0])
+    return paths
+
+
+class WeightedMix:
+    """Tire des chemins selon les poids de DEFAULT_MIX"""
+
+    def __init__(self, rng, technologies, max_page, mix=DEFAULT_MIX):
+        self.rng = rng
+        self.technologies = technologies
+        self.max_page = max_page
+        self.templates = [template for _, template in mix]
+        self.cumulative = []
+        total = 0
+        for weight, _ in mix:
+            total += weight
+            self.cumulative.append(total)
+
+    def __call__(self):
+        index = bisect.bisect_right(self.cumulative, self.rng.uniform(0, self.cumulative[-1]))
+        template = self.templates[min(index, len(self.templates) - 1)]
+        return template.format(
+            technology=self.rng.choice(self.technologies),
+            page=self.rng.randint(1, self.max_page),
+            page_size=self.rng.choice([6, 10, 20]),
+            min_rating=self.rng.randint(1, 5),
+        )
+
+
+class Replay:
+    """Rejoue les chemins d'un journal dans l'ordre, en boucle"""
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.position = 0
+
+    def __call__(self):
+        path = self.paths[self.position % len(self.paths)]
+        self.position += 1
+        return path
+
+
+class Connection:
+    """Connexion HTTP/1.1 persistante minimale"""
+
+    def __init__(self, host, port, timeout):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def get(self, path):
+        """Envoie une requête GET et retourne le code de statut"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Accept: application/json\r\nConnection: keep-alive\r\n\r\n".encode('latin-1')
+        )
+        await self.writer.drain()
+        return await asyncio.wait_for(self._read_response(), self.timeout)
+
+    async def _read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connexion fermée par le serveur")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        else:
+            await self.reader.read()
+            await self.close()
+            return status
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+        self.failures = Counter()
+
+    def record(self, latency, status=None, failure=None):
+        self.latencies.append(latency)
+        if failure is not None:
+            self.failures[failure] += 1
+        else:
+            self.statuses[status] += 1
+
+
+async def run_load(next_path, host, port, total, duration, rps, concurrency, timeout):
+    stats = LoadStats()
+    pool = asyncio.Queue()
+    for _ in range(concurrency):
+        pool.put_nowait(Connection(host, port, timeout))
+
+    async def one_request(scheduled_at):
+        connection = await pool.get()
+        try:
+            status = await connection.get(next_path())
+            stats.record(time.perf_counter() - scheduled_at, status=status)
+        except (OSError, asyncio.TimeoutError, ConnectionError, ValueError, IndexError,
+                asyncio.IncompleteReadError) as exc:
+            await connection.close()
+            stats.record(time.perf_counter() - scheduled_at, failure=type(exc).__name__)
+        finally:
+            pool.put_nowait(connection)
+
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+    sent = 0
+
+    if rps:
+        # Boucle ouverte : une requête toutes les 1/rps secondes
+        tasks = []
+        while (total is None or sent < total) and (deadline is None or time.perf_counter() < deadline):
+            scheduled_at = started + sent / rps
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(one_request(scheduled_at)))
+            sent += 1
+        await asyncio.gather(*tasks)
+    else:
+        # Boucle fermée : chaque connexion enchaîne ses requêtes
+        async def worker():
+            nonlocal sent
+            while (total is None or sent < total) and (deadline is None or time.perf_counter() < deadline):
+                sent += 1
+                await one_request(time.perf_counter())
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    elapsed = time.perf_counter() - started
+    while not pool.empty():
+        await pool.get_nowait().close()
+    return stats, elapsed
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = "Génère de la charge sur l'API (rejeu d'un journal ou mélange pondéré)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="URL du serveur cible")
+        parser.add_argument('--log', default=None, help="Journal d'accès à rejouer")
+        parser.add_argument('--rps', type=float, default=None, help="Débit cible (boucle ouverte)")
+        parser.add_argument(
+            '--concurrency', type=int, default=10,
+            help="Connexions simultanées (boucle fermée si --rps est absent)",
+        )
+        parser.add_argument('--duration', type=float, default=None, help="Durée en secondes")
+        parser.add_argument('--requests', type=int, default=None, help="Nombre total de requêtes")
+        parser.add_argument('--timeout', type=float, default=10.0)
+        parser.add_argument(
+            '--technologies', default='Django,React,PostgreSQL,Python',
+            help="Technologies utilisées pour ?technology= (séparées par des virgules)",
+        )
+        parser.add_argument('--max-page', type=int, default=2)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        if options['duration'] is None and options['requests'] is None:
+            raise CommandError("Préciser --duration et/ou --requests.")
+        if options['concurrency'] < 1 or (options['rps'] is not None and options['rps'] <= 0):
+            raise CommandError("--concurrency et --rps doivent être positifs.")
+        target = urlsplit(options['url'])
+        if target.scheme != 'http' or not target.hostname:
+            raise CommandError("Seules les URLs http:// sont prises en charge.")
+
+        if options['log']:
+            with open(options['log'], encoding='utf-8', errors='replace') as log_file:
+                paths = parse_access_log(log_file)
+            if not paths:
+                raise CommandError("Aucune requête GET trouvée dans le journal.")
+            next_path = Replay(paths)
+        else:
+            next_path = WeightedMix(
+                random.Random(options['seed']),
+                [tech.strip() for tech in options['technologies'].split(',') if tech.strip()],
+                options['max_page'],
+            )
+
+        stats, elapsed = asyncio.run(run_load(
+            next_path, target.hostname, target.port or 80,
+            options['requests'], options['duration'], options['rps'],
+            options['concurrency'], options['timeout'],
+        ))
+        self.report(stats, elapsed)
+
+    def report(self, stats, elapsed):
+        latencies = sorted(latency * 1000 for latency in stats.latencies)
+        total = len(latencies)
+        server_errors = sum(count for code, count in stats.statuses.items() if code >= 500)
+        client_errors = sum(count for code, count in stats.statuses.items() if 400 <= code < 500)
+        failures = sum(stats.failures.values())
+        errors = server_errors + failures
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Résultats"))
+        self.stdout.write(f"  Requêtes       : {total} en {elapsed:.2f} s")
+        self.stdout.write(f"  Débit atteint  : {total / elapsed if elapsed else 0:.1f} req/s")
+        self.stdout.write(
+            f"  Taux d'erreur  : {100 * errors / total if total else 0:.2f} % "
+            f"({server_errors} réponse(s) 5xx, {failures} échec(s) réseau)"
+        )
+        self.stdout.write(f"  Réponses 4xx   : {client_errors}")
+        self.stdout.write(
+            "  Codes          : "
+            + ', '.join(f"{code}={count}" for code, count in sorted(stats.statuses.items()))
+        )
+        for name, count in stats.failures.most_common():
+            self.stdout.write(f"  Échec {name} : {count}")
+        self.stdout.write(
+            f"  Latence (ms)   : p50={percentile(latencies, 0.5):.1f} "
+            f"p90={percentile(latencies, 0.9):.1f} p99={percentile(latencies, 0.99):.1f} "
+            f"max={latencies[-1] if latencies else 0:.1f}"
+        )
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Histogramme de latence"))
+        buckets = Counter(bisect.bisect_left(HISTOGRAM_BOUNDS, latency) for latency in latencies)
+        widest = max(buckets.values(), default=0)
+        lower = 0
+        for index, upper in enumerate(HISTOGRAM_BOUNDS):
+            count = buckets.get(index, 0)
+            label = f"{lower:g}-{upper:g} ms" if upper != float('inf') else f"> {lower:g} ms"
+            bar = '#' * round(40 * count / widest) if widest else ''
+            self.stdout.write(f"  {label:>14} {count:>7}  {bar}")
+            lower = upper
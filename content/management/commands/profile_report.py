@@ -0,0 +1,88 @@
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from content.profiling import categorize, load_profile
+
+
+class Command(BaseCommand):
+    help = "Fusionne les profils échantillonnés par endpoint et affiche les chemins chauds"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir', default=None,
+            help="Répertoire des profils (CONTENT_PROFILER_DIR par défaut)",
+        )
+        parser.add_argument(
+            '--endpoint', default=None,
+            help="Limite le rapport à un nom d'URL (ex: content.project_list)",
+        )
+        parser.add_argument('--top', type=int, default=10, help="Nombre de lignes par section")
+        parser.add_argument(
+            '--output', default=None,
+            help="Écrit une pile collapsed fusionnée par endpoint dans ce répertoire",
+        )
+
+    def handle(self, *args, **options):
+        directory = Path(options['dir'] or getattr(
+            settings, 'CONTENT_PROFILER_DIR', settings.BASE_DIR / 'profiles'
+        ))
+        if not directory.is_dir():
+            raise CommandError(f"Répertoire de profils introuvable : {directory}")
+
+        endpoints = sorted(path for path in directory.iterdir() if path.is_dir())
+        if options['endpoint']:
+            endpoints = [path for path in endpoints if path.name == options['endpoint']]
+        if not endpoints:
+            raise CommandError("Aucun profil à analyser")
+
+        for endpoint in endpoints:
+            files = [path for path in endpoint.iterdir() if path.is_file()]
+            merged = Counter()
+            for path in files:
+                merged.update(load_profile(path))
+            if not merged:
+                continue
+            self.report(endpoint.name, len(files), merged, options['top'])
+            if options['output']:
+                output = Path(options['output'])
+                output.mkdir(parents=True, exist_ok=True)
+                (output / f"{endpoint.name}.collapsed").write_text(
+                    ''.join(f"{stack} {count}\n" for stack, count in merged.most_common()),
+                    encoding='utf-8',
+                )
+
+    def report(self, name, profile_count, merged, top):
+        total = sum(merged.values())
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{name} — {profile_count} requête(s), {total} échantillon(s)"
+        ))
+
+        categories = Counter()
+        self_time = Counter()
+        inclusive = Counter()
+        for stack, count in merged.items():
+            frames = stack.split(';')
+            categories[categorize(stack)] += count
+            self_time[frames[-1]] += count
+            for label in set(frames):
+                inclusive[label] += count
+
+        self.stdout.write("  Répartition :")
+        for category, count in categories.most_common():
+            self.stdout.write(f"    {category:<20} {100 * count / total:6.1f} %")
+
+        self.stdout.write("  Temps propre :")
+        for label, count in self_time.most_common(top):
+            self.stdout.write(f"    {100 * count / total:6.1f} %  {label}")
+
+        self.stdout.write("  Temps inclusif :")
+        for label, count in inclusive.most_common(top):
+            self.stdout.write(f"    {100 * count / total:6.1f} %  {label}")
+
+        self.stdout.write("  Chemins chauds :")
+        for stack, count in merged.most_common(min(top, 5)):
+            tail = ' > '.join(label.split(' (')[0] for label in stack.split(';')[-6:])
+            self.stdout.write(f"    {100 * count / total:6.1f} %  … > {tail}")
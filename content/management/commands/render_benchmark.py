@@ -0,0 +1,65 @@
+import gzip
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from content.models import Project, Service, Testimonial
+from content.renderers import MessagePackRenderer, msgpack
+from content.serializers import ProjectSerializer, ServiceSerializer, TestimonialSerializer
+
+SERIALIZERS = [
+    ('services', ServiceSerializer, Service.objects.filter(is_active=True)),
+    ('projets', ProjectSerializer, Project.objects.all()),
+    ('témoignages', TestimonialSerializer, Testimonial.objects.filter(is_approved=True)),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare la taille et le temps d'encodage (et de décodage) des listes "
+        "publiques en JSON et en MessagePack"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help="Objets par liste (une page de l'API)")
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        if msgpack is None:
+            raise CommandError("Le paquet msgpack n'est pas installé.")
+        if options['iterations'] < 1 or options['limit'] < 1:
+            raise CommandError("--limit et --iterations doivent être positifs.")
+        formats = [
+            ('json', JSONRenderer(), json.loads),
+            ('msgpack', MessagePackRenderer(), lambda body: msgpack.unpackb(body, timestamp=3)),
+        ]
+
+        for label, serializer_class, queryset in SERIALIZERS:
+            data = serializer_class(queryset[:options['limit']], many=True).data
+            self.stdout.write(f"{label} ({len(data)} objet(s))")
+            sizes = {}
+            for name, renderer, decode in formats:
+                body = renderer.render(data)
+                sizes[name] = len(body)
+                encode = self.measure(lambda: renderer.render(data), options['iterations'])
+                parse = self.measure(lambda: decode(body), options['iterations'])
+                self.stdout.write(
+                    f"  {name:<8} {len(body):>9} o   gzip {len(gzip.compress(body)):>8} o   "
+                    f"encodage p50 {statistics.median(encode):7.3f} ms   "
+                    f"décodage p50 {statistics.median(parse):7.3f} ms"
+                )
+            if sizes['json']:
+                saved = 100 * (1 - sizes['msgpack'] / sizes['json'])
+                self.stdout.write(self.style.SUCCESS(f"  MessagePack : {saved:.1f} % plus léger"))
+
+    @staticmethod
+    def measure(func, iterations):
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
@@ -0,0 +1,104 @@
+import logging
+import os
+import signal
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, close_old_connections, connection
+
+from content.jobs import run_next
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Exécute les tâches de fond en file (content.jobs) ; plusieurs workers "
+        "peuvent tourner en parallèle sur la même base"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=1,
+            help="Threads d'exécution (une connexion à la base chacun)",
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'CONTENT_JOB_POLL_INTERVAL', 1.0),
+            help="Attente (secondes) quand la file est vide",
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="S'arrête dès que la file est vide (cron, tests)",
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency doit être positif.")
+        self.stop = threading.Event()
+        self.processed = 0
+        self.lock = threading.Lock()
+        base_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            # Arrêt propre : les tâches en cours se terminent, aucune nouvelle n'est prise
+            previous_handler = signal.signal(signal.SIGTERM, lambda *args: self.stop.set())
+        try:
+            self.run(base_id, options)
+        finally:
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
+        self.stdout.write(f"{self.processed} tâche(s) exécutée(s).")
+
+    def run(self, base_id, options):
+        if options['concurrency'] == 1:
+            self.loop(base_id, options)
+        else:
+            threads = [
+                threading.Thread(
+                    target=self.run_thread, args=(f"{base_id}:{i}", options),
+                    name=f'worker-{i}', daemon=True,
+                )
+                for i in range(options['concurrency'])
+            ]
+            for thread in threads:
+                thread.start()
+            try:
+                for thread in threads:
+                    while thread.is_alive():
+                        thread.join(timeout=0.5)
+            except KeyboardInterrupt:
+                self.stop.set()
+                for thread in threads:
+                    thread.join()
+
+    def run_thread(self, worker_id, options):
+        try:
+            self.loop(worker_id, options)
+        finally:
+            # Connexion propre au thread : à fermer explicitement
+            connection.close()
+
+    def loop(self, worker_id, options):
+        while not self.stop.is_set():
+            # Comme entre deux requêtes HTTP : connexions trop anciennes ou cassées
+            # fermées, sauf si la commande tourne dans la transaction de
+            # l'appelant (tests), dont la connexion doit rester ouverte
+            if not connection.in_atomic_block:
+                close_old_connections()
+            try:
+                ran = run_next(worker_id)
+            except DatabaseError:
+                # Base momentanément indisponible : le worker attend et réessaie
+                logger.exception("Worker %s : erreur de base de données", worker_id)
+                ran = False
+            if ran:
+                with self.lock:
+                    self.processed += 1
+                continue
+            if options['once']:
+                return
+            self.stop.wait(options['poll_interval'])
@@ -0,0 +1,70 @@
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from content.slow_queries import load_entries
+
+
+class Command(BaseCommand):
+    help = "Regroupe le journal des requêtes lentes par empreinte de requête"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', default=None, help="Fichier JSONL (défaut : CONTENT_SLOW_QUERY_LOG)")
+        parser.add_argument('--view', default=None, help="Limite le rapport à un nom de vue")
+        parser.add_argument('--top', type=int, default=10, help="Nombre d'empreintes affichées")
+        parser.add_argument(
+            '--sort', choices=['total', 'count', 'max'], default='total',
+            help="Tri : temps cumulé, nombre d'occurrences ou durée maximale",
+        )
+        parser.add_argument('--explain', action='store_true', help="Affiche le dernier plan capturé")
+
+    def handle(self, *args, **options):
+        path = Path(options['log'] or getattr(
+            settings, 'CONTENT_SLOW_QUERY_LOG', settings.BASE_DIR / 'logs' / 'slow_queries.jsonl'
+        ))
+        if not path.exists():
+            raise CommandError(f"Journal introuvable : {path}")
+        entries = load_entries(path)
+        if options['view']:
+            entries = [entry for entry in entries if entry.get('view') == options['view']]
+        if not entries:
+            self.stdout.write("Aucune requête lente enregistrée.")
+            return
+
+        groups = {}
+        for entry in entries:
+            groups.setdefault(entry['fingerprint'], []).append(entry)
+
+        def total(items):
+            return sum(item['duration_ms'] for item in items)
+
+        sort_key = {
+            'total': total,
+            'count': len,
+            'max': lambda items: max(item['duration_ms'] for item in items),
+        }[options['sort']]
+        ranked = sorted(groups.items(), key=lambda group: sort_key(group[1]), reverse=True)
+
+        self.stdout.write(f"{len(entries)} requête(s) lente(s), {len(groups)} empreinte(s)")
+        for sql, items in ranked[:options['top']]:
+            durations = sorted(item['duration_ms'] for item in items)
+            self.stdout.write('')
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{len(items)}x  total {total(items):.0f} ms  "
+                f"médiane {durations[len(durations) // 2]:.0f} ms  max {durations[-1]:.0f} ms"
+            ))
+            self.stdout.write(f"  {sql}")
+            views = Counter(item.get('view') or '-' for item in items)
+            self.stdout.write("  Vues   : " + ', '.join(f"{name} ({count})" for name, count in views.most_common(5)))
+            frames = Counter(item.get('frame') or '-' for item in items)
+            self.stdout.write("  Appels : " + ', '.join(f"{name} ({count})" for name, count in frames.most_common(3)))
+            slowest = max(items, key=lambda item: item['duration_ms'])
+            self.stdout.write(f"  Paramètres (plus lente) : {slowest.get('params')}")
+            if options['explain']:
+                plans = [item['explain'] for item in items if item.get('explain')]
+                if plans:
+                    self.stdout.write("  Plan :")
+                    for line in plans[-1].splitlines():
+                        self.stdout.write(f"    {line}")
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from content.partitioning import (
+    GRANULARITIES, convert_to_partitioned, ensure_partitions, existing_granularity,
+    existing_partitions, is_partitioned, next_period, period_start,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Gère le partitionnement PostgreSQL de la table des témoignages : "
+        "conversion initiale et création des partitions à venir (à planifier en cron)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert', action='store_true',
+            help="Convertit la table existante en table partitionnée",
+        )
+        parser.add_argument(
+            '--keep-legacy', action='store_true',
+            help="Conserve l'ancienne table sous le nom content_testimonial_legacy",
+        )
+        parser.add_argument(
+            '--granularity', choices=GRANULARITIES,
+            help="Granularité à la conversion (par défaut "
+                 "CONTENT_TESTIMONIAL_PARTITION_GRANULARITY) ; ensuite, celle des "
+                 "partitions existantes",
+        )
+        parser.add_argument(
+            '--ahead', type=int,
+            default=getattr(settings, 'CONTENT_TESTIMONIAL_PARTITIONS_AHEAD', 3),
+            help="Nombre de périodes futures à créer à l'avance",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Le partitionnement n'est disponible qu'avec PostgreSQL.")
+
+        if options['convert']:
+            if is_partitioned(connection):
+                raise CommandError("La table des témoignages est déjà partitionnée.")
+            granularity = options['granularity'] or getattr(
+                settings, 'CONTENT_TESTIMONIAL_PARTITION_GRANULARITY', 'month'
+            )
+            ahead_until = self.ahead_until(granularity, options['ahead'])
+            convert_to_partitioned(
+                connection, granularity, ahead_until, keep_legacy=options['keep_legacy']
+            )
+            self.stdout.write(self.style.SUCCESS("Table des témoignages partitionnée."))
+        elif not is_partitioned(connection):
+            raise CommandError(
+                "La table des témoignages n'est pas partitionnée (utiliser --convert)."
+            )
+        else:
+            granularity = self.detect_granularity(options['granularity'])
+            ahead_until = self.ahead_until(granularity, options['ahead'])
+            created = ensure_partitions(
+                connection, granularity, timezone.now().date(), ahead_until
+            )
+            for name in created:
+                self.stdout.write(f"Partition créée : {name}")
+
+        partitions = existing_partitions(connection)
+        self.stdout.write(f"{len(partitions)} partition(s) : {', '.join(partitions)}")
+
+    def detect_granularity(self, requested):
+        """Granularité des partitions existantes ; une autre produirait des chevauchements"""
+        try:
+            existing = existing_granularity(connection)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if requested and existing and requested != existing:
+            raise CommandError(
+                f"Les partitions existantes sont découpées par {existing!r}, "
+                f"pas par {requested!r}."
+            )
+        return existing or requested or getattr(
+            settings, 'CONTENT_TESTIMONIAL_PARTITION_GRANULARITY', 'month'
+        )
+
+    @staticmethod
+    def ahead_until(granularity, ahead):
+        until = period_start(timezone.now().date(), granularity)
+        for _ in range(ahead):
+            until = next_period(until, granularity)
+        return until
@@ -0,0 +1,155 @@
+"""
+Service des fichiers media (images de projets et dérivés) en production.
+
+- ETag fort dérivé de (mtime, taille), comme nginx, et réponses 304 sur
+  If-None-Match / If-Modified-Since ;
+- requêtes ``Range`` à intervalle unique (206 / 416), avec If-Range ;
+- ``Cache-Control`` longue durée pour les noms immuables (contenant une
+  empreinte du contenu, ex. ``projects/derived/logo.3f2a9c1b.webp``) ;
+- mode délégation ``X-Sendfile`` / ``X-Accel-Redirect`` : Python ne renvoie
+  alors que les en-têtes et le serveur web transmet les octets.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_http_methods
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _etag(st):
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def _etag_matches(header, etag):
+    """Comparaison faible d'If-None-Match (RFC 9110, 13.1.2)"""
+    if header.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in header.split(',')]
+    return any(tag.removeprefix('W/') == etag for tag in candidates)
+
+
+def _parse_range(header, size):
+    """
+    Retourne (début, fin inclusive) pour un intervalle unique, None si
+    l'en-tête est ignoré (absent, multiple ou mal formé), ou False si
+    l'intervalle n'est pas satisfiable.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffixe : les N derniers octets
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return False
+    return start, end
+
+
+def _cache_control(path):
+    pattern = getattr(settings, 'CONTENT_MEDIA_IMMUTABLE_PATTERN', r'\.[0-9a-f]{8,}\.\w+$')
+    if pattern and re.search(pattern, path):
+        return 'public, max-age=31536000, immutable'
+    return f"public, max-age={getattr(settings, 'CONTENT_MEDIA_MAX_AGE', 3600)}"
+
+
+def _file_chunks(full_path, start, length):
+    with open(full_path, 'rb') as media_file:
+        media_file.seek(start)
+        while length > 0:
+            chunk = media_file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+@require_http_methods(['GET', 'HEAD'])
+def serve_media(request, path):
+    """Sert un fichier de MEDIA_ROOT situé sous un préfixe autorisé"""
+    prefixes = getattr(settings, 'CONTENT_MEDIA_PREFIXES', ('projects/',))
+    path = posixpath.normpath(path).lstrip('/')
+    if not path.startswith(tuple(prefixes)):
+        raise Http404
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        st = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404
+
+    etag = _etag(st)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(st.st_mtime),
+        'Cache-Control': _cache_control(path),
+        'Accept-Ranges': 'bytes',
+    }
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    if (if_none_match and _etag_matches(if_none_match, etag)) or (
+        not if_none_match and if_modified_since and int(st.st_mtime) <= if_modified_since
+    ):
+        response = HttpResponseNotModified()
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+
+    backend = getattr(settings, 'CONTENT_MEDIA_SENDFILE', None)
+    if backend:
+        # Le serveur web se charge du corps, des intervalles et de la longueur
+        response = HttpResponse(content_type=content_type)
+        if backend == 'x-accel-redirect':
+            prefix = getattr(settings, 'CONTENT_MEDIA_ACCEL_PREFIX', '/protected-media/')
+            response['X-Accel-Redirect'] = prefix + path
+        else:
+            response['X-Sendfile'] = full_path
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    size = st.st_size
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range or if_range.strip() == etag:
+        byte_range = _parse_range(request.META.get('HTTP_RANGE'), size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1 if size else 0
+    body = _file_chunks(full_path, start, length) if request.method == 'GET' else ()
+    response = StreamingHttpResponse(
+        body, status=206 if byte_range else 200, content_type=content_type
+    )
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(length)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    for name, value in headers.items():
+        response[name] = value
+    return response
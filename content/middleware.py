@@ -0,0 +1,105 @@
+import hmac
+import random
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from .database import StatementTimeout, timeout_for
+from .profiling import StackSampler
+from .slow_queries import current_view
+
+
+class SamplingProfilerMiddleware:
+    """
+    Profile une fraction des requêtes (CONTENT_PROFILER_SAMPLE_RATE) ou
+    celles qui présentent l'en-tête X-Profile-Token attendu, et écrit un
+    fichier par requête dans CONTENT_PROFILER_DIR/<nom d'URL>/.
+    """
+
+    header = 'HTTP_X_PROFILE_TOKEN'
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'CONTENT_PROFILER_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'CONTENT_PROFILER_SAMPLE_RATE', 0.0)
+        self.token = getattr(settings, 'CONTENT_PROFILER_TOKEN', '')
+        self.interval = getattr(settings, 'CONTENT_PROFILER_INTERVAL', 0.005)
+        self.directory = getattr(settings, 'CONTENT_PROFILER_DIR', settings.BASE_DIR / 'profiles')
+        self.format = getattr(settings, 'CONTENT_PROFILER_FORMAT', 'collapsed')
+
+    def should_profile(self, request):
+        """Requête autorisée par jeton, ou tirée au sort"""
+        supplied = request.META.get(self.header)
+        if supplied and self.token and hmac.compare_digest(supplied, self.token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        sampler = StackSampler(interval=self.interval).start()
+        try:
+            # Les réponses DRF sont déjà rendues ici : le rendu fait partie du profil
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+
+        match = request.resolver_match
+        name = match.view_name.replace(':', '.') if match else 'unresolved'
+        sampler.dump(self.directory, name, self.format)
+        return response
+
+
+class QueryContextMiddleware:
+    """
+    Expose le nom de la vue en cours au journal des requêtes lentes
+    (content.slow_queries) ; le chemin sert tant que l'URL n'est pas résolue.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'CONTENT_SLOW_QUERY_LOG_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_view.set(request.path)
+        try:
+            return self.get_response(request)
+        finally:
+            current_view.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if match is not None:
+            current_view.set(match.view_name)
+
+
+class StatementTimeoutMiddleware:
+    """
+    Limite la durée des instructions SQL de la vue (content.database) :
+    une recherche qui dégénère est interrompue par PostgreSQL au lieu
+    d'occuper le worker. La limite est choisie une fois l'URL résolue et
+    couvre aussi le rendu des TemplateResponse (changelists de l'admin).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if connection.vendor != 'postgresql':
+            return self.get_response(request)
+        wrapper = StatementTimeout(connection)
+        request.statement_timeout = wrapper
+        with connection.execute_wrapper(wrapper):
+            try:
+                return self.get_response(request)
+            finally:
+                wrapper.restore()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        wrapper = getattr(request, 'statement_timeout', None)
+        if wrapper is not None:
+            wrapper.milliseconds = timeout_for(request, view_func)
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "content",
+            "0002_alter_project_completion_date_alter_project_demo_url_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "scope",
+                    models.CharField(
+                        max_length=50, unique=True, verbose_name="Périmètre"
+                    ),
+                ),
+                (
+                    "version",
+                    models.PositiveBigIntegerField(default=0, verbose_name="Version"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date de modification"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Version du contenu",
+                "verbose_name_plural": "Versions du contenu",
+            },
+        ),
+    ]
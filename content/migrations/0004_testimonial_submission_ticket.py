@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0003_contentversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testimonial",
+            name="submission_ticket",
+            field=models.UUIDField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Renseigné pour les témoignages soumis via l'API publique",
+                null=True,
+                verbose_name="Ticket de soumission",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0004_testimonial_submission_ticket"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="testimonial",
+            index=models.Index(
+                fields=["is_approved", "-created_at"],
+                name="testimonial_approved_recent",
+            ),
+        ),
+    ]
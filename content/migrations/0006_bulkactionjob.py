@@ -0,0 +1,95 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0005_testimonial_approved_recent"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BulkActionJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("approve", "Approbation des témoignages"),
+                            ("unapprove", "Désapprobation des témoignages"),
+                        ],
+                        max_length=20,
+                        verbose_name="Action",
+                    ),
+                ),
+                (
+                    "object_ids",
+                    models.JSONField(
+                        default=list, verbose_name="Identifiants concernés"
+                    ),
+                ),
+                ("total", models.PositiveIntegerField(default=0, verbose_name="Total")),
+                (
+                    "processed",
+                    models.PositiveIntegerField(default=0, verbose_name="Traités"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "En attente"),
+                            ("running", "En cours"),
+                            ("done", "Terminée"),
+                            ("failed", "Échouée"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="Statut",
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Erreur")),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Début"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Fin"),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Lancée par",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Action en masse",
+                "verbose_name_plural": "Actions en masse",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
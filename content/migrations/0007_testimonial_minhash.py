@@ -0,0 +1,73 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0006_bulkactionjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testimonial",
+            name="minhash_signature",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="testimonial",
+            name="suspected_duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="suspected_duplicates",
+                to="content.testimonial",
+                verbose_name="Doublon suspecté de",
+            ),
+        ),
+        migrations.CreateModel(
+            name="TestimonialLSHBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("band", models.PositiveSmallIntegerField(verbose_name="Bande")),
+                ("bucket", models.BigIntegerField(verbose_name="Seau")),
+                (
+                    "testimonial",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lsh_buckets",
+                        to="content.testimonial",
+                        verbose_name="Témoignage",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Seau LSH",
+                "verbose_name_plural": "Seaux LSH",
+                "indexes": [
+                    models.Index(
+                        fields=["band", "bucket"], name="testimonial_lsh_lookup"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("testimonial", "band"),
+                        name="testimonial_lsh_unique_band",
+                    )
+                ],
+            },
+        ),
+    ]
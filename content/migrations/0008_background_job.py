@@ -0,0 +1,125 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0007_testimonial_minhash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="image_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Variantes de l'image",
+            ),
+        ),
+        migrations.CreateModel(
+            name="BackgroundJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task", models.CharField(max_length=100, verbose_name="Tâche")),
+                (
+                    "payload",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Paramètres"
+                    ),
+                ),
+                (
+                    "dedup_key",
+                    models.CharField(
+                        blank=True,
+                        max_length=200,
+                        null=True,
+                        verbose_name="Clé de déduplication",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "En attente"),
+                            ("running", "En cours"),
+                            ("done", "Terminée"),
+                            ("failed", "Échouée"),
+                        ],
+                        default="queued",
+                        max_length=20,
+                        verbose_name="Statut",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(default=0, verbose_name="Tentatives"),
+                ),
+                (
+                    "max_attempts",
+                    models.PositiveIntegerField(
+                        default=5, verbose_name="Tentatives maximales"
+                    ),
+                ),
+                (
+                    "run_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Exécution prévue",
+                    ),
+                ),
+                (
+                    "locked_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Prise en charge"
+                    ),
+                ),
+                (
+                    "locked_by",
+                    models.CharField(blank=True, max_length=100, verbose_name="Worker"),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="Dernière erreur"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Fin"),
+                ),
+            ],
+            options={
+                "verbose_name": "Tâche de fond",
+                "verbose_name_plural": "Tâches de fond",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "run_at"], name="background_job_next"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("status", "queued")),
+                        fields=("dedup_key",),
+                        name="background_job_queued_dedup_key",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:02
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0008_background_job"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageUpload",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "filename",
+                    models.CharField(max_length=255, verbose_name="Nom du fichier"),
+                ),
+                (
+                    "size",
+                    models.PositiveBigIntegerField(verbose_name="Taille attendue"),
+                ),
+                (
+                    "checksum",
+                    models.CharField(max_length=64, verbose_name="SHA-256 attendu"),
+                ),
+                (
+                    "offset",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Octets reçus"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "En cours"), ("attached", "Rattaché")],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="Statut",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date de modification"
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Envoyé par",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="image_uploads",
+                        to="content.project",
+                        verbose_name="Projet",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Envoi d'image",
+                "verbose_name_plural": "Envois d'images",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
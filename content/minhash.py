@@ -0,0 +1,197 @@
+"""
+Détection des témoignages quasi dupliqués par MinHash et LSH.
+
+Le contenu est normalisé (minuscules, accents et ponctuation retirés) puis
+découpé en triplets de mots. La signature MinHash de ``NUM_PERMUTATIONS``
+valeurs estime la similarité de Jaccard entre deux contenus : c'est la
+proportion de valeurs égales. Elle est découpée en ``BANDS`` bandes ; deux
+témoignages partageant le seau d'une bande sont candidats, et seuls les
+candidats sont comparés. Avec 16 bandes de 4 valeurs, une paire de
+similarité 0,6 est retrouvée dans plus de 85 % des cas.
+
+Les seaux sont stockés dans ``TestimonialLSHBucket`` et tenus à jour à chaque
+sauvegarde ; la commande ``cluster_testimonials`` regroupe toute la table en
+temps quasi linéaire.
+"""
+import hashlib
+import re
+import unicodedata
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Testimonial, TestimonialLSHBucket
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+
+# Permutations (a * x + b) mod p sur des empreintes de 32 bits :
+# le produit tient dans 64 bits non signés
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(20250101)
+_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERMUTATIONS).astype(np.uint64)
+_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def duplicate_threshold():
+    return getattr(settings, 'CONTENT_DUPLICATE_THRESHOLD', 0.6)
+
+
+def shingles(text):
+    """Triplets de mots du texte normalisé (le texte entier s'il est plus court)"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    words = _NON_WORD.sub(' ', text).split()
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {
+        ' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def _hash32(value):
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=4).digest(), 'little')
+
+
+def signature(text):
+    """Signature MinHash (tableau uint32) du texte"""
+    values = np.fromiter((_hash32(shingle) for shingle in shingles(text)), dtype=np.uint64)
+    if not len(values):
+        return np.full(NUM_PERMUTATIONS, (1 << 32) - 1, dtype=np.uint32)
+    permuted = (_A[:, None] * values[None, :] + _B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def to_bytes(sig):
+    return np.asarray(sig, dtype='<u4').tobytes()
+
+
+def from_bytes(data):
+    return np.frombuffer(bytes(data), dtype='<u4')
+
+
+def similarity(sig_a, sig_b):
+    """Similarité de Jaccard estimée entre deux signatures"""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERMUTATIONS
+
+
+def band_buckets(sig):
+    """Seau (entier signé 64 bits) de chaque bande"""
+    buckets = []
+    for band in range(BANDS):
+        chunk = sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(to_bytes(chunk), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+
+def assign_signature(testimonial):
+    """Calcule la signature ; retourne True si elle a changé"""
+    data = to_bytes(signature(testimonial.content))
+    previous = testimonial.minhash_signature
+    testimonial.minhash_signature = data
+    return previous is None or bytes(previous) != data
+
+
+def _bucket_filter(buckets):
+    condition = Q()
+    for band, bucket in enumerate(buckets):
+        condition |= Q(band=band, bucket=bucket)
+    return condition
+
+
+def find_duplicate_of(testimonial, buckets):
+    """
+    Plus ancien témoignage partageant un seau avec ``testimonial`` et dont la
+    similarité estimée atteint le seuil, ou None.
+    """
+    sig = from_bytes(testimonial.minhash_signature)
+    candidate_ids = (
+        TestimonialLSHBucket.objects
+        .filter(_bucket_filter(buckets), testimonial_id__lt=testimonial.pk)
+        .values_list('testimonial_id', flat=True)
+    )
+    rows = Testimonial.objects.filter(pk__in=candidate_ids).order_by('pk').values_list(
+        'pk', 'minhash_signature'
+    )
+    threshold = duplicate_threshold()
+    for pk, data in rows:
+        if data is not None and similarity(sig, from_bytes(data)) >= threshold:
+            return pk
+    return None
+
+
+def index_testimonials(testimonials):
+    """
+    Remplace les seaux LSH des témoignages (signature déjà calculée et
+    enregistrée) et met à jour leur doublon suspecté.
+    """
+    testimonials = [t for t in testimonials if t.minhash_signature is not None]
+    if not testimonials:
+        return
+    with transaction.atomic():
+        TestimonialLSHBucket.objects.filter(
+            testimonial_id__in=[t.pk for t in testimonials]
+        ).delete()
+        buckets = {t.pk: band_buckets(from_bytes(t.minhash_signature)) for t in testimonials}
+        TestimonialLSHBucket.objects.bulk_create([
+            TestimonialLSHBucket(testimonial_id=pk, band=band, bucket=bucket)
+            for pk, values in buckets.items()
+            for band, bucket in enumerate(values)
+        ], batch_size=1000)
+        for testimonial in testimonials:
+            duplicate_of = find_duplicate_of(testimonial, buckets[testimonial.pk])
+            if duplicate_of != testimonial.suspected_duplicate_of_id:
+                testimonial.suspected_duplicate_of_id = duplicate_of
+                # update() : pas de nouveau passage dans les signaux de sauvegarde
+                Testimonial.objects.filter(pk=testimonial.pk).update(
+                    suspected_duplicate_of=duplicate_of
+                )
+
+
+def cluster(rows):
+    """
+    Regroupe les témoignages quasi identiques à partir de [(pk, signature)].
+
+    Dans chaque seau, chaque membre n'est comparé qu'au premier : le coût
+    reste linéaire même pour un seau très peuplé. Retourne les groupes d'au
+    moins deux identifiants, triés, du plus grand au plus petit.
+    """
+    signatures = {}
+    buckets = {}
+    for pk, data in rows:
+        if data is None:
+            continue
+        sig = from_bytes(data)
+        signatures[pk] = sig
+        for band, bucket in enumerate(band_buckets(sig)):
+            buckets.setdefault((band, bucket), []).append(pk)
+
+    parent = {pk: pk for pk in signatures}
+
+    def find(pk):
+        while parent[pk] != pk:
+            parent[pk] = parent[parent[pk]]
+            pk = parent[pk]
+        return pk
+
+    threshold = duplicate_threshold()
+    for members in buckets.values():
+        head = members[0]
+        for other in members[1:]:
+            root_head, root_other = find(head), find(other)
+            if root_head != root_other and similarity(signatures[head], signatures[other]) >= threshold:
+                parent[max(root_head, root_other)] = min(root_head, root_other)
+
+    groups = {}
+    for pk in signatures:
+        groups.setdefault(find(pk), []).append(pk)
+    clusters = [sorted(members) for members in groups.values() if len(members) > 1]
+    clusters.sort(key=lambda members: (-len(members), members[0]))
+    return clusters
@@ -1,4 +1,7 @@
+import uuid
+
 from django.db import models
+from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from datetime import timedelta
@@ -29,6 +32,10 @@ class Project(models.Model):
     name = models.CharField(max_length=200, verbose_name="Nom du projet")
     description = models.TextField(verbose_name="Description")
     image = models.ImageField(upload_to='projects/', verbose_name="Image du projet")
+    # Largeur -> chemin des dérivés WebP (tâche process_project_image)
+    image_variants = models.JSONField(
+        default=dict, blank=True, editable=False, verbose_name="Variantes de l'image"
+    )
     technologies = models.CharField(
         max_length=300, 
         verbose_name="Technologies utilisées", 
@@ -67,6 +74,27 @@ class Testimonial(models.Model):
         verbose_name="Note"
     )
     is_approved = models.BooleanField(default=False, verbose_name="Approuvé")
+    submission_ticket = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name="Ticket de soumission",
+        help_text="Renseigné pour les témoignages soumis via l'API publique"
+    )
+    # Signature MinHash du contenu (content.minhash), recalculée à chaque sauvegarde
+    minhash_signature = models.BinaryField(null=True, blank=True, editable=False)
+    suspected_duplicate_of = models.ForeignKey(
+        'self',
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        # Une table partitionnée ne peut pas être la cible d'une contrainte
+        db_constraint=False,
+        related_name='suspected_duplicates',
+        verbose_name="Doublon suspecté de",
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Date de modification")
 
@@ -74,6 +102,10 @@ class Testimonial(models.Model):
         verbose_name = "Témoignage"
         verbose_name_plural = "Témoignages"
         ordering = ['-created_at']
+        indexes = [
+            # Requête publique : approuvés, du plus récent au plus ancien
+            models.Index(fields=['is_approved', '-created_at'], name='testimonial_approved_recent'),
+        ]
 
     def __str__(self):
         return f"{self.author} - {self.company}"
@@ -81,4 +113,177 @@ class Testimonial(models.Model):
     @property
     def rating_stars(self):
         """Retourne la note sous forme d'étoiles"""
-        return "★" * self.rating + "☆" * (5 - self.rating)
\ No newline at end of file
+        return "★" * self.rating + "☆" * (5 - self.rating)
+
+
+class TestimonialLSHBucket(models.Model):
+    """Seau LSH d'une bande de la signature MinHash d'un témoignage"""
+    testimonial = models.ForeignKey(
+        Testimonial,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name='lsh_buckets',
+        verbose_name="Témoignage",
+    )
+    band = models.PositiveSmallIntegerField(verbose_name="Bande")
+    bucket = models.BigIntegerField(verbose_name="Seau")
+
+    class Meta:
+        verbose_name = "Seau LSH"
+        verbose_name_plural = "Seaux LSH"
+        indexes = [
+            models.Index(fields=['band', 'bucket'], name='testimonial_lsh_lookup'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['testimonial', 'band'], name='testimonial_lsh_unique_band'),
+        ]
+
+    def __str__(self):
+        return f"{self.testimonial_id} [{self.band}] {self.bucket}"
+
+
+class ContentVersion(models.Model):
+    """Compteur de version du contenu public, incrémenté à chaque écriture"""
+    scope = models.CharField(max_length=50, unique=True, verbose_name="Périmètre")
+    version = models.PositiveBigIntegerField(default=0, verbose_name="Version")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Date de modification")
+
+    class Meta:
+        verbose_name = "Version du contenu"
+        verbose_name_plural = "Versions du contenu"
+
+    def __str__(self):
+        return f"{self.scope} v{self.version}"
+
+
+class BulkActionJob(models.Model):
+    """Action d'administration en masse exécutée par lots en arrière-plan"""
+    ACTION_CHOICES = [
+        ('approve', "Approbation des témoignages"),
+        ('unapprove', "Désapprobation des témoignages"),
+    ]
+    STATUS_CHOICES = [
+        ('pending', "En attente"),
+        ('running', "En cours"),
+        ('done', "Terminée"),
+        ('failed', "Échouée"),
+    ]
+
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES, verbose_name="Action")
+    object_ids = models.JSONField(default=list, verbose_name="Identifiants concernés")
+    total = models.PositiveIntegerField(default=0, verbose_name="Total")
+    processed = models.PositiveIntegerField(default=0, verbose_name="Traités")
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Statut"
+    )
+    error = models.TextField(blank=True, verbose_name="Erreur")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL,
+        verbose_name="Lancée par",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Début")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Fin")
+
+    class Meta:
+        verbose_name = "Action en masse"
+        verbose_name_plural = "Actions en masse"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.get_action_display()} ({self.processed}/{self.total})"
+
+    @property
+    def progress(self):
+        """Avancement en pourcentage"""
+        if not self.total:
+            return 100
+        return round(100 * self.processed / self.total)
+
+
+class BackgroundJob(models.Model):
+    """Tâche de fond en file d'attente, exécutée par la commande run_worker"""
+    STATUS_CHOICES = [
+        ('queued', "En attente"),
+        ('running', "En cours"),
+        ('done', "Terminée"),
+        ('failed', "Échouée"),
+    ]
+    task = models.CharField(max_length=100, verbose_name="Tâche")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Paramètres")
+    # Au plus une tâche en attente par clé : une nouvelle demande la rejoint.
+    # Une tâche déjà en cours a pu lire des données périmées : elle ne compte pas.
+    dedup_key = models.CharField(
+        max_length=200, null=True, blank=True, verbose_name="Clé de déduplication"
+    )
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default='queued', verbose_name="Statut"
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Tentatives")
+    max_attempts = models.PositiveIntegerField(default=5, verbose_name="Tentatives maximales")
+    run_at = models.DateTimeField(default=timezone.now, verbose_name="Exécution prévue")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="Prise en charge")
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name="Worker")
+    last_error = models.TextField(blank=True, verbose_name="Dernière erreur")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Fin")
+
+    class Meta:
+        verbose_name = "Tâche de fond"
+        verbose_name_plural = "Tâches de fond"
+        ordering = ['-created_at']
+        indexes = [
+            # Prise en charge : prochaines tâches en attente
+            models.Index(fields=['status', 'run_at'], name='background_job_next'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedup_key'],
+                condition=models.Q(status='queued'),
+                name='background_job_queued_dedup_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task} n°{self.pk} ({self.get_status_display()})"
+
+
+class ImageUpload(models.Model):
+    """Envoi fractionné et reprenable d'une image de projet (content.uploads)"""
+    STATUS_CHOICES = [
+        ('pending', "En cours"),
+        ('attached', "Rattaché"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    filename = models.CharField(max_length=255, verbose_name="Nom du fichier")
+    size = models.PositiveBigIntegerField(verbose_name="Taille attendue")
+    checksum = models.CharField(max_length=64, verbose_name="SHA-256 attendu")
+    # Octets reçus et écrits à la suite dans le fichier partiel
+    offset = models.PositiveBigIntegerField(default=0, verbose_name="Octets reçus")
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Statut"
+    )
+    project = models.ForeignKey(
+        Project, null=True, blank=True, on_delete=models.SET_NULL,
+        related_name='image_uploads', verbose_name="Projet",
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL,
+        verbose_name="Envoyé par",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Date de modification")
+
+    class Meta:
+        verbose_name = "Envoi d'image"
+        verbose_name_plural = "Envois d'images"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def partial_name(self):
+        """Fichier partiel, hors des préfixes servis publiquement"""
+        return f"uploads/partial/{self.pk}"
@@ -0,0 +1,55 @@
+"""
+Réordonnancement en masse des services.
+
+Un nouvel ordre complet est appliqué en une seule instruction
+``UPDATE ... SET display_order = CASE id WHEN ... END`` dans une transaction.
+Seules les lignes dont la position change sont modifiées (et voient leur
+``updated_at`` avancer), puis une unique invalidation est signalée.
+"""
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+
+from .models import Service
+from .invalidation import mark_changed
+
+
+class InvalidOrdering(ValueError):
+    """L'ordre fourni n'est pas une permutation complète des services"""
+
+
+def reorder_services(ordered_ids):
+    """
+    Applique ``ordered_ids`` (tous les services, dans l'ordre voulu) :
+    display_order vaut 1, 2, 3... Retourne le nombre de services déplacés.
+    """
+    try:
+        ordered_ids = [int(pk) for pk in ordered_ids]
+    except (TypeError, ValueError):
+        raise InvalidOrdering("Les identifiants doivent être des entiers.")
+    if len(set(ordered_ids)) != len(ordered_ids):
+        raise InvalidOrdering("Un service apparaît plusieurs fois.")
+
+    with transaction.atomic():
+        # Verrou : deux réordonnancements simultanés s'exécutent l'un après l'autre
+        current = dict(
+            Service.objects.select_for_update().values_list('pk', 'display_order')
+        )
+        if set(current) != set(ordered_ids):
+            raise InvalidOrdering("L'ordre doit contenir tous les services, une seule fois.")
+        moved = {
+            pk: position
+            for position, pk in enumerate(ordered_ids, start=1)
+            if current[pk] != position
+        }
+        if not moved:
+            return 0
+        Service.objects.filter(pk__in=list(moved)).update(
+            display_order=Case(
+                *[When(pk=pk, then=Value(position)) for pk, position in moved.items()],
+                output_field=IntegerField(),
+            ),
+            updated_at=timezone.now(),
+        )
+        mark_changed(Service, list(moved))
+    return len(moved)
@@ -0,0 +1,223 @@
+"""
+Partitionnement déclaratif PostgreSQL de la table des témoignages.
+
+La table ``content_testimonial`` peut être convertie (commande
+``testimonial_partitions --convert``) en table partitionnée par intervalle
+sur ``created_at``, avec une partition par année ou par mois et une
+partition par défaut. Django continue d'y accéder comme à une table
+ordinaire.
+
+Contraintes propres aux tables partitionnées :
+- la clé primaire devient (id, created_at), l'unicité de ``id`` reste
+  garantie par la séquence ;
+- aucune clé étrangère ne peut cibler la table : les modèles qui
+  référencent ``Testimonial`` utilisent ``db_constraint=False``.
+"""
+import re
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.db import transaction
+
+from .models import Testimonial
+
+TABLE = Testimonial._meta.db_table
+GRANULARITIES = ('year', 'month')
+DEFAULT_PARTITION = f"{TABLE}_default"
+# Bornes d'une partition telles que rendues par pg_get_expr(relpartbound)
+_BOUND_RE = re.compile(r"FROM \('(\d{4})-(\d{2})-\d{2}[^)]*\) TO \('(\d{4})-(\d{2})-\d{2}")
+
+
+def period_start(day, granularity):
+    """Premier jour de la période (année ou mois) contenant ``day``"""
+    if granularity == 'year':
+        return date(day.year, 1, 1)
+    return date(day.year, day.month, 1)
+
+
+def next_period(start, granularity):
+    if granularity == 'year':
+        return date(start.year + 1, 1, 1)
+    if start.month == 12:
+        return date(start.year + 1, 1, 1)
+    return date(start.year, start.month + 1, 1)
+
+
+def partition_name(start, granularity):
+    if granularity == 'year':
+        return f"{TABLE}_y{start.year}"
+    return f"{TABLE}_y{start.year}m{start.month:02d}"
+
+
+def partition_bounds(first_day, last_day, granularity):
+    """Liste des (nom, début, fin exclue) couvrant [first_day, last_day]"""
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularité inconnue : {granularity}")
+    bounds = []
+    start = period_start(first_day, granularity)
+    while start <= last_day:
+        end = next_period(start, granularity)
+        bounds.append((partition_name(start, granularity), start, end))
+        start = end
+    return bounds
+
+
+def year_range(year):
+    """Bornes UTC [début, fin) d'une année, utilisables pour l'élagage"""
+    return (
+        datetime(year, 1, 1, tzinfo=dt_timezone.utc),
+        datetime(year + 1, 1, 1, tzinfo=dt_timezone.utc),
+    )
+
+
+def is_partitioned(connection):
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def existing_partitions(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s ORDER BY child.relname",
+            [TABLE],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def existing_granularity(connection):
+    """
+    Granularité des partitions existantes, déduite de leurs bornes
+    (``None`` s'il n'y a que la partition par défaut)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_get_expr(child.relpartbound, child.oid) FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s",
+            [TABLE],
+        )
+        found = set()
+        for (bound,) in cursor.fetchall():
+            match = _BOUND_RE.search(bound or '')
+            if not match:
+                continue
+            start_year, start_month, end_year, end_month = map(int, match.groups())
+            months = (end_year - start_year) * 12 + end_month - start_month
+            found.add('year' if months == 12 else 'month' if months == 1 else None)
+    if None in found or len(found) > 1:
+        raise ValueError("Partitions existantes de granularités mixtes ou inconnues")
+    return found.pop() if found else None
+
+
+def ensure_partitions(connection, granularity, first_day, last_day):
+    """
+    Crée les partitions manquantes entre deux dates et retourne leurs noms.
+
+    Les lignes déjà rangées dans la partition par défaut pour la période
+    (créations en retard) y sont déplacées : PostgreSQL refuserait sinon la
+    nouvelle partition. La partition par défaut est détachée le temps du
+    déplacement, le tout dans une transaction.
+    """
+    quote = connection.ops.quote_name
+    existing = set(existing_partitions(connection))
+    default = DEFAULT_PARTITION if DEFAULT_PARTITION in existing else None
+    created = []
+    with connection.cursor() as cursor:
+        for name, start, end in partition_bounds(first_day, last_day, granularity):
+            if name in existing:
+                continue
+            bounds = [start.isoformat(), end.isoformat()]
+            misplaced = False
+            if default:
+                cursor.execute(
+                    f"SELECT EXISTS (SELECT 1 FROM {quote(default)} "
+                    f"WHERE created_at >= %s AND created_at < %s)",
+                    bounds,
+                )
+                misplaced = cursor.fetchone()[0]
+            with transaction.atomic(using=connection.alias):
+                if misplaced:
+                    cursor.execute(f"ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(default)}")
+                cursor.execute(
+                    f"CREATE TABLE {quote(name)} PARTITION OF {quote(TABLE)} "
+                    f"FOR VALUES FROM (%s) TO (%s)",
+                    bounds,
+                )
+                if misplaced:
+                    cursor.execute(
+                        f"WITH moved AS (DELETE FROM {quote(default)} "
+                        f"WHERE created_at >= %s AND created_at < %s RETURNING *) "
+                        f"INSERT INTO {quote(name)} SELECT * FROM moved",
+                        bounds,
+                    )
+                    cursor.execute(
+                        f"ALTER TABLE {quote(TABLE)} ATTACH PARTITION {quote(default)} DEFAULT"
+                    )
+            created.append(name)
+    return created
+
+
+def convert_to_partitioned(connection, granularity, ahead_until, keep_legacy=False):
+    """
+    Convertit la table existante en table partitionnée, en une transaction :
+    renommage de l'ancienne table, création du parent partitionné et des
+    partitions couvrant les données existantes, recopie des lignes, recalage
+    de la séquence des identifiants puis recréation des index existants.
+    """
+    quote = connection.ops.quote_name
+    legacy = f"{TABLE}_legacy"
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} RENAME TO {quote(legacy)}")
+        cursor.execute(
+            f"CREATE TABLE {quote(TABLE)} (LIKE {quote(legacy)} "
+            f"INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} ADD PRIMARY KEY (id, created_at)")
+
+        cursor.execute(f"SELECT min(created_at), max(created_at) FROM {quote(legacy)}")
+        oldest, newest = cursor.fetchone()
+        first_day = oldest.date() if oldest else ahead_until
+        last_day = max(newest.date() if newest else first_day, ahead_until)
+        ensure_partitions(connection, granularity, first_day, last_day)
+        cursor.execute(
+            f"CREATE TABLE {quote(DEFAULT_PARTITION)} PARTITION OF {quote(TABLE)} DEFAULT"
+        )
+
+        # Recopie avant la création des index secondaires (chargement plus rapide)
+        cursor.execute(f"INSERT INTO {quote(TABLE)} SELECT * FROM {quote(legacy)}")
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+            f"COALESCE((SELECT max(id) FROM {quote(TABLE)}), 0) + 1, false)",
+            [TABLE],
+        )
+
+        # Index non uniques existants (ceux des migrations Django), recréés
+        # sur le parent sous le même nom
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = %s AND indexdef NOT LIKE 'CREATE UNIQUE%%'",
+            [legacy],
+        )
+        indexes = cursor.fetchall()
+        if keep_legacy:
+            for name, _ in indexes:
+                cursor.execute(
+                    f"ALTER INDEX {quote(name)} RENAME TO {quote(name[:56] + '_legacy')}"
+                )
+        else:
+            cursor.execute(f"DROP TABLE {quote(legacy)}")
+        for _, definition in indexes:
+            cursor.execute(re.sub(
+                rf' ON (?:\S+\.)?"?{legacy}"? ', f' ON {quote(TABLE)} ', definition, count=1
+            ))
@@ -0,0 +1,139 @@
+"""
+Profilage par échantillonnage de pile.
+
+Un thread de fond relève périodiquement la pile du thread qui traite la
+requête (``sys._current_frames``). Le thread profilé n'est pas instrumenté,
+ce qui garde un surcoût faible. Les piles sont agrégées au format « collapsed »
+(``frame1;frame2;frame3 N``) compris par flamegraph.pl et speedscope.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+# Catégories affichées dans les rapports, de la plus spécifique à la plus générale
+CATEGORIES = [
+    ('build_absolute_uri', lambda label: label.startswith('build_absolute_uri ')),
+    ('sql', lambda label: '/django/db/' in label),
+    ('serialization', lambda label: '/rest_framework/serializers' in label
+        or '/rest_framework/fields' in label),
+    ('rendering', lambda label: '/rest_framework/renderers' in label
+        or '/django/template/' in label),
+]
+
+
+def frame_label(frame):
+    """Libellé stable d'une frame : fonction et fichier (sans numéro de ligne)"""
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename.replace(os.sep, '/')})"
+
+
+def categorize(stack):
+    """Retourne la catégorie dominante d'une pile collapsed"""
+    frames = stack.split(';')
+    for name, matches in CATEGORIES:
+        if any(matches(label) for label in frames):
+            return name
+    return 'other'
+
+
+class StackSampler:
+    """Échantillonne la pile d'un thread jusqu'à l'appel de stop()"""
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.samples[';'.join(reversed(labels))] += 1
+
+    def to_collapsed(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.items())
+
+    def to_speedscope(self, name):
+        frames, index, samples, weights = [], {}, [], []
+        for stack, count in self.samples.items():
+            sample = []
+            for label in stack.split(';'):
+                if label not in index:
+                    index[label] = len(frames)
+                    function, _, filename = label.partition(' (')
+                    frames.append({'name': function, 'file': filename.rstrip(')')})
+                sample.append(index[label])
+            samples.append(sample)
+            weights.append(count)
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                # Poids exprimés en nombre d'échantillons
+                'unit': 'none',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights,
+            }],
+        }
+
+    def dump(self, directory, name, fmt='collapsed'):
+        """Écrit le profil dans ``directory/<name>/`` et retourne son chemin"""
+        target = Path(directory) / name
+        target.mkdir(parents=True, exist_ok=True)
+        # Suffixe aléatoire : plusieurs profils par seconde sur un même thread
+        stem = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{self.thread_id}-{uuid.uuid4().hex[:8]}"
+        if fmt == 'speedscope':
+            path = target / f"{stem}.speedscope.json"
+            path.write_text(json.dumps(self.to_speedscope(name)), encoding='utf-8')
+        else:
+            path = target / f"{stem}.collapsed"
+            path.write_text(self.to_collapsed(), encoding='utf-8')
+        return path
+
+
+def load_profile(path):
+    """Relit un fichier de profil (collapsed ou speedscope) en Counter de piles"""
+    path = Path(path)
+    samples = Counter()
+    if path.name.endswith('.speedscope.json'):
+        data = json.loads(path.read_text(encoding='utf-8'))
+        frames = [
+            f"{frame['name']} ({frame.get('file', '')})"
+            for frame in data['shared']['frames']
+        ]
+        for profile in data['profiles']:
+            for sample, weight in zip(profile['samples'], profile['weights']):
+                samples[';'.join(frames[i] for i in sample)] += int(weight)
+    elif path.suffix == '.collapsed':
+        for line in path.read_text(encoding='utf-8').splitlines():
+            stack, _, count = line.rpartition(' ')
+            if stack:
+                samples[stack] += int(count)
+    return samples
@@ -0,0 +1,202 @@
+"""
+Modèle de lecture en mémoire du catalogue public.
+
+Chaque worker garde un instantané immuable des lignes sérialisées (services
+actifs, projets, témoignages approuvés) avec des index par identifiant,
+technologie et note. Les vues de liste filtrent et paginent directement à
+partir de cet instantané au lieu d'interroger PostgreSQL.
+
+La fraîcheur repose sur les compteurs de ``ContentVersion`` : ils sont
+relus au plus une fois toutes les ``CONTENT_READ_MODEL_CHECK_INTERVAL``
+secondes, et l'instantané est reconstruit dès qu'ils changent. Si la base
+est momentanément indisponible, le dernier instantané reste servi tant que
+sa dernière confirmation date de moins de
+``CONTENT_READ_MODEL_MAX_STALENESS`` secondes ; au-delà l'erreur remonte.
+Après un échec, la base n'est retentée qu'à l'intervalle suivant : les
+autres requêtes reçoivent l'instantané sans attendre le délai de connexion.
+"""
+import threading
+import time
+from heapq import merge
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.dispatch import receiver
+
+from .models import Service, Project, Testimonial
+from .serializers import ServiceSerializer, ProjectSerializer, TestimonialSerializer
+from .invalidation import content_changed, get_versions
+
+
+class StaleSnapshotError(Exception):
+    """L'instantané n'a pas pu être confirmé dans le délai autorisé"""
+
+
+class CatalogueSnapshot:
+    """Instantané immuable du catalogue public et de ses index"""
+
+    __slots__ = (
+        'versions', 'services', 'projects', 'testimonials',
+        'projects_by_id', 'testimonials_by_id',
+        'projects_by_technology', 'testimonials_by_rating',
+    )
+
+    def __init__(self, versions, services, projects, testimonials):
+        self.versions = versions
+        self.services = tuple(services)
+        self.projects = tuple(projects)
+        self.testimonials = tuple(testimonials)
+        self.projects_by_id = {row['id']: row for row in self.projects}
+        self.testimonials_by_id = {row['id']: row for row in self.testimonials}
+
+        # Index technologie (en minuscules) -> positions dans self.projects
+        by_technology = {}
+        for position, row in enumerate(self.projects):
+            for tech in row['technologies_list']:
+                by_technology.setdefault(tech.lower(), []).append(position)
+        self.projects_by_technology = {
+            tech: tuple(sorted(set(positions)))
+            for tech, positions in by_technology.items()
+        }
+
+        # Index note -> positions dans self.testimonials
+        by_rating = {}
+        for position, row in enumerate(self.testimonials):
+            by_rating.setdefault(row['rating'], []).append(position)
+        self.testimonials_by_rating = {
+            rating: tuple(positions) for rating, positions in by_rating.items()
+        }
+
+    @classmethod
+    def build(cls, versions):
+        """Construit un instantané à partir de la base (trois requêtes)"""
+        return cls(
+            versions,
+            ServiceSerializer(Service.objects.filter(is_active=True), many=True).data,
+            ProjectSerializer(Project.objects.all(), many=True).data,
+            TestimonialSerializer(
+                Testimonial.objects.filter(is_approved=True), many=True
+            ).data,
+        )
+
+    def filter_projects(self, technology=None):
+        """Équivalent de ``technologies__icontains`` à partir de l'index"""
+        if not technology:
+            return self.projects
+        needle = technology.lower()
+        if ',' in needle or needle != needle.strip():
+            # La recherche porte sur le texte complet (virgule, espace en bord) : parcours direct
+            return tuple(
+                row for row in self.projects if needle in row['technologies'].lower()
+            )
+        matches = set()
+        for tech, positions in self.projects_by_technology.items():
+            if needle in tech:
+                matches.update(positions)
+        return tuple(self.projects[position] for position in sorted(matches))
+
+    def filter_testimonials(self, min_rating=None, year=None):
+        """Témoignages de note >= min_rating (et de l'année donnée), dans l'ordre d'origine"""
+        if min_rating:
+            bands = [
+                positions for rating, positions in self.testimonials_by_rating.items()
+                if rating >= min_rating
+            ]
+            rows = tuple(self.testimonials[position] for position in merge(*bands))
+        else:
+            rows = self.testimonials
+        if year:
+            prefix = f"{year:04d}"
+            rows = tuple(row for row in rows if str(row['created_at']).startswith(prefix))
+        return rows
+
+
+class ReadModel:
+    """Détenteur de l'instantané courant pour le processus"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._checked_at = 0.0
+        # Prochaine tentative après un échec de la base (0 : pas d'échec en cours)
+        self._retry_at = 0.0
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'CONTENT_READ_MODEL_ENABLED', False)
+
+    def reset(self):
+        """Oublie l'instantané courant (écriture locale, tests)"""
+        with self._lock:
+            self._snapshot = None
+            self._checked_at = 0.0
+            self._retry_at = 0.0
+
+    def get_snapshot(self):
+        """
+        Retourne un instantané suffisamment frais, ou None si le modèle de
+        lecture est désactivé.
+        """
+        if not self.enabled:
+            return None
+        check_interval = getattr(settings, 'CONTENT_READ_MODEL_CHECK_INTERVAL', 2)
+        max_staleness = getattr(settings, 'CONTENT_READ_MODEL_MAX_STALENESS', 30)
+
+        snapshot, checked_at, retry_at = self._snapshot, self._checked_at, self._retry_at
+        now = time.monotonic()
+        if snapshot is not None and self._is_fresh(now, checked_at, retry_at, check_interval, max_staleness):
+            return snapshot
+
+        with self._lock:
+            snapshot, checked_at, retry_at = self._snapshot, self._checked_at, self._retry_at
+            now = time.monotonic()
+            if snapshot is not None and self._is_fresh(now, checked_at, retry_at, check_interval, max_staleness):
+                return snapshot
+            try:
+                versions = get_versions()
+                if snapshot is None or snapshot.versions != versions:
+                    snapshot = CatalogueSnapshot.build(versions)
+            except DatabaseError as exc:
+                if snapshot is not None and now - checked_at < max_staleness:
+                    # Base indisponible : on continue à servir le dernier état,
+                    # sans la retenter avant l'intervalle suivant
+                    self._retry_at = now + check_interval
+                    return snapshot
+                raise StaleSnapshotError(
+                    "Impossible de confirmer la fraîcheur du catalogue"
+                ) from exc
+            self._snapshot, self._checked_at, self._retry_at = snapshot, now, 0.0
+            return snapshot
+
+    @staticmethod
+    def _is_fresh(now, checked_at, retry_at, check_interval, max_staleness):
+        """Vrai si l'instantané peut être servi sans interroger la base"""
+        if now - checked_at < check_interval:
+            return True
+        # Échec récent de la base : attente de la prochaine tentative, dans la borne
+        return now < retry_at and now - checked_at < max_staleness
+
+
+read_model = ReadModel()
+
+
+@receiver(content_changed)
+def drop_snapshot(sender, **kwargs):
+    """Une écriture dans ce processus rend l'instantané local obsolète"""
+    read_model.reset()
+
+
+def with_absolute_image_urls(rows, request):
+    """Recalcule ``image_url`` et ``image_variants`` en URL absolues pour les lignes d'une page"""
+    if request is None:
+        return list(rows)
+    page = []
+    for row in rows:
+        if row.get('image_url'):
+            row = dict(row, image_url=request.build_absolute_uri(row['image_url']))
+        if row.get('image_variants'):
+            row = dict(row, image_variants={
+                width: request.build_absolute_uri(url) for width, url in row['image_variants'].items()
+            })
+        page.append(row)
+    return page
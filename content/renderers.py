@@ -0,0 +1,72 @@
+"""
+Rendu et lecture MessagePack de l'API (paquet optionnel ``msgpack``).
+
+Sélection par ``Accept: application/msgpack`` ou ``?format=msgpack`` ; les
+corps ``Content-Type: application/msgpack`` sont acceptés en écriture.
+
+Les dates et heures sont encodées nativement : ``DATETIME_FORMAT`` vaut
+None (fiitech.settings), les sérialiseurs laissent donc des ``datetime``
+que le JSON écrit en ISO 8601 comme avant et que MessagePack encode en
+horodatage (extension -1). MessagePack n'a pas de type date : les dates
+seules restent des chaînes ``AAAA-MM-JJ``, qu'un horodatage à minuit
+décalerait selon le fuseau du client.
+"""
+import datetime
+import decimal
+import uuid
+
+from django.utils import timezone
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+
+try:
+    import msgpack
+except ImportError:  # Dépendance optionnelle : classes absentes des réglages DRF
+    msgpack = None
+
+MEDIA_TYPE = 'application/msgpack'
+
+
+def encode_default(obj):
+    """Types non gérés par MessagePack (équivalent de l'encodeur JSON de DRF)"""
+    if isinstance(obj, datetime.datetime):
+        if timezone.is_naive(obj):
+            obj = timezone.make_aware(obj)
+        return msgpack.Timestamp.from_datetime(obj)
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, datetime.timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (uuid.UUID, Promise)):
+        return force_str(obj)
+    if hasattr(obj, '__iter__'):
+        return list(obj)
+    raise TypeError(f"Type non sérialisable en MessagePack : {type(obj).__name__}")
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = MEDIA_TYPE
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            # timestamp=3 : horodatages relus en datetime UTC
+            return msgpack.unpackb(stream.read(), raw=False, timestamp=3)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f"Corps MessagePack invalide : {exc}")
@@ -11,22 +11,31 @@ class ServiceSerializer(serializers.ModelSerializer):
 class ProjectSerializer(serializers.ModelSerializer):
     technologies_list = serializers.ReadOnlyField()
     image_url = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
     
     class Meta:
         model = Project
         fields = [
-            'id', 'name', 'description', 'image_url', 'technologies', 
+            'id', 'name', 'description', 'image_url', 'image_variants', 'technologies', 
             'technologies_list', 'demo_url', 'github_url', 'completion_date'
         ]
     
+    def _url(self, url):
+        request = self.context.get('request')
+        if request:
+            return request.build_absolute_uri(url)
+        return url
+
     def get_image_url(self, obj):
         if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
+            return self._url(obj.image.url)
         return None
 
+    def get_image_variants(self, obj):
+        """Largeur -> URL des dérivés WebP (pour srcset)"""
+        storage = obj.image.storage
+        return {width: self._url(storage.url(name)) for width, name in obj.image_variants.items()}
+
 
 class TestimonialSerializer(serializers.ModelSerializer):
     rating_stars = serializers.ReadOnlyField()
@@ -39,6 +48,14 @@ class TestimonialSerializer(serializers.ModelSerializer):
         ]
 
 
+class TestimonialSubmissionSerializer(serializers.ModelSerializer):
+    """Soumission publique d'un témoignage (toujours en attente de modération)"""
+
+    class Meta:
+        model = Testimonial
+        fields = ['author', 'position', 'company', 'content', 'rating']
+
+
 # Sérialiseurs pour les statistiques du dashboard
 class ServiceStatsSerializer(serializers.Serializer):
     total_services = serializers.IntegerField()
@@ -67,4 +84,16 @@ class DashboardStatsSerializer(serializers.Serializer):
     services = ServiceStatsSerializer()
     projects = ProjectStatsSerializer()
     testimonials = TestimonialStatsSerializer()
-    rating_distribution = RatingDistributionSerializer(many=True)
\ No newline at end of file
+    rating_distribution = RatingDistributionSerializer(many=True)
+
+
+class CompanyRatingStatsSerializer(serializers.Serializer):
+    company = serializers.CharField()
+    count = serializers.IntegerField()
+    mean = serializers.FloatField()
+    median = serializers.FloatField()
+    p10 = serializers.FloatField()
+    p90 = serializers.FloatField()
+    # Nombre de témoignages par note, de 1 à 5 étoiles
+    histogram = serializers.ListField(child=serializers.IntegerField())
+
@@ -0,0 +1,61 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Service, Project, Testimonial
+from .invalidation import mark_changed
+from .jobs import enqueue
+from .minhash import assign_signature, index_testimonials
+from .surrogate_keys import list_fields_changed, purging_enabled
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Testimonial)
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Testimonial)
+def content_saved_or_deleted(sender, instance, **kwargs):
+    """Incrémente la version du contenu à chaque sauvegarde ou suppression"""
+    mark_changed(sender, pks=[instance.pk], lists=getattr(instance, '_lists_changed', True))
+    instance._lists_changed = True
+
+
+@receiver(pre_save, sender=Service)
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=Testimonial)
+def detect_list_changes(sender, instance, update_fields=None, **kwargs):
+    """
+    Repère si la sauvegarde change l'appartenance aux listes : sinon, seules
+    les pages de l'objet sont purgées du cache partagé
+    """
+    # Une requête de plus par sauvegarde : uniquement si un purgeur est configuré
+    instance._lists_changed = not purging_enabled() or list_fields_changed(instance, update_fields)
+
+
+@receiver(pre_save, sender=Testimonial)
+def compute_minhash_signature(sender, instance, **kwargs):
+    """Recalcule la signature MinHash, enregistrée avec le reste de la ligne"""
+    instance._minhash_changed = assign_signature(instance)
+
+
+@receiver(post_save, sender=Testimonial)
+def update_lsh_buckets(sender, instance, created, **kwargs):
+    """Met à jour les seaux LSH et le doublon suspecté si le contenu a changé"""
+    if created or getattr(instance, '_minhash_changed', False):
+        index_testimonials([instance])
+
+
+@receiver(pre_save, sender=Project)
+def detect_new_project_image(sender, instance, **kwargs):
+    """Repère un fichier image fraîchement attribué (pas encore enregistré)"""
+    instance._image_changed = bool(instance.image) and not getattr(instance.image, '_committed', True)
+
+
+@receiver(post_save, sender=Project)
+def queue_project_image_processing(sender, instance, **kwargs):
+    """Met en file le calcul des dérivés de la nouvelle image"""
+    if getattr(instance, '_image_changed', False):
+        enqueue(
+            'process_project_image', {'project_id': instance.pk},
+            dedup_key=f'project-image:{instance.pk}',
+        )
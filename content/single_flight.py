@@ -0,0 +1,145 @@
+"""
+Regroupement des calculs identiques simultanés (single-flight).
+
+Quand une entrée de cache manque (expiration, nouvelle version du contenu
+après une modification), toutes les requêtes identiques qui arrivent en même
+temps relanceraient les mêmes requêtes SQL. ``single_flight(key, compute)``
+n'en laisse passer qu'une par clé :
+
+- dans un worker, un seul thread calcule ; les autres attendent son résultat
+  au lieu de recalculer, ou lèvent une copie de son exception chaînée à
+  l'originale (une même instance levée dans plusieurs threads verrait sa
+  trace modifiée par chacun) ;
+- entre workers, le calcul est réservé par ``cache.add`` sur une clé de
+  verrou qui expire après ``CONTENT_SINGLE_FLIGHT_LOCK_TIMEOUT`` : un worker
+  arrêté pendant le calcul ne bloque pas les suivants ;
+- qui ne calcule pas reçoit la dernière valeur connue pour la clé si elle a
+  moins de ``CONTENT_SINGLE_FLIGHT_STALE_TTL`` secondes, sinon attend le
+  résultat au plus ``CONTENT_SINGLE_FLIGHT_WAIT`` secondes, puis calcule
+  lui-même.
+
+La clé doit inclure la version du contenu lu (content.invalidation) : une
+modification change la clé, sans invalidation explicite. La dernière valeur
+connue est rangée sous la même clé sans version (``stale_key``).
+
+Une réponse construite à partir d'une valeur périmée ne doit pas être mise
+en cache par un proxy : voir ``add_never_cache_headers`` dans les vues.
+"""
+import copy
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_PREFIX = 'content:flight'
+CACHE_TIMEOUT = 3600
+POLL_INTERVAL = 0.05
+
+
+class Flight:
+    """Calcul en cours dans ce worker, partagé par les threads qui l'attendent"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.stale = False
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def single_flight_enabled():
+    return getattr(settings, 'CONTENT_SINGLE_FLIGHT_ENABLED', True)
+
+
+def single_flight(key, compute, stale_key=None, timeout=CACHE_TIMEOUT):
+    """
+    Retourne ``(valeur, périmée)`` : la valeur en cache sous ``key`` ou celle
+    de ``compute()``, calculée une seule fois par clé. ``périmée`` est vrai
+    si la valeur vient de ``stale_key`` faute d'attendre le calcul en cours.
+    """
+    if not single_flight_enabled():
+        return compute(), False
+    cache_key = f"{CACHE_PREFIX}:{key}"
+    value = cache.get(cache_key)
+    if value is not None:
+        return value, False
+
+    with _flights_lock:
+        flight = _flights.get(cache_key)
+        leader = flight is None
+        if leader:
+            flight = _flights[cache_key] = Flight()
+
+    if not leader:
+        stale = _stale_value(stale_key)
+        if stale is not None:
+            return stale, True
+        if flight.done.wait(getattr(settings, 'CONTENT_SINGLE_FLIGHT_WAIT', 5)):
+            if flight.error is not None:
+                _raise_copy(flight.error)
+            return flight.value, flight.stale
+        # Calcul anormalement long : on n'attend pas davantage
+        return compute(), False
+
+    try:
+        flight.value, flight.stale = _compute_across_workers(cache_key, compute, stale_key, timeout)
+    except Exception as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[cache_key]
+        flight.done.set()
+    return flight.value, flight.stale
+
+
+def _raise_copy(error):
+    """Lève dans ce thread une nouvelle instance de ``error``, chaînée à celle-ci"""
+    try:
+        fresh = copy.copy(error)
+    except Exception:
+        fresh = RuntimeError(f"Échec du calcul partagé : {error!r}")
+    raise fresh from error
+
+
+def _compute_across_workers(cache_key, compute, stale_key, timeout):
+    lock_key = f"{cache_key}:lock"
+    token = uuid.uuid4().hex
+    lock_timeout = getattr(settings, 'CONTENT_SINGLE_FLIGHT_LOCK_TIMEOUT', 30)
+    if not cache.add(lock_key, token, timeout=lock_timeout):
+        # Un autre worker calcule : dernière valeur connue, ou attente de son résultat
+        stale = _stale_value(stale_key)
+        if stale is not None:
+            return stale, True
+        deadline = time.monotonic() + getattr(settings, 'CONTENT_SINGLE_FLIGHT_WAIT', 5)
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            value = cache.get(cache_key)
+            if value is not None:
+                return value, False
+        return compute(), False
+
+    try:
+        value = compute()
+        cache.set(cache_key, value, timeout=timeout)
+        if stale_key is not None:
+            cache.set(
+                f"{CACHE_PREFIX}:{stale_key}:stale", value,
+                timeout=getattr(settings, 'CONTENT_SINGLE_FLIGHT_STALE_TTL', 300),
+            )
+        return value, False
+    finally:
+        # Le verrou a pu expirer et être repris : ne libérer que le sien
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+def _stale_value(stale_key):
+    if stale_key is None:
+        return None
+    return cache.get(f"{CACHE_PREFIX}:{stale_key}:stale")
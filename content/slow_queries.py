@@ -0,0 +1,190 @@
+"""
+Journal des requêtes SQL lentes.
+
+Un ``execute_wrapper`` installé sur chaque connexion (signal
+``connection_created``) mesure les requêtes. Celles qui dépassent
+``CONTENT_SLOW_QUERY_THRESHOLD_MS`` sont écrites en JSONL dans
+``CONTENT_SLOW_QUERY_LOG`` avec leurs paramètres, la vue d'origine (posée par
+``QueryContextMiddleware``) et la frame de ``content/`` qui les a émises.
+
+Sur PostgreSQL, une fraction des SELECT lents (``..._EXPLAIN_SAMPLE_RATE``)
+est rejouée avec ``EXPLAIN (ANALYZE, BUFFERS)``. Comme ce rejeu exécute une
+seconde fois la requête, il est limité à ``..._EXPLAIN_PER_MINUTE`` par
+processus et désactivé pendant sa propre exécution.
+
+La commande ``slow_query_report`` regroupe le journal par empreinte.
+"""
+import contextvars
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(__file__) + os.sep
+MAX_PARAMS = 50
+MAX_PARAM_LENGTH = 200
+
+# Nom de la vue en cours dans ce thread ou cette tâche
+current_view = contextvars.ContextVar('content_current_view', default=None)
+# Vrai pendant un EXPLAIN émis par le journal lui-même
+_explaining = contextvars.ContextVar('content_slow_query_explaining', default=False)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_IN_LISTS = re.compile(r'\bIN \((?:\s*(?:\?|%s)\s*,)*\s*(?:\?|%s)\s*\)')
+
+
+def fingerprint(sql):
+    """Normalise une requête : valeurs littérales et listes IN remplacées"""
+    return _IN_LISTS.sub('IN (...)', _LITERALS.sub('?', sql))
+
+
+def caller_frame():
+    """Première frame de l'application (hors de ce module) dans la pile d'appel"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_DIR) and filename != __file__:
+            relative = os.path.relpath(filename, os.path.dirname(APP_DIR.rstrip(os.sep)))
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _json_params(params):
+    if params is None:
+        return None
+    values = list(params.values() if isinstance(params, dict) else params)[:MAX_PARAMS]
+    return [
+        value if isinstance(value, (int, float, bool)) or value is None
+        else str(value)[:MAX_PARAM_LENGTH]
+        for value in values
+    ]
+
+
+class ExplainRateLimiter:
+    """Seau à jetons : au plus ``per_minute`` EXPLAIN par minute et par processus"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = None
+        self._updated = time.monotonic()
+
+    def acquire(self, per_minute):
+        with self._lock:
+            now = time.monotonic()
+            if self._tokens is None:
+                self._tokens = float(per_minute)
+            self._tokens = min(per_minute, self._tokens + (now - self._updated) * per_minute / 60)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class SlowQueryLogger:
+    """execute_wrapper qui journalise les requêtes au-delà du seuil"""
+
+    def __init__(self):
+        self._write_lock = threading.Lock()
+        self.limiter = ExplainRateLimiter()
+
+    def __call__(self, execute, sql, params, many, context):
+        if _explaining.get():
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - started) * 1000
+            if duration >= getattr(settings, 'CONTENT_SLOW_QUERY_THRESHOLD_MS', 200):
+                try:
+                    self.record(sql, params, many, context, duration)
+                except Exception:
+                    # Le journal ne doit jamais faire échouer la requête
+                    logger.exception("Impossible de journaliser une requête lente")
+
+    def record(self, sql, params, many, context, duration):
+        connection = context['connection']
+        entry = {
+            'timestamp': time.time(),
+            'duration_ms': round(duration, 2),
+            'database': connection.alias,
+            'view': current_view.get(),
+            'frame': caller_frame(),
+            'fingerprint': fingerprint(sql),
+            'sql': sql,
+            'params': None if many else _json_params(params),
+            'many': many,
+        }
+        if not many and self.should_explain(connection, sql):
+            entry['explain'] = self.explain(connection, sql, params)
+        self.write(entry)
+
+    def should_explain(self, connection, sql):
+        if connection.vendor != 'postgresql':
+            return False
+        statement = sql.lstrip().upper()
+        if not statement.startswith('SELECT') or ' FOR UPDATE' in statement:
+            return False
+        rate = getattr(settings, 'CONTENT_SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.1)
+        if rate <= 0 or random.random() >= rate:
+            return False
+        return self.limiter.acquire(getattr(settings, 'CONTENT_SLOW_QUERY_EXPLAIN_PER_MINUTE', 6))
+
+    def explain(self, connection, sql, params):
+        token = _explaining.set(True)
+        try:
+            # Point de sauvegarde : un échec ne doit pas interrompre la transaction en cours
+            with transaction.atomic(using=connection.alias):
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+                    return '\n'.join(row[0] for row in cursor.fetchall())
+        except DatabaseError as exc:
+            return f"EXPLAIN impossible : {exc}"
+        finally:
+            _explaining.reset(token)
+
+    def write(self, entry):
+        path = Path(getattr(settings, 'CONTENT_SLOW_QUERY_LOG', settings.BASE_DIR / 'logs' / 'slow_queries.jsonl'))
+        line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+        with self._write_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as log_file:
+                log_file.write(line)
+
+
+slow_query_logger = SlowQueryLogger()
+
+
+@receiver(connection_created)
+def install_slow_query_logger(sender, connection, **kwargs):
+    """Branche le journal sur chaque nouvelle connexion"""
+    if not getattr(settings, 'CONTENT_SLOW_QUERY_LOG_ENABLED', False):
+        return
+    if slow_query_logger not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_logger)
+
+
+def load_entries(path):
+    """Relit le journal (les lignes tronquées sont ignorées)"""
+    entries = []
+    with open(path, encoding='utf-8') as log_file:
+        for line in log_file:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
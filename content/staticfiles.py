@@ -0,0 +1,329 @@
+"""
+Fichiers statiques compressés et servis par l'application.
+
+``CompressedManifestStaticFilesStorage`` complète le post-traitement de
+``collectstatic`` : après le renommage par empreinte du contenu, chaque
+fichier texte reçoit des variantes ``.gz`` et, si le module ``brotli`` est
+installé, ``.br``. Une variante n'est conservée que si elle est nettement
+plus petite.
+
+``StaticFilesIndex`` parcourt ``STATIC_ROOT`` une seule fois au premier
+appel et garde en mémoire les en-têtes de chaque fichier (et le contenu des
+petits fichiers). ``StaticFilesWSGIHandler`` et ``StaticFilesASGIHandler``
+enveloppent l'application Django et servent ``STATIC_URL`` à partir de cet
+index : négociation ``Accept-Encoding`` (q-values comprises), ``ETag`` par
+variante, ``304`` et cache d'un an pour les noms à empreinte. Un nouveau
+``collectstatic`` impose donc de redémarrer les workers.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+from email.utils import formatdate
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # Dépendance optionnelle : seules les variantes gzip sont produites
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.html', '.txt', '.xml', '.ico', '.ttf', '.otf',
+}
+MIN_COMPRESS_SIZE = 256
+# Une variante doit économiser au moins 5 % pour être gardée
+MIN_RATIO = 0.95
+# Encodages proposés, par ordre de préférence
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Empreinte ajoutée par ManifestStaticFilesStorage (12 caractères hexadécimaux)
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+CHUNK_SIZE = 64 * 1024
+
+
+def compress(data, encoding):
+    if encoding == 'gzip':
+        # mtime=0 : même entrée, même sortie (ETag stable entre deux déploiements)
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Noms à empreinte (manifest) et variantes .gz / .br pré-compressées"""
+
+    def post_process(self, paths, dry_run=False, **options):
+        final_names = {}
+        for name, hashed_name, was_processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(was_processed, Exception):
+                # Plusieurs passes possibles : seul le dernier nom est référencé
+                final_names[name] = hashed_name
+            yield name, hashed_name, was_processed
+        if dry_run:
+            return
+        # Les copies sans empreinte restent servies (références non réécrites)
+        for name in set(final_names.values()) | set(paths):
+            for compressed_name in self.compress_file(name):
+                yield name, compressed_name, True
+
+    def compress_file(self, name):
+        """Écrit les variantes utiles de ``name`` ; retourne leurs noms"""
+        if Path(name).suffix.lower() not in COMPRESSIBLE_EXTENSIONS or not self.exists(name):
+            return []
+        with self.open(name) as source:
+            data = source.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return []
+        written = []
+        for encoding, suffix in ENCODINGS:
+            if encoding == 'br' and brotli is None:
+                continue
+            compressed = compress(data, encoding)
+            target = name + suffix
+            if self.exists(target):
+                self.delete(target)
+            if len(compressed) < len(data) * MIN_RATIO:
+                with open(self.path(target), 'wb') as output:
+                    output.write(compressed)
+                written.append(target)
+        return written
+
+
+def parse_accept_encoding(header):
+    """{encodage: q} à partir de l'en-tête Accept-Encoding"""
+    accepted = {}
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        match = re.search(r'q\s*=\s*([0-9.]+)', params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+    return accepted
+
+
+def choose_encoding(header, available):
+    """Meilleur encodage disponible accepté par le client, ou None (identity)"""
+    accepted = parse_accept_encoding(header or '')
+    wildcard = accepted.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for encoding, _ in ENCODINGS:
+        if encoding not in available:
+            continue
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class StaticFile:
+    """Variante servie : chemin, en-têtes précalculés et contenu éventuel"""
+
+    __slots__ = ('path', 'size', 'headers', 'etag', 'content')
+
+    def __init__(self, path, size, headers, etag, content):
+        self.path, self.size, self.headers, self.etag, self.content = path, size, headers, etag, content
+
+    def iter_chunks(self):
+        if self.content is not None:
+            yield self.content
+            return
+        with open(self.path, 'rb') as source:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+
+class StaticFilesIndex:
+    """Index en mémoire de STATIC_ROOT : URL -> {encodage: StaticFile}"""
+
+    def __init__(self, root=None, prefix=None, memory_limit=None, max_age=None):
+        self.root = Path(root or settings.STATIC_ROOT)
+        self.prefix = '/' + (prefix or settings.STATIC_URL).strip('/') + '/'
+        self.memory_limit = memory_limit if memory_limit is not None else getattr(
+            settings, 'CONTENT_STATIC_MEMORY_LIMIT', 512 * 1024
+        )
+        self.max_age = max_age if max_age is not None else getattr(settings, 'CONTENT_STATIC_MAX_AGE', 60)
+        self._files = None
+        self._lock = threading.Lock()
+
+    def hashed_names(self):
+        """Noms à empreinte d'après le manifest, à défaut d'après leur forme"""
+        manifest = self.root / 'staticfiles.json'
+        try:
+            return set(json.loads(manifest.read_text())['paths'].values())
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def load(self):
+        files = {}
+        hashed = self.hashed_names()
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(('.gz', '.br')):
+                    continue
+                path = Path(directory) / filename
+                name = path.relative_to(self.root).as_posix()
+                immutable = name in hashed if hashed is not None else bool(HASHED_NAME.search(name))
+                variants = {None: self._entry(path, name, None, immutable)}
+                for encoding, suffix in ENCODINGS:
+                    compressed = path.with_name(filename + suffix)
+                    if compressed.exists():
+                        variants[encoding] = self._entry(compressed, name, encoding, immutable)
+                if len(variants) > 1:
+                    for variant in variants.values():
+                        variant.headers.append(('Vary', 'Accept-Encoding'))
+                files[self.prefix + name] = variants
+        return files
+
+    def _entry(self, path, name, encoding, immutable):
+        stat = path.stat()
+        digest = hashlib.md5(f"{name}:{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()[:16]
+        etag = f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+        content_type, _ = mimetypes.guess_type(name)
+        if content_type is None:
+            content_type = 'application/octet-stream'
+        elif content_type.startswith('text/') or content_type in ('application/javascript', 'image/svg+xml'):
+            content_type += '; charset=utf-8'
+        headers = [
+            ('Content-Type', content_type),
+            ('Content-Length', str(stat.st_size)),
+            ('ETag', etag),
+            ('Last-Modified', formatdate(stat.st_mtime, usegmt=True)),
+            ('Cache-Control', IMMUTABLE_CACHE_CONTROL if immutable else f'public, max-age={self.max_age}'),
+        ]
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        content = path.read_bytes() if stat.st_size <= self.memory_limit else None
+        return StaticFile(str(path), stat.st_size, headers, etag, content)
+
+    @property
+    def files(self):
+        if self._files is None:
+            with self._lock:
+                if self._files is None:
+                    self._files = self.load()
+        return self._files
+
+    def find(self, path, accept_encoding):
+        """Variante à servir pour ``path`` ou None si le fichier est inconnu"""
+        if not path.startswith(self.prefix):
+            return None
+        variants = self.files.get(path)
+        if variants is None:
+            return None
+        return variants[choose_encoding(accept_encoding, variants)]
+
+
+def _not_modified(static_file, if_none_match):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or static_file.etag in tags or f'W/{static_file.etag}' in tags
+
+
+def static_handler_enabled():
+    return getattr(settings, 'CONTENT_STATIC_HANDLER_ENABLED', False)
+
+
+class StaticFilesWSGIHandler:
+    """Sert STATIC_URL depuis l'index, délègue le reste à l'application Django"""
+
+    def __init__(self, application, index=None):
+        self.application = application
+        self.index = index or StaticFilesIndex()
+
+    def __call__(self, environ, start_response):
+        method = environ.get('REQUEST_METHOD')
+        static_file = None
+        if method in ('GET', 'HEAD'):
+            static_file = self.index.find(
+                environ.get('PATH_INFO', ''), environ.get('HTTP_ACCEPT_ENCODING', '')
+            )
+        if static_file is None:
+            return self.application(environ, start_response)
+
+        if _not_modified(static_file, environ.get('HTTP_IF_NONE_MATCH')):
+            headers = [(k, v) for k, v in static_file.headers if k not in ('Content-Length', 'Content-Type')]
+            start_response('304 Not Modified', headers)
+            return []
+        start_response('200 OK', list(static_file.headers))
+        if method == 'HEAD':
+            return []
+        if static_file.content is not None:
+            return [static_file.content]
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if file_wrapper is not None:
+            return file_wrapper(open(static_file.path, 'rb'), CHUNK_SIZE)
+        return static_file.iter_chunks()
+
+
+class StaticFilesASGIHandler:
+    """Équivalent ASGI de StaticFilesWSGIHandler"""
+
+    def __init__(self, application, index=None):
+        self.application = application
+        self.index = index or StaticFilesIndex()
+
+    async def __call__(self, scope, receive, send):
+        static_file = None
+        if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+            headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+            # Premier appel : parcours de STATIC_ROOT hors de la boucle d'événements
+            if self.index._files is None:
+                await asyncio.to_thread(lambda: self.index.files)
+            static_file = self.index.find(scope['path'], headers.get('accept-encoding', ''))
+        if static_file is None:
+            await self.application(scope, receive, send)
+            return
+
+        if _not_modified(static_file, headers.get('if-none-match')):
+            response_headers = [(k, v) for k, v in static_file.headers if k not in ('Content-Length', 'Content-Type')]
+            await self._start(send, 304, response_headers)
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        await self._start(send, 200, static_file.headers)
+        if scope['method'] == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b''})
+        elif static_file.content is not None:
+            await send({'type': 'http.response.body', 'body': static_file.content})
+        else:
+            chunks = static_file.iter_chunks()
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+
+    @staticmethod
+    async def _start(send, status, headers):
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+        })
+
+
+def wrap_wsgi(application):
+    """Enveloppe l'application WSGI si le service des statiques est activé"""
+    return StaticFilesWSGIHandler(application) if static_handler_enabled() else application
+
+
+def wrap_asgi(application):
+    """Enveloppe l'application ASGI si le service des statiques est activé"""
+    return StaticFilesASGIHandler(application) if static_handler_enabled() else application
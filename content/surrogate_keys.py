@@ -0,0 +1,245 @@
+"""
+Étiquetage des réponses et purge ciblée d'un proxy de cache ou d'un CDN.
+
+Les réponses GET publiques portent des clés de substitution (en-têtes
+``Surrogate-Key`` pour Fastly/Varnish, ``Cache-Tag`` pour Cloudflare) :
+
+- ``<modèle>`` : la réponse dépend de l'ensemble des lignes du modèle
+  (appartenance, ordre, agrégats) : listes, statistiques, facettes ;
+- ``<modèle>:<id>`` : la réponse contient cet objet.
+
+``content_changed`` déclenche, une fois la transaction validée, la purge
+des clés concernées par le purgeur configuré (``CONTENT_PURGER_BACKEND``).
+Une modification qui ne touche que des champs affichés purge seulement
+``<modèle>:<id>`` : les autres pages restent en cache. Création,
+suppression, mise à jour en masse ou modification d'un champ qui décide de
+l'appartenance à une liste (``LIST_FIELDS``) purgent ``<modèle>``, qui
+couvre déjà toutes les réponses portant ``<modèle>:<id>``.
+
+Une purge en échec est confiée à la file de tâches, qui réessaie.
+"""
+import functools
+import json
+import logging
+import threading
+import urllib.request
+
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .invalidation import SCOPES, content_changed
+from .models import Project, Service, Testimonial
+
+logger = logging.getLogger(__name__)
+
+# Champs dont la modification change l'appartenance aux listes, leur ordre
+# ou les agrégats (statistiques, facettes, autocomplétion)
+LIST_FIELDS = {
+    Service: ('is_active', 'display_order', 'title'),
+    Project: ('completion_date', 'name', 'technologies'),
+    Testimonial: ('is_approved', 'rating', 'company', 'created_at'),
+}
+
+
+def collection_key(model):
+    return SCOPES[model]
+
+
+def object_key(model, pk):
+    return f"{SCOPES[model]}:{pk}"
+
+
+def _prefixed(keys):
+    prefix = getattr(settings, 'CONTENT_SURROGATE_KEY_PREFIX', '')
+    return [f"{prefix}{key}" for key in keys]
+
+
+def tag_response(response, keys):
+    """Ajoute les clés à une réponse GET réussie"""
+    if not keys or not 200 <= response.status_code < 300:
+        return response
+    keys = _prefixed(dict.fromkeys(keys))
+    response['Surrogate-Key'] = ' '.join(keys)
+    response['Cache-Tag'] = ','.join(keys)
+    return response
+
+
+def surrogate_keys(*models):
+    """Décorateur des vues fonction : clés de collection des modèles lus"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                tag_response(response, [collection_key(model) for model in models])
+            return response
+        return wrapped
+    return decorator
+
+
+class SurrogateKeyMixin:
+    """
+    Vues DRF : clés de collection de ``surrogate_models`` et clé de chaque
+    objet renvoyé (champ ``id`` des lignes de la réponse).
+    """
+
+    surrogate_models = ()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method in ('GET', 'HEAD'):
+            tag_response(response, self.get_surrogate_keys(response))
+        return response
+
+    def get_surrogate_keys(self, response):
+        keys = [collection_key(model) for model in self.surrogate_models]
+        data = getattr(response, 'data', None)
+        rows = data.get('results') if isinstance(data, dict) else data
+        if self.surrogate_models and isinstance(rows, list):
+            model = self.surrogate_models[0]
+            keys += [object_key(model, row['id']) for row in rows if isinstance(row, dict) and 'id' in row]
+        return keys
+
+
+class NullPurger:
+    """Aucun proxy à purger (développement)"""
+
+    enabled = False
+
+    def purge(self, keys):
+        pass
+
+
+class HTTPPurger:
+    """
+    POST vers ``CONTENT_PURGER_URL`` : clés dans l'en-tête ``Surrogate-Key``
+    (API Fastly) et dans le corps ``{"tags": [...]}`` (API Cloudflare), par
+    lots de ``CONTENT_PURGER_BATCH_SIZE``.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.url = settings.CONTENT_PURGER_URL
+        self.token = getattr(settings, 'CONTENT_PURGER_TOKEN', '')
+        self.timeout = getattr(settings, 'CONTENT_PURGER_TIMEOUT', 5)
+        self.batch_size = getattr(settings, 'CONTENT_PURGER_BATCH_SIZE', 30)
+
+    def purge(self, keys):
+        keys = _prefixed(keys)
+        for start in range(0, len(keys), self.batch_size):
+            batch = keys[start:start + self.batch_size]
+            request = urllib.request.Request(
+                self.url, method='POST',
+                data=json.dumps({'tags': batch}).encode(),
+                headers={'Content-Type': 'application/json', 'Surrogate-Key': ' '.join(batch)},
+            )
+            if self.token:
+                request.add_header('Authorization', f"Bearer {self.token}")
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+
+
+_purger = None
+_purger_lock = threading.Lock()
+
+
+def get_purger():
+    global _purger
+    if _purger is None:
+        with _purger_lock:
+            if _purger is None:
+                backend = getattr(settings, 'CONTENT_PURGER_BACKEND', 'content.surrogate_keys.NullPurger')
+                _purger = import_string(backend)()
+    return _purger
+
+
+def reset_purger():
+    """Oublie le purgeur instancié (changement de réglages)"""
+    global _purger
+    _purger = None
+
+
+def purging_enabled():
+    return get_purger().enabled
+
+
+def purge_keys(keys):
+    """Purge immédiate ; en cas d'échec, nouvelle tentative par la file de tâches"""
+    keys = sorted(set(keys))
+    try:
+        get_purger().purge(keys)
+    except Exception:
+        logger.warning("Échec de la purge de %s clé(s), remise en file", len(keys), exc_info=True)
+        # Import local : content.jobs n'est pas nécessaire quand rien n'est purgé
+        from .jobs import enqueue
+        enqueue('purge_surrogate_keys', {'keys': keys})
+
+
+class PurgeBatch:
+    """Clés modifiées dans une transaction, purgées ensemble à sa validation"""
+
+    def __init__(self):
+        self.keys = set()
+        self.flushed = False
+
+    def flush(self):
+        self.flushed = True
+        if self.keys:
+            purge_keys(self.keys)
+
+
+class PendingPurge(threading.local):
+    """Lot de la transaction en cours (par thread, comme les connexions)"""
+
+    def __init__(self):
+        self.batch = None
+
+
+_pending = PendingPurge()
+
+
+@receiver(content_changed)
+def schedule_purge(sender, pks=None, lists=True, **kwargs):
+    """Regroupe les clés modifiées et les purge une fois la transaction validée"""
+    if sender not in SCOPES or not purging_enabled():
+        return
+    if lists or pks is None:
+        # Toute réponse étiquetée porte aussi la clé de collection de son
+        # modèle : les clés par objet n'ajouteraient que des appels de purge
+        keys = [collection_key(sender)]
+    else:
+        keys = [object_key(sender, pk) for pk in pks]
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        purge_keys(keys)
+        return
+    batch = _pending.batch
+    # Lot déjà purgé, ou abandonné avec son callback par un retour arrière
+    # (transaction ou point de sauvegarde) : nouveau lot
+    if batch is None or batch.flushed or not any(
+        func == batch.flush for _, func, _ in connection.run_on_commit
+    ):
+        batch = _pending.batch = PurgeBatch()
+        transaction.on_commit(batch.flush)
+    batch.keys.update(keys)
+
+
+def list_fields_changed(instance, update_fields=None):
+    """
+    Vrai si la sauvegarde d'un objet existant modifie un champ de
+    ``LIST_FIELDS`` (une requête, sauf si ``update_fields`` l'exclut).
+    """
+    fields = LIST_FIELDS.get(type(instance), ())
+    if instance._state.adding or instance.pk is None:
+        return True
+    if update_fields is not None:
+        fields = [field for field in fields if field in update_fields]
+    if not fields:
+        return False
+    previous = type(instance)._default_manager.filter(pk=instance.pk).values(*fields).first()
+    if previous is None:
+        return True
+    return any(previous[field] != getattr(instance, field) for field in fields)
@@ -0,0 +1,111 @@
+"""
+Tâches de fond exécutées par ``run_worker`` (content.jobs).
+
+- ``bulk_action`` : lots restants d'une action en masse de l'admin ;
+- ``process_project_image`` : dérivés WebP de ``Project.image`` ;
+- ``warm_caches`` : fragments sérialisés des listes publiques ;
+- ``refresh_stats`` : statistiques par entreprise de la version courante ;
+- ``purge_stale_uploads`` : envois d'images abandonnés ;
+- ``purge_surrogate_keys`` : purge du cache partagé restée en échec.
+"""
+import hashlib
+import io
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .analytics import company_rating_stats
+from .bulk_actions import run_bulk_action
+from .fragments import fragments_enabled, render_fragments
+from .invalidation import mark_changed
+from .jobs import task
+from .models import Project, Service, Testimonial
+from .serializers import ProjectSerializer, ServiceSerializer, TestimonialSerializer
+from .surrogate_keys import get_purger
+from . import uploads
+
+DERIVED_DIR = 'projects/derived'
+WEBP_QUALITY = 80
+
+
+@task('bulk_action')
+def bulk_action(job_id):
+    job = run_bulk_action(job_id)
+    if job.status == 'failed':
+        # Nouvelle tentative par la file ; elle reprendra après le dernier lot validé
+        raise RuntimeError(job.error)
+
+
+@task('process_project_image')
+def process_project_image(project_id):
+    """
+    Écrit les dérivés WebP de l'image (une largeur par entrée de
+    ``CONTENT_IMAGE_VARIANT_WIDTHS``) sous des noms contenant leur empreinte,
+    servis avec un cache d'un an (content.media).
+    """
+    project = Project.objects.filter(pk=project_id).first()
+    if project is None or not project.image:
+        return
+    storage = project.image.storage
+    with project.image.open('rb') as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image.load()
+    image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+    stem = PurePosixPath(project.image.name).stem
+
+    variants = {}
+    for width in getattr(settings, 'CONTENT_IMAGE_VARIANT_WIDTHS', (480, 960)):
+        width = min(width, image.width)
+        if str(width) in variants:
+            continue
+        resized = image.copy()
+        resized.thumbnail((width, image.height * width // image.width or 1))
+        buffer = io.BytesIO()
+        resized.save(buffer, format='WEBP', quality=WEBP_QUALITY)
+        data = buffer.getvalue()
+        name = f"{DERIVED_DIR}/{stem}.{width}.{hashlib.sha256(data).hexdigest()[:8]}.webp"
+        if not storage.exists(name):
+            storage.save(name, ContentFile(data))
+        variants[str(width)] = name
+
+    # Image remplacée pendant le traitement : une autre tâche a été mise en file
+    updated = Project.objects.filter(pk=project.pk, image=project.image.name).update(
+        image_variants=variants, updated_at=timezone.now()
+    )
+    if updated:
+        # Nouvelles URL servies par les listes (fragments, modèle de lecture, cache partagé)
+        mark_changed(Project, [project.pk], lists=False)
+
+
+@task('warm_caches')
+def warm_caches():
+    """Sérialise à l'avance les objets des listes publiques absents du cache"""
+    if not fragments_enabled():
+        return
+    lists = [
+        (ServiceSerializer, Service, Service.objects.filter(is_active=True)),
+        (ProjectSerializer, Project, Project.objects.all()),
+        (TestimonialSerializer, Testimonial, Testimonial.objects.filter(is_approved=True)),
+    ]
+    for serializer_class, model, queryset in lists:
+        render_fragments(serializer_class, model, queryset.values_list('pk', 'updated_at'))
+
+
+@task('refresh_stats')
+def refresh_stats():
+    """Calcule les statistiques par entreprise avant la première requête qui les demande"""
+    company_rating_stats()
+
+
+@task('purge_stale_uploads')
+def purge_stale_uploads():
+    uploads.purge_stale_uploads()
+
+
+@task('purge_surrogate_keys')
+def purge_surrogate_keys(keys):
+    """Nouvelle tentative d'une purge ; une erreur la replanifie avec un délai croissant"""
+    get_purger().purge(keys)
@@ -0,0 +1,153 @@
+"""
+Outils de test partagés : budgets de requêtes SQL par endpoint et service de
+purge factice.
+
+Chaque nom d'URL déclare le nombre maximal de requêtes qu'il peut émettre.
+``QueryBudgetMixin.assertQueryBudget`` exécute l'endpoint à deux volumes de
+données et échoue si le nombre de requêtes augmente avec le nombre de lignes
+(signe d'un N+1) ou dépasse le budget déclaré. Le message d'échec liste les
+requêtes SQL exécutées, les requêtes répétées en premier.
+
+``PurgeStubServer`` écoute en local et enregistre les appels de purge
+d'``HTTPPurger`` (content.surrogate_keys).
+"""
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .slow_queries import fingerprint
+
+# Nombre maximal de requêtes SQL par nom d'URL
+QUERY_BUDGETS = {
+    'content:api_overview': 0,
+    # Listes : pk/updated_at (et total), puis les objets absents du cache de
+    # fragments ; la version (content.single_flight) est vérifiée par intervalle
+    'content:service_list': 2,
+    'content:project_list': 3,
+    'content:testimonial_list': 3,
+    # Vérification de version (et chargement des bandes au premier appel), in_bulk
+    'content:testimonial_random': 3,
+    # Vérification de version (et construction de l'index au premier appel), in_bulk
+    'content:project_similar': 3,
+    # Vérification de version (et construction de l'index au premier appel)
+    'content:project_facets': 2,
+    # Vérification de version (et construction de l'index au premier appel)
+    'content:autocomplete': 2,
+    # Agrégats, recalculés quand la version change
+    'content:dashboard_stats': 8,
+    # Version des témoignages puis lecture groupée des paires (entreprise, note)
+    'content:company_rating_stats': 2,
+    # Lot de la page d'accueil : services, projets, témoignages et statistiques
+    'content:batch': 16,
+    # Changelists de l'admin (session et utilisateur compris)
+    'admin:content_service_changelist': 5,
+    'admin:content_project_changelist': 7,
+    'admin:content_testimonial_changelist': 6,
+}
+
+def format_queries(queries):
+    """Présente les requêtes capturées, les plus répétées d'abord"""
+    counts = Counter(fingerprint(query['sql']) for query in queries)
+    lines = []
+    for sql, count in counts.most_common():
+        marker = f"{count}x" if count > 1 else "  "
+        lines.append(f"  {marker:>4} {sql}")
+    return '\n'.join(lines)
+
+
+class QueryBudgetMixin:
+    """Mixin pour les TestCase : vérifie le budget de requêtes d'un endpoint"""
+
+    query_budgets = QUERY_BUDGETS
+
+    def count_queries(self, url, data=None, method='get'):
+        with CaptureQueriesContext(connection) as captured:
+            if method == 'get':
+                response = self.client.get(url, data)
+            else:
+                response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(
+            response.status_code, 400,
+            f"{url} a répondu {response.status_code}",
+        )
+        return captured.captured_queries
+
+    def assertQueryBudget(self, url_name, populate, small=2, large=12,
+                          url_kwargs=None, data=None, method='get'):
+        """
+        ``populate(n)`` doit créer n lignes supplémentaires. L'endpoint est
+        appelé après ``small`` puis après ``large`` lignes créées.
+        """
+        budget = self.query_budgets[url_name]
+        url = reverse(url_name, kwargs=url_kwargs)
+
+        # Écritures validées : les index en mémoire les appliquent (content.indexes)
+        with self.captureOnCommitCallbacks(execute=True):
+            populate(small)
+        small_queries = self.count_queries(url, data, method)
+        with self.captureOnCommitCallbacks(execute=True):
+            populate(large - small)
+        large_queries = self.count_queries(url, data, method)
+
+        if len(large_queries) > len(small_queries):
+            self.fail(
+                f"{url_name} : le nombre de requêtes croît avec les données "
+                f"({len(small_queries)} pour {small} lignes, "
+                f"{len(large_queries)} pour {large} lignes)\n"
+                f"{format_queries(large_queries)}"
+            )
+        if len(large_queries) > budget:
+            self.fail(
+                f"{url_name} : {len(large_queries)} requêtes pour un budget "
+                f"de {budget}\n{format_queries(large_queries)}"
+            )
+
+
+class PurgeStubServer:
+    """
+    Service de purge HTTP factice sur 127.0.0.1 (port libre) ; ``requests``
+    contient les appels reçus : ``{'headers': ..., 'tags': [...]}``.
+    ``status`` est le code renvoyé (500 pour simuler une panne).
+
+    Gestionnaire de contexte : ``with PurgeStubServer() as stub: stub.url``.
+    """
+
+    def __init__(self, status=200):
+        self.status = status
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                stub.requests.append({
+                    'headers': dict(self.headers),
+                    'tags': json.loads(body or b'{}').get('tags', []),
+                })
+                self.send_response(stub.status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/purge"
+
+    @property
+    def tags(self):
+        """Toutes les clés purgées, dans l'ordre des appels"""
+        return [tag for request in self.requests for tag in request['tags']]
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,15 +1,59 @@
-from django.test import TestCase, Client
-from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
+from django.test import AsyncRequestFactory, TestCase, Client, LiveServerTestCase, RequestFactory, override_settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.urls import resolve, reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
 from datetime import date, timedelta
 from rest_framework.test import APITestCase
 from rest_framework import status
 from PIL import Image
+from unittest import mock, skipUnless
+from django.db import DatabaseError, OperationalError, connection, transaction
+from django.db.models import F
+from django.core.management import call_command, CommandError
+from django.core.cache import cache
+import asyncio
+import gzip
+import hashlib
 import io
 import json
+import random
+import tempfile
+import threading
+from collections import Counter
+import time
+import numpy as np
+from pathlib import Path
 
-from .models import Service, Project, Testimonial
+from .models import (
+    Service, Project, Testimonial, ContentVersion, BulkActionJob, TestimonialLSHBucket,
+    BackgroundJob, ImageUpload,
+)
+from .serializers import ProjectSerializer
+from .read_model import read_model, StaleSnapshotError
+from .profiling import StackSampler, load_profile
+from .testing import PurgeStubServer, QueryBudgetMixin
+from .write_behind import submission_buffer
+from .partitioning import existing_partitions, partition_bounds, year_range
+from .analytics import compute_company_stats
+from .indexes import technology_index, rating_band_index, company_index, PrefixIndex
+from .bulk_actions import run_bulk_action, start_bulk_action
+from .uploads import purge_stale_uploads
+from .surrogate_keys import reset_purger
+from .renderers import msgpack
+from .single_flight import single_flight
+from .invalidation import current_versions, mark_changed, version_check
+from .jobs import TASKS, backoff_delay, claim, enqueue, heartbeat, run_next
+from .fragments import render_fragments
+from .minhash import signature, similarity
+from .staticfiles import (
+    StaticFilesASGIHandler, StaticFilesIndex, StaticFilesWSGIHandler, choose_encoding
+)
+from .database import StatementTimeout, statement_timeout, timeout_for
+from .slow_queries import ExplainRateLimiter, fingerprint, load_entries, slow_query_logger
+from .management.commands.loadtest import WeightedMix, parse_access_log
 
 class ServiceModelTest(TestCase):
     """Tests pour le modèle Service"""
@@ -126,6 +170,8 @@ class ServiceAPITest(APITestCase):
     """Tests pour l'API des services"""
     
     def setUp(self):
+        # Versions du contenu remises à zéro entre les tests : résultats en cache périmés
+        cache.clear()
         self.service_active = Service.objects.create(
             title="Service Actif",
             description="Service activé",
@@ -164,6 +210,8 @@ class ProjectAPITest(APITestCase):
     """Tests pour l'API des projets"""
     
     def setUp(self):
+        # Versions du contenu remises à zéro entre les tests : résultats en cache périmés
+        cache.clear()
         # Créer une image de test
         image = Image.new('RGB', (100, 100), color='blue')
         image_file = io.BytesIO()
@@ -233,6 +281,8 @@ class TestimonialAPITest(APITestCase):
     """Tests pour l'API des témoignages"""
     
     def setUp(self):
+        # Versions du contenu remises à zéro entre les tests : résultats en cache périmés
+        cache.clear()
         self.testimonial_approved = Testimonial.objects.create(
             author="Client Satisfait",
             position="Manager",
@@ -299,6 +349,8 @@ class DashboardStatsAPITest(APITestCase):
     """Tests pour l'API des statistiques du dashboard"""
     
     def setUp(self):
+        # Versions du contenu remises à zéro entre les tests : résultats en cache périmés
+        cache.clear()
         # Créer des données de test
         Service.objects.create(title="Service 1", description="Desc 1", icon="fa-1", is_active=True)
         Service.objects.create(title="Service 2", description="Desc 2", icon="fa-2", is_active=False)
@@ -387,4 +439,2101 @@ class APIOverviewTest(APITestCase):
         self.assertIn('Services', endpoints)
         self.assertIn('Projects', endpoints)
         self.assertIn('Testimonials', endpoints)
-        self.assertIn('Dashboard', endpoints)
\ No newline at end of file
+        self.assertIn('Dashboard', endpoints)
+
+
+@override_settings(
+    CONTENT_READ_MODEL_ENABLED=True,
+    CONTENT_READ_MODEL_CHECK_INTERVAL=60,
+    CONTENT_READ_MODEL_MAX_STALENESS=120,
+)
+class ReadModelTest(APITestCase):
+    """Tests pour le modèle de lecture en mémoire"""
+
+    def setUp(self):
+        read_model.reset()
+        Service.objects.create(title="Service Actif", description="Desc", icon="fa-1")
+        Service.objects.create(
+            title="Service Inactif", description="Desc", icon="fa-2", is_active=False
+        )
+        image = Image.new('RGB', (10, 10), color='red')
+        image_file = io.BytesIO()
+        image.save(image_file, format='JPEG')
+        for name, techs in [("Projet Django", "Django, Python"), ("App React", "React, Node.js")]:
+            Project.objects.create(
+                name=name,
+                description="Description",
+                image=SimpleUploadedFile('test_image.jpg', image_file.getvalue(), 'image/jpeg'),
+                technologies=techs,
+                completion_date=date.today()
+            )
+        for rating in (5, 4, 3):
+            Testimonial.objects.create(
+                author=f"Auteur {rating}", position="CEO", company="Corp",
+                content="Contenu", rating=rating, is_approved=True
+            )
+
+    def tearDown(self):
+        read_model.reset()
+
+    def test_write_bumps_content_version(self):
+        """Chaque écriture incrémente le compteur de version"""
+        before = ContentVersion.objects.get(scope='service').version
+        Service.objects.create(title="Nouveau", description="Desc", icon="fa-3")
+        self.assertEqual(ContentVersion.objects.get(scope='service').version, before + 1)
+
+    def test_list_views_served_from_snapshot(self):
+        """Les listes servies depuis l'instantané ne touchent pas aux tables"""
+        read_model.get_snapshot()
+        with self.assertNumQueries(0):
+            services = self.client.get(reverse('content:service_list'))
+            projects = self.client.get(reverse('content:project_list'), {'technology': 'django'})
+            testimonials = self.client.get(reverse('content:testimonial_list'), {'min_rating': '4'})
+
+        self.assertEqual([row['title'] for row in services.data], ["Service Actif"])
+        self.assertEqual(projects.data['count'], 1)
+        self.assertTrue(projects.data['results'][0]['image_url'].startswith('http://testserver/'))
+        self.assertEqual(
+            [row['rating'] for row in testimonials.data['results']], [4, 5]
+        )
+
+    def test_snapshot_matches_database_results(self):
+        """L'instantané renvoie les mêmes données que les requêtes SQL"""
+        url = reverse('content:project_list')
+        from_snapshot = self.client.get(url, {'technology': 'react'}).data
+        with self.settings(CONTENT_READ_MODEL_ENABLED=False):
+            from_database = self.client.get(url, {'technology': 'react'}).data
+        self.assertEqual(from_snapshot, from_database)
+
+    def test_local_write_refreshes_snapshot(self):
+        """Une écriture locale est visible immédiatement"""
+        url = reverse('content:service_list')
+        self.assertEqual(len(self.client.get(url).data), 1)
+        Service.objects.create(title="Autre", description="Desc", icon="fa-3")
+        self.assertEqual(len(self.client.get(url).data), 2)
+
+    def test_remote_write_detected_after_check_interval(self):
+        """Une écriture d'un autre worker est détectée via le compteur"""
+        snapshot = read_model.get_snapshot()
+        ContentVersion.objects.filter(scope='service').update(version=999)
+        self.assertIs(read_model.get_snapshot(), snapshot)
+        with mock.patch('content.read_model.time.monotonic', return_value=10**9):
+            self.assertIsNot(read_model.get_snapshot(), snapshot)
+
+    def test_database_outage_serves_last_snapshot_within_bound(self):
+        """Base indisponible : dernier instantané servi jusqu'à la borne"""
+        snapshot = read_model.get_snapshot()
+        checked_at = read_model._checked_at
+        with mock.patch('content.read_model.get_versions', side_effect=OperationalError):
+            with mock.patch('content.read_model.time.monotonic', return_value=checked_at + 90):
+                self.assertIs(read_model.get_snapshot(), snapshot)
+            with mock.patch('content.read_model.time.monotonic', return_value=checked_at + 200):
+                with self.assertRaises(StaleSnapshotError):
+                    read_model.get_snapshot()
+
+    def test_database_outage_retried_once_per_interval(self):
+        """Pendant une panne, la base n'est retentée qu'à l'intervalle suivant"""
+        snapshot = read_model.get_snapshot()
+        checked_at = read_model._checked_at
+        with mock.patch(
+            'content.read_model.get_versions', side_effect=OperationalError
+        ) as get_versions:
+            for elapsed in (70, 75, 110):
+                with mock.patch('content.read_model.time.monotonic', return_value=checked_at + elapsed):
+                    self.assertIs(read_model.get_snapshot(), snapshot)
+            self.assertEqual(get_versions.call_count, 1)
+            # Borne de fraîcheur comptée depuis la dernière confirmation réussie
+            with mock.patch('content.read_model.time.monotonic', return_value=checked_at + 125):
+                with self.assertRaises(StaleSnapshotError):
+                    read_model.get_snapshot()
+            self.assertEqual(get_versions.call_count, 2)
+
+
+class SamplingProfilerTest(APITestCase):
+    """Tests pour le profilage par échantillonnage"""
+
+    def setUp(self):
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profile_dir.cleanup)
+
+    def test_sampler_captures_current_stack(self):
+        """Le thread de fond relève la pile du thread profilé"""
+        sampler = StackSampler(interval=0.001).start()
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        sampler.stop()
+        self.assertTrue(sampler.samples)
+        self.assertTrue(any(
+            'test_sampler_captures_current_stack' in stack for stack in sampler.samples
+        ))
+
+    def test_profile_written_only_with_token(self):
+        """Seules les requêtes autorisées sont profilées, par nom d'URL"""
+        with self.settings(
+            CONTENT_PROFILER_ENABLED=True,
+            CONTENT_PROFILER_SAMPLE_RATE=0.0,
+            CONTENT_PROFILER_TOKEN='secret',
+            CONTENT_PROFILER_DIR=Path(self.profile_dir.name),
+            CONTENT_PROFILER_FORMAT='speedscope',
+        ):
+            url = reverse('content:service_list')
+            self.client.get(url)
+            self.client.get(url, HTTP_X_PROFILE_TOKEN='mauvais')
+            self.assertFalse(any(Path(self.profile_dir.name).iterdir()))
+            self.client.get(url, HTTP_X_PROFILE_TOKEN='secret')
+
+        files = list(Path(self.profile_dir.name, 'content.service_list').iterdir())
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].name.endswith('.speedscope.json'))
+
+    def test_dumps_in_the_same_second_do_not_collide(self):
+        sampler = StackSampler(interval=0.01)
+        paths = {sampler.dump(self.profile_dir.name, 'vue') for _ in range(3)}
+        self.assertEqual(len(paths), 3)
+
+    def test_profile_report_merges_files(self):
+        """La commande fusionne les profils et classe les chemins chauds"""
+        endpoint = Path(self.profile_dir.name, 'content.project_list')
+        endpoint.mkdir()
+        (endpoint / 'a.collapsed').write_text(
+            "main (app.py);execute (/django/db/backends/utils.py) 3\n"
+            "main (app.py);build_absolute_uri (/django/http/request.py) 1\n"
+        )
+        sampler = StackSampler(interval=0.01)
+        sampler.samples['main (app.py);execute (/django/db/backends/utils.py)'] = 2
+        (endpoint / 'b.speedscope.json').write_text(
+            json.dumps(sampler.to_speedscope('content.project_list'))
+        )
+        self.assertEqual(sum(load_profile(endpoint / 'b.speedscope.json').values()), 2)
+
+        out = io.StringIO()
+        call_command('profile_report', dir=self.profile_dir.name, stdout=out)
+        report = out.getvalue()
+        self.assertIn('content.project_list — 2 requête(s), 6 échantillon(s)', report)
+        self.assertIn('sql', report)
+        self.assertIn('build_absolute_uri', report)
+
+
+# Versions relues une fois par test, à la première requête : les décomptes ne
+# dépendent pas du temps écoulé entre deux appels
+@override_settings(CONTENT_INDEX_CHECK_INTERVAL=3600)
+class QueryBudgetTest(QueryBudgetMixin, APITestCase):
+    """Budgets de requêtes SQL : détecte les N+1 quand les données augmentent"""
+
+    def setUp(self):
+        self.created = Counter()
+        cache.clear()
+        version_check.reset()
+        self.addCleanup(version_check.reset)
+
+    def add_services(self, count):
+        for _ in range(count):
+            self.created['service'] += 1
+            Service.objects.create(
+                title=f"Service {self.created['service']}",
+                description="Desc", icon="fa-1"
+            )
+
+    def add_projects(self, count):
+        for _ in range(count):
+            self.created['project'] += 1
+            Project.objects.create(
+                name=f"Projet {self.created['project']}",
+                description="Desc",
+                image='projects/test_image.jpg',
+                technologies="Django, React",
+                completion_date=date.today() - timedelta(days=self.created['project'] * 40)
+            )
+
+    def add_testimonials(self, count):
+        for _ in range(count):
+            self.created['testimonial'] += 1
+            Testimonial.objects.create(
+                author=f"Auteur {self.created['testimonial']}", position="CEO",
+                company=f"Corp {self.created['testimonial']}", content="Contenu",
+                rating=self.created['testimonial'] % 5 + 1, is_approved=True
+            )
+
+    def add_everything(self, count):
+        self.add_services(count)
+        self.add_projects(count)
+        self.add_testimonials(count)
+
+    def login_admin(self):
+        admin_user = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin_user)
+
+    def test_api_overview_budget(self):
+        self.assertQueryBudget('content:api_overview', lambda count: None)
+
+    def test_service_list_budget(self):
+        self.assertQueryBudget('content:service_list', self.add_services)
+
+    def test_project_list_budget(self):
+        self.assertQueryBudget('content:project_list', self.add_projects)
+        self.assertQueryBudget(
+            'content:project_list', self.add_projects, data={'technology': 'django'}
+        )
+
+    def test_testimonial_random_budget(self):
+        rating_band_index.reset()
+        self.addCleanup(rating_band_index.reset)
+        self.assertQueryBudget(
+            'content:testimonial_random', self.add_testimonials, data={'count': 3}
+        )
+
+    def test_project_facets_budget(self):
+        technology_index.reset()
+        self.addCleanup(technology_index.reset)
+        self.assertQueryBudget('content:project_facets', self.add_projects)
+
+    def test_autocomplete_budget(self):
+        company_index.reset()
+        self.addCleanup(company_index.reset)
+        self.assertQueryBudget(
+            'content:autocomplete', self.add_testimonials, data={'field': 'company', 'prefix': 'c'}
+        )
+
+    def test_project_similar_budget(self):
+        technology_index.reset()
+        self.addCleanup(technology_index.reset)
+        self.add_projects(1)
+        target = Project.objects.get()
+        self.assertQueryBudget(
+            'content:project_similar', self.add_projects, url_kwargs={'pk': target.pk}
+        )
+
+    def test_testimonial_list_budget(self):
+        self.assertQueryBudget(
+            'content:testimonial_list', self.add_testimonials, data={'min_rating': '3'}
+        )
+
+    def test_company_rating_stats_budget(self):
+        cache.clear()
+        self.assertQueryBudget('content:company_rating_stats', self.add_testimonials)
+
+    def test_dashboard_stats_budget(self):
+        self.assertQueryBudget('content:dashboard_stats', self.add_everything)
+
+    def test_batch_budget(self):
+        self.assertQueryBudget('content:batch', self.add_everything, small=5, method='post', data={
+            'requests': [
+                '/api/services/',
+                '/api/projects/?page_size=6',
+                '/api/testimonials/?min_rating=4',
+                '/api/dashboard/stats/',
+            ]
+        })
+
+    def test_admin_changelist_budgets(self):
+        self.login_admin()
+        self.assertQueryBudget('admin:content_testimonial_changelist', self.add_testimonials)
+        self.assertQueryBudget('admin:content_service_changelist', self.add_services)
+        self.assertQueryBudget('admin:content_project_changelist', self.add_projects)
+
+    def test_budget_failure_lists_repeated_sql(self):
+        """Un endpoint qui croît avec les données échoue en listant le SQL"""
+        original = ProjectSerializer.get_image_url
+
+        def get_image_url(serializer, obj):
+            Project.objects.filter(pk=obj.pk).exists()  # N+1 volontaire
+            return original(serializer, obj)
+
+        with mock.patch.object(ProjectSerializer, 'get_image_url', get_image_url), \
+                override_settings(CONTENT_FRAGMENT_CACHE_ENABLED=False):
+            with self.assertRaises(AssertionError) as failure:
+                self.assertQueryBudget('content:project_list', self.add_projects)
+        self.assertIn('croît avec les données', str(failure.exception))
+        self.assertIn('10x SELECT ? AS "a" FROM "content_project"', str(failure.exception))
+
+
+class BatchAPITest(APITestCase):
+    """Tests pour l'endpoint de requêtes groupées"""
+
+    def setUp(self):
+        # Versions du contenu remises à zéro entre les tests : résultats en cache périmés
+        cache.clear()
+        Service.objects.create(title="Service Actif", description="Desc", icon="fa-1")
+        Testimonial.objects.create(
+            author="Client", position="CEO", company="Corp",
+            content="Parfait", rating=5, is_approved=True
+        )
+        self.url = reverse('content:batch')
+
+    def test_batch_returns_each_sub_response(self):
+        """Chaque sous-requête est exécutée avec son propre code de statut"""
+        response = self.client.post(self.url, {'requests': [
+            '/api/services/',
+            {'id': 'temoignages', 'path': '/api/testimonials/?min_rating=4'},
+            '/api/inconnu/',
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        services, testimonials, unknown = response.data['responses']
+        self.assertEqual(services['status'], 200)
+        self.assertEqual(services['body'][0]['title'], "Service Actif")
+        self.assertEqual(testimonials['id'], 'temoignages')
+        self.assertEqual(testimonials['body']['count'], 1)
+        self.assertEqual(unknown['status'], 404)
+
+    def test_batch_matches_direct_requests(self):
+        """Le corps d'une sous-requête est identique à l'appel direct"""
+        direct = self.client.get('/api/dashboard/stats/').json()
+        batched = self.client.post(
+            self.url, {'requests': ['/api/dashboard/stats/']}, format='json'
+        ).json()
+        self.assertEqual(batched['responses'][0]['body'], direct)
+
+    def test_batch_under_asgi_builds_absolute_urls(self):
+        Testimonial.objects.create(
+            author="Autre", position="CTO", company="Corp", content="Bien", rating=4, is_approved=True
+        )
+        request = AsyncRequestFactory().post(
+            self.url, {'requests': ['/api/testimonials/?page_size=1']}, content_type='application/json'
+        )
+        response = resolve(self.url).func(request)
+        self.assertTrue(response.data['responses'][0]['body']['next'].startswith('http://testserver/'))
+
+    def test_batch_rejects_foreign_and_nested_urls(self):
+        """Seules les URLs de content, hors /api/batch/, sont autorisées"""
+        response = self.client.post(
+            self.url, {'requests': ['/admin/', '/api/batch/', 'api/services/']}, format='json'
+        )
+        self.assertEqual(
+            [item['status'] for item in response.data['responses']], [400, 400, 400]
+        )
+
+    def test_batch_size_is_limited(self):
+        """Un lot vide ou trop grand est refusé"""
+        self.assertEqual(
+            self.client.post(self.url, {'requests': []}, format='json').status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+        with self.settings(CONTENT_BATCH_MAX_REQUESTS=2):
+            response = self.client.post(
+                self.url, {'requests': ['/api/services/'] * 3}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestimonialSubmissionTest(APITestCase):
+    """Tests pour la soumission publique de témoignages par lots"""
+
+    def setUp(self):
+        spool = tempfile.TemporaryDirectory()
+        self.addCleanup(spool.cleanup)
+        self.spool_dir = Path(spool.name)
+        settings_override = self.settings(
+            CONTENT_TESTIMONIAL_SPOOL_DIR=self.spool_dir,
+            CONTENT_TESTIMONIAL_BATCH_SIZE=3,
+            CONTENT_TESTIMONIAL_FLUSH_INTERVAL=0,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.url = reverse('content:testimonial_list')
+
+    def submit(self, author="Nouveau Client", **extra):
+        payload = {
+            'author': author, 'position': "CTO", 'company': "StartCorp",
+            'content': "Très bonne collaboration", 'rating': 5,
+        }
+        payload.update(extra)
+        return self.client.post(self.url, payload, format='json')
+
+    def test_submission_is_queued_then_batched(self):
+        """Les soumissions sont acceptées (202) puis insérées par lots"""
+        first = self.submit("Client 1")
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(first.data['status'], 'queued')
+        self.submit("Client 2")
+        self.assertEqual(Testimonial.objects.count(), 0)
+
+        self.submit("Client 3")  # Le lot est plein : insertion groupée
+        self.assertEqual(Testimonial.objects.count(), 3)
+        self.assertFalse(Testimonial.objects.filter(is_approved=True).exists())
+        created = Testimonial.objects.get(author="Client 1")
+        self.assertEqual(str(created.submission_ticket), first.data['ticket'])
+        # Non approuvés : invisibles dans la liste publique
+        self.assertEqual(self.client.get(self.url).data['count'], 0)
+
+    def test_invalid_submission_is_rejected(self):
+        """Les données invalides sont refusées avant la mise en file"""
+        response = self.submit(rating=7)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse((self.spool_dir / 'pending.jsonl').exists())
+
+    def test_flush_failure_does_not_fail_the_submission(self):
+        """Le spool garde la soumission : une erreur de base ne renvoie pas de 500"""
+        with self.settings(CONTENT_TESTIMONIAL_BATCH_SIZE=1), mock.patch.object(
+            type(submission_buffer), '_insert_batch', side_effect=OperationalError("base indisponible")
+        ), self.assertLogs('content.write_behind', 'ERROR'):
+            response = self.submit("Client 1")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(Testimonial.objects.count(), 0)
+        # Lot rendu au spool, inséré au vidage suivant
+        self.assertEqual(len(list(self.spool_dir.glob('batch-*.jsonl'))), 1)
+        self.assertEqual(submission_buffer.flush(), 1)
+
+    def test_spool_survives_restart_and_replay(self):
+        """Le spool est repris après redémarrage, sans doublon au rejeu"""
+        self.submit("Client Persistant")
+        pending = (self.spool_dir / 'pending.jsonl').read_text(encoding='utf-8')
+
+        out = io.StringIO()
+        call_command('flush_testimonials', stdout=out)
+        self.assertIn('1 témoignage(s) inséré(s)', out.getvalue())
+
+        # Lot rejoué après un arrêt brutal entre l'insertion et la suppression
+        (self.spool_dir / 'batch-replay.jsonl').write_text(pending, encoding='utf-8')
+        self.assertEqual(submission_buffer.flush(), 0)
+        self.assertEqual(Testimonial.objects.filter(author="Client Persistant").count(), 1)
+        self.assertEqual(list(self.spool_dir.glob('*.jsonl')), [])
+
+
+class MediaServingTest(TestCase):
+    """Tests pour le service des fichiers media"""
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = self.settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.content = bytes(range(256)) * 4
+        Path(media_root.name, 'projects', 'derived').mkdir(parents=True)
+        Path(media_root.name, 'projects', 'photo.jpg').write_bytes(self.content)
+        Path(media_root.name, 'projects', 'derived', 'photo.3f2a9c1b.webp').write_bytes(b'webp')
+        Path(media_root.name, 'secret.txt').write_bytes(b'secret')
+        self.url = '/media/projects/photo.jpg'
+
+    def test_full_response_headers(self):
+        """Réponse complète avec ETag fort et cache court pour un nom mutable"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertFalse(response['ETag'].startswith('W/'))
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+
+    def test_immutable_name_is_cached_long(self):
+        """Un nom contenant une empreinte est mis en cache un an"""
+        response = self.client.get('/media/projects/derived/photo.3f2a9c1b.webp')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_range_requests(self):
+        """Intervalles simples, suffixes, If-Range et intervalle non satisfiable"""
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.content)}')
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-5:])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"autre"')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=5000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.content)}')
+
+    def test_sendfile_offload(self):
+        """En mode délégation, seuls les en-têtes sont produits"""
+        with self.settings(CONTENT_MEDIA_SENDFILE='x-accel-redirect'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/projects/photo.jpg')
+        self.assertEqual(response.content, b'')
+        self.assertIn('ETag', response)
+
+    def test_private_and_traversal_paths_are_refused(self):
+        self.assertEqual(self.client.get('/media/secret.txt').status_code, 404)
+        self.assertEqual(self.client.get('/media/projects/../secret.txt').status_code, 404)
+        self.assertEqual(self.client.get('/media/projects/absent.jpg').status_code, 404)
+
+
+class TestimonialPartitioningTest(APITestCase):
+    """Tests pour le partitionnement par date des témoignages"""
+
+    def setUp(self):
+        # Versions du contenu remises à zéro entre les tests : résultats en cache périmés
+        cache.clear()
+        for year, approved in [(2023, True), (2024, True), (2024, False)]:
+            testimonial = Testimonial.objects.create(
+                author=f"Auteur {year}", position="CEO", company="Corp",
+                content="Contenu", rating=5, is_approved=approved
+            )
+            Testimonial.objects.filter(pk=testimonial.pk).update(
+                created_at=year_range(year)[0] + timedelta(days=40)
+            )
+
+    def test_partition_bounds(self):
+        """Les partitions couvrent la période demandée sans trou"""
+        monthly = partition_bounds(date(2024, 11, 15), date(2025, 2, 1), 'month')
+        self.assertEqual(
+            [name for name, start, end in monthly],
+            ['content_testimonial_y2024m11', 'content_testimonial_y2024m12',
+             'content_testimonial_y2025m01', 'content_testimonial_y2025m02'],
+        )
+        self.assertEqual(monthly[1][1:], (date(2024, 12, 1), date(2025, 1, 1)))
+        yearly = partition_bounds(date(2023, 6, 1), date(2024, 1, 1), 'year')
+        self.assertEqual([start for name, start, end in yearly], [date(2023, 1, 1), date(2024, 1, 1)])
+
+    def test_year_filter_on_list_and_stats(self):
+        """Le filtre ?year= borne created_at dans la liste et les statistiques"""
+        response = self.client.get(reverse('content:testimonial_list'), {'year': '2024'})
+        self.assertEqual([row['author'] for row in response.data['results']], ["Auteur 2024"])
+
+        with override_settings(CONTENT_READ_MODEL_ENABLED=True):
+            read_model.reset()
+            response = self.client.get(reverse('content:testimonial_list'), {'year': '2023'})
+            read_model.reset()
+        self.assertEqual([row['author'] for row in response.data['results']], ["Auteur 2023"])
+
+        stats = self.client.get(reverse('content:dashboard_stats'), {'year': '2024'}).data
+        self.assertEqual(stats['testimonials']['total_testimonials'], 2)
+        self.assertEqual(stats['testimonials']['approved_testimonials'], 1)
+
+    @skipUnless(connection.vendor != 'postgresql', "Conversion réelle sous PostgreSQL")
+    def test_command_requires_postgresql(self):
+        with self.assertRaises(CommandError):
+            call_command('testimonial_partitions', '--convert')
+
+    @skipUnless(connection.vendor == 'postgresql', "Partitionnement propre à PostgreSQL")
+    def test_convert_then_prune_by_year(self):
+        """La conversion garde les lignes et un filtre par année n'explore qu'une partition"""
+        call_command('testimonial_partitions', '--convert', '--granularity', 'year',
+                     '--ahead', '1', stdout=io.StringIO())
+        self.assertEqual(Testimonial.objects.count(), 3)
+        created = Testimonial.objects.create(
+            author="Nouveau", position="CEO", company="Corp", content="Contenu", rating=4
+        )
+        self.assertGreater(created.pk, max(Testimonial.objects.exclude(pk=created.pk)
+                                           .values_list('pk', flat=True)))
+
+        start, end = year_range(2024)
+        queryset = Testimonial.objects.filter(created_at__gte=start, created_at__lt=end)
+        self.assertEqual(queryset.count(), 2)
+        plan = queryset.explain()
+        self.assertIn('content_testimonial_y2024', plan)
+        self.assertNotIn('content_testimonial_y2023', plan)
+        self.assertNotIn('content_testimonial_default', plan)
+
+        # Les passages suivants reprennent la granularité des partitions existantes
+        out = io.StringIO()
+        call_command('testimonial_partitions', '--ahead', '2', stdout=out)
+        next_year = timezone.now().year + 2
+        self.assertIn(f'content_testimonial_y{next_year}', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('testimonial_partitions', '--granularity', 'month')
+
+    @skipUnless(connection.vendor == 'postgresql', "Partitionnement propre à PostgreSQL")
+    def test_rows_in_default_partition_moved_to_new_partition(self):
+        """Une période créée en retard reprend ses lignes de la partition par défaut"""
+        call_command('testimonial_partitions', '--convert', '--granularity', 'year',
+                     '--ahead', '1', stdout=io.StringIO())
+        future = timezone.now().year + 3
+        testimonial = Testimonial.objects.create(
+            author="Futur", position="CEO", company="Corp", content="Contenu", rating=5
+        )
+        Testimonial.objects.filter(pk=testimonial.pk).update(created_at=year_range(future)[0])
+
+        def rows(table):
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT id FROM {connection.ops.quote_name(table)}")
+                return [row[0] for row in cursor.fetchall()]
+
+        self.assertEqual(rows('content_testimonial_default'), [testimonial.pk])
+        call_command('testimonial_partitions', '--ahead', '3', stdout=io.StringIO())
+        self.assertEqual(rows(f'content_testimonial_y{future}'), [testimonial.pk])
+        self.assertEqual(rows('content_testimonial_default'), [])
+        self.assertIn('content_testimonial_default', existing_partitions(connection))
+        self.assertEqual(Testimonial.objects.count(), 4)
+
+
+class CompanyRatingStatsTest(APITestCase):
+    """Tests pour les statistiques de notes par entreprise"""
+
+    def setUp(self):
+        cache.clear()
+        self.ratings = {'Alpha': [5, 4, 4, 3, 1], 'Beta': [2, 5], 'Gamma': [4]}
+        for company, ratings in self.ratings.items():
+            for rating in ratings:
+                Testimonial.objects.create(
+                    author="Auteur", position="CEO", company=company,
+                    content="Contenu", rating=rating, is_approved=True
+                )
+        Testimonial.objects.create(
+            author="Auteur", position="CEO", company="Gamma",
+            content="En attente", rating=1, is_approved=False
+        )
+        self.url = reverse('content:company_rating_stats')
+
+    def test_stats_match_numpy_reference(self):
+        """Les percentiles vectorisés correspondent à numpy.percentile"""
+        results = {row['company']: row for row in self.client.get(self.url).data['results']}
+        self.assertEqual(list(results), ['Alpha', 'Beta', 'Gamma'])  # Par effectif décroissant
+        for company, ratings in self.ratings.items():
+            row = results[company]
+            self.assertEqual(row['count'], len(ratings))
+            self.assertAlmostEqual(row['mean'], round(np.mean(ratings), 2))
+            self.assertAlmostEqual(row['median'], np.median(ratings))
+            self.assertAlmostEqual(row['p10'], round(np.percentile(ratings, 10), 2))
+            self.assertAlmostEqual(row['p90'], round(np.percentile(ratings, 90), 2))
+        self.assertEqual(results['Alpha']['histogram'], [1, 0, 1, 2, 1])
+        self.assertEqual(results['Gamma']['histogram'], [0, 0, 0, 1, 0])  # Approuvés seulement
+
+    def test_results_cached_until_testimonial_change(self):
+        """Le calcul est mis en cache jusqu'à la prochaine modification"""
+        self.client.get(self.url)
+        with self.assertNumQueries(1):  # Lecture de la version seulement
+            self.client.get(self.url)
+        Testimonial.objects.create(
+            author="Auteur", position="CEO", company="Delta",
+            content="Contenu", rating=3, is_approved=True
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 4)
+
+    def test_many_companies_in_one_pass(self):
+        """Des dizaines de milliers d'entreprises sont traitées sans boucle par groupe"""
+        companies = [f"Entreprise {i % 20000}" for i in range(60000)]
+        ratings = [i % 5 + 1 for i in range(60000)]
+        started = time.perf_counter()
+        stats = compute_company_stats(companies, ratings)
+        self.assertLess(time.perf_counter() - started, 2)
+        self.assertEqual(len(stats), 20000)
+        self.assertTrue(all(row['count'] == 3 for row in stats))
+
+
+class SimilarProjectsTest(APITestCase):
+    """Tests pour les projets similaires et l'index inversé des technologies"""
+
+    def setUp(self):
+        technology_index.reset()
+        self.addCleanup(technology_index.reset)
+        self.target = self.create("Cible", "Django, React, PostgreSQL", 0)
+        self.close = self.create("Proche", "django, React", 100)
+        self.closer_recent = self.create("Proche Récent", "Django, React, Redis", 10)
+        self.far = self.create("Lointain", "PostgreSQL, Go, Kafka, Docker", 5)
+        self.unrelated = self.create("Sans Rapport", "Flutter", 1)
+
+    def create(self, name, technologies, age_days):
+        return Project.objects.create(
+            name=name, description="Desc", image='projects/test_image.jpg',
+            technologies=technologies,
+            completion_date=date.today() - timedelta(days=age_days)
+        )
+
+    def url(self, project):
+        return reverse('content:project_similar', kwargs={'pk': project.pk})
+
+    def test_ranking_by_jaccard_then_recency(self):
+        """Classement par Jaccard, la date départageant les ex æquo"""
+        response = self.client.get(self.url(self.target))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [row['name'] for row in response.data['results']]
+        self.assertEqual(names, ["Proche", "Proche Récent", "Lointain"])
+        self.assertEqual(response.data['results'][0]['similarity'], round(2 / 3, 4))
+        self.assertEqual(response.data['results'][1]['similarity'], 0.5)
+
+    def test_tie_broken_by_recency(self):
+        self.create("Jumeau Récent", "Django, React", 1)
+        names = [row['name'] for row in self.client.get(self.url(self.target)).data['results']]
+        self.assertEqual(names[:2], ["Jumeau Récent", "Proche"])
+
+    def test_limit_and_unknown_project(self):
+        response = self.client.get(self.url(self.target), {'limit': 1})
+        self.assertEqual(len(response.data['results']), 1)
+        missing = reverse('content:project_similar', kwargs={'pk': 999999})
+        self.assertEqual(self.client.get(missing).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_index_updated_incrementally_on_save_and_delete(self):
+        """Les écritures locales sont appliquées sans reconstruction complète"""
+        self.client.get(self.url(self.target))
+        with mock.patch.object(technology_index, 'load') as load:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.unrelated.technologies = "Django, React, PostgreSQL"
+                self.unrelated.save()
+                self.close.delete()
+            self.assertNotIn(self.close.pk, technology_index.projects)
+            with self.settings(CONTENT_INDEX_CHECK_INTERVAL=0):
+                response = self.client.get(self.url(self.target))
+            load.assert_not_called()
+        self.assertEqual(response.data['results'][0]['name'], "Sans Rapport")
+        self.assertEqual(response.data['results'][0]['similarity'], 1.0)
+
+    def test_remote_change_triggers_rebuild(self):
+        """Un écart de version inexpliqué provoque une reconstruction"""
+        self.client.get(self.url(self.target))
+        ContentVersion.objects.filter(scope='project').update(version=10**6)
+        with self.settings(CONTENT_INDEX_CHECK_INTERVAL=0):
+            with mock.patch.object(
+                technology_index, 'load', wraps=technology_index.load
+            ) as load:
+                self.client.get(self.url(self.target))
+        load.assert_called_once()
+
+    def test_rolled_back_write_leaves_index_untouched(self):
+        """Une transaction annulée n'applique rien : l'index reste aligné sur la version"""
+        self.client.get(self.url(self.target))
+        indexed = set(technology_index.projects)
+        with self.assertRaises(DatabaseError):
+            with transaction.atomic():
+                self.create("Fantôme", "Django, React", 1)
+                raise DatabaseError("annulation")
+        self.assertEqual(set(technology_index.projects), indexed)
+
+        # L'écriture d'un autre worker n'est pas masquée par la version annulée
+        ContentVersion.objects.filter(scope='project').update(version=F('version') + 1)
+        with self.settings(CONTENT_INDEX_CHECK_INTERVAL=0):
+            with mock.patch.object(
+                technology_index, 'load', wraps=technology_index.load
+            ) as load:
+                names = [row['name'] for row in self.client.get(self.url(self.target)).data['results']]
+        load.assert_called_once()
+        self.assertNotIn("Fantôme", names)
+
+
+class LoadTestCommandTest(LiveServerTestCase):
+    """Tests du générateur de charge contre un serveur local"""
+
+    def setUp(self):
+        cache.clear()
+        Service.objects.create(title="Service", description="Desc", icon="fas fa-code")
+
+    def test_parse_access_log(self):
+        lines = [
+            '127.0.0.1 - - [18/Oct/2026:10:00:00 +0000] "GET /api/services/ HTTP/1.1" 200 512',
+            '127.0.0.1 - - [18/Oct/2026:10:00:01 +0000] "POST /api/batch/ HTTP/1.1" 200 80',
+            '/api/projects/?page=2',
+            'ligne illisible',
+        ]
+        self.assertEqual(parse_access_log(lines), ['/api/services/', '/api/projects/?page=2'])
+
+    def test_weighted_mix_is_reproducible(self):
+        first = WeightedMix(random.Random(7), ['Django'], 2)
+        second = WeightedMix(random.Random(7), ['Django'], 2)
+        paths = [first() for _ in range(50)]
+        self.assertEqual(paths, [second() for _ in range(50)])
+        self.assertTrue(all(path.startswith('/api/') for path in paths))
+
+    def test_closed_loop_report(self):
+        out = io.StringIO()
+        call_command(
+            'loadtest', url=self.live_server_url, requests=12, concurrency=2,
+            seed=1, max_page=1, stdout=out,
+        )
+        report = out.getvalue()
+        self.assertIn("Requêtes       : 12", report)
+        self.assertIn("Taux d'erreur  : 0.00 %", report)
+        self.assertIn("Histogramme de latence", report)
+
+    def test_replay_at_target_rate(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        log_file = Path(directory.name) / 'access.log'
+        log_file.write_text('"GET /api/services/ HTTP/1.1"\n"GET /api/missing/ HTTP/1.1"\n')
+        out = io.StringIO()
+        call_command(
+            'loadtest', url=self.live_server_url, log=str(log_file),
+            requests=6, rps=50, stdout=out,
+        )
+        report = out.getvalue()
+        self.assertIn("Codes          : 200=3, 404=3", report)
+        self.assertIn("Réponses 4xx   : 3", report)
+
+    def test_requires_a_bound(self):
+        with self.assertRaises(CommandError):
+            call_command('loadtest', url=self.live_server_url)
+
+
+@override_settings(CONTENT_BULK_ACTIONS_ASYNC=False, CONTENT_BULK_ACTION_CHUNK_SIZE=3)
+class BulkActionTest(TestCase):
+    """Actions en masse de l'admin exécutées par lots"""
+
+    def setUp(self):
+        self.admin_user = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(self.admin_user)
+        self.testimonials = [
+            Testimonial.objects.create(
+                author=f"Auteur {i}", position="CEO", company="Corp",
+                content="Contenu", rating=5
+            )
+            for i in range(7)
+        ]
+
+    def version(self):
+        return ContentVersion.objects.get(scope='testimonial').version
+
+    def test_approve_action_runs_in_chunks_and_invalidates_once(self):
+        before = self.version()
+        response = self.client.post(
+            reverse('admin:content_testimonial_changelist'),
+            {'action': 'approve_testimonials', 'select_across': '1', 'index': '0',
+             '_selected_action': [self.testimonials[0].pk]},
+            follow=True,
+        )
+        self.assertContains(response, "7 témoignage(s) approuvé(s)")
+        self.assertEqual(Testimonial.objects.filter(is_approved=True).count(), 7)
+        job = BulkActionJob.objects.get()
+        self.assertEqual((job.status, job.processed, job.total), ('done', 7, 7))
+        self.assertEqual(job.created_by, self.admin_user)
+        self.assertEqual(self.version(), before + 1)
+
+    def test_interrupted_job_resumes_from_progress(self):
+        pks = sorted(t.pk for t in self.testimonials)
+        job = BulkActionJob.objects.create(
+            action='approve', object_ids=pks, total=len(pks), processed=3, status='failed'
+        )
+        job = run_bulk_action(job.pk)
+        self.assertEqual((job.status, job.processed), ('done', 7))
+        approved = set(Testimonial.objects.filter(is_approved=True).values_list('pk', flat=True))
+        self.assertEqual(approved, set(pks[3:]))
+
+    @override_settings(CONTENT_BULK_ACTIONS_ASYNC=True)
+    def test_async_job_runs_in_worker(self):
+        job = start_bulk_action('unapprove', [self.testimonials[0].pk], self.admin_user)
+        self.assertEqual(job.status, 'pending')
+        queued = BackgroundJob.objects.get(task='bulk_action')
+        self.assertEqual(queued.payload, {'job_id': job.pk})
+        call_command('run_worker', once=True, stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed), ('done', 1))
+        self.assertEqual(
+            set(BackgroundJob.objects.values_list('task', 'status')),
+            {('bulk_action', 'done'), ('warm_caches', 'done'), ('refresh_stats', 'done')},
+        )
+
+    @override_settings(CONTENT_BULK_ACTIONS_ASYNC=True, CONTENT_JOB_LOCK_TIMEOUT=60)
+    def test_resume_skips_jobs_still_running(self):
+        """Seules les tâches échouées ou au verrou expiré sont relancées"""
+        pks = sorted(t.pk for t in self.testimonials)
+        now = timezone.now()
+        jobs = {}
+        for name, status_, locked_at in [
+            ('failed', 'failed', None),
+            ('live', 'running', now),
+            ('stale', 'running', now - timedelta(minutes=5)),
+        ]:
+            jobs[name] = BulkActionJob.objects.create(
+                action='approve', object_ids=pks, total=len(pks), processed=3, status=status_
+            )
+            if locked_at:
+                BackgroundJob.objects.create(
+                    task='bulk_action', payload={'job_id': jobs[name].pk},
+                    dedup_key=f'bulk-action:{jobs[name].pk}', status='running',
+                    attempts=1, locked_at=locked_at, locked_by='vm:1', run_at=now,
+                )
+        response = self.client.post(
+            reverse('admin:content_bulkactionjob_changelist'),
+            {'action': 'resume_jobs',
+             '_selected_action': [job.pk for job in jobs.values()]},
+            follow=True,
+        )
+        self.assertContains(response, "2 tâche(s) relancée(s).")
+        queued = BackgroundJob.objects.filter(task='bulk_action', status='queued')
+        self.assertEqual(
+            sorted(job.payload['job_id'] for job in queued),
+            sorted([jobs['failed'].pk, jobs['stale'].pk]),
+        )
+        running = BackgroundJob.objects.filter(task='bulk_action', status='running')
+        self.assertEqual([job.payload['job_id'] for job in running], [jobs['live'].pk])
+
+    def test_job_progress_is_visible_in_admin(self):
+        BulkActionJob.objects.create(action='approve', total=10, processed=4, status='running')
+        response = self.client.get(reverse('admin:content_bulkactionjob_changelist'))
+        self.assertContains(response, '<progress value="40" max="100"></progress> 4 / 10', html=False)
+
+
+@override_settings(CONTENT_SINGLE_FLIGHT_ENABLED=False)
+class FragmentCacheTest(APITestCase):
+    """Listes assemblées à partir des fragments mis en cache par objet"""
+
+    def setUp(self):
+        cache.clear()
+        self.projects = [
+            Project.objects.create(
+                name=f"Projet {i}", description="Desc", image='projects/test_image.jpg',
+                technologies="Django, React", completion_date=date.today() - timedelta(days=i)
+            )
+            for i in range(4)
+        ]
+        self.url = reverse('content:project_list')
+
+    def serialized_ids(self):
+        """Identifiants sérialisés pendant une requête sur la liste"""
+        calls = []
+        original = ProjectSerializer.to_representation
+
+        def to_representation(serializer, obj):
+            calls.append(obj.pk)
+            return original(serializer, obj)
+
+        with mock.patch.object(ProjectSerializer, 'to_representation', to_representation):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return calls, response
+
+    def test_steady_state_serializes_nothing(self):
+        first, _ = self.serialized_ids()
+        self.assertEqual(len(first), 4)
+        with self.assertNumQueries(2):
+            second, response = self.serialized_ids()
+        self.assertEqual(second, [])
+        self.assertEqual(
+            [row['name'] for row in response.data['results']],
+            ["Projet 0", "Projet 1", "Projet 2", "Projet 3"]
+        )
+        self.assertTrue(response.data['results'][0]['image_url'].startswith('http://testserver/'))
+
+    def test_only_modified_object_is_serialized_again(self):
+        self.serialized_ids()
+        project = self.projects[2]
+        project.name = "Projet renommé"
+        project.save()
+        calls, response = self.serialized_ids()
+        self.assertEqual(calls, [project.pk])
+        self.assertEqual(response.data['results'][2]['name'], "Projet renommé")
+
+    def test_matches_plain_serialization(self):
+        with override_settings(CONTENT_FRAGMENT_CACHE_ENABLED=False):
+            plain = self.client.get(self.url).data
+        self.serialized_ids()
+        self.assertEqual(self.client.get(self.url).data, plain)
+
+    def test_deleted_rows_are_skipped(self):
+        rows = list(Project.objects.values_list('pk', 'updated_at'))
+        self.projects[0].delete()
+        data = render_fragments(ProjectSerializer, Project, rows)
+        self.assertEqual(len(data), 3)
+
+
+class DuplicateTestimonialTest(TestCase):
+    """Détection des témoignages quasi dupliqués (MinHash + LSH)"""
+
+    ORIGINAL = (
+        "L'équipe FIITECH a livré notre plateforme e-commerce en avance, avec un code "
+        "propre, une documentation complète et un suivi très réactif après la mise en production."
+    )
+
+    def create(self, content, author="Client"):
+        return Testimonial.objects.create(
+            author=author, position="CEO", company="Corp", content=content, rating=5
+        )
+
+    def test_signature_estimates_similarity(self):
+        edited = self.ORIGINAL.replace("très réactif", "vraiment réactif")
+        self.assertGreater(similarity(signature(self.ORIGINAL), signature(edited)), 0.6)
+        self.assertEqual(similarity(signature(self.ORIGINAL), signature(self.ORIGINAL.upper())), 1.0)
+        other = "Service correct mais délais de livraison trop longs pour notre projet mobile."
+        self.assertLess(similarity(signature(self.ORIGINAL), signature(other)), 0.2)
+
+    def test_lightly_edited_copy_is_flagged_on_save(self):
+        original = self.create(self.ORIGINAL)
+        self.create("Prestation honnête, rien à signaler de particulier sur ce projet.")
+        copy = self.create(self.ORIGINAL.replace("en avance", "à temps"), author="Copie")
+        copy.refresh_from_db()
+        original.refresh_from_db()
+        self.assertEqual(copy.suspected_duplicate_of_id, original.pk)
+        self.assertIsNone(original.suspected_duplicate_of_id)
+        self.assertEqual(TestimonialLSHBucket.objects.filter(testimonial=copy).count(), 16)
+
+        copy.content = "Texte entièrement réécrit sans rapport avec le témoignage d'origine."
+        copy.save()
+        copy.refresh_from_db()
+        self.assertIsNone(copy.suspected_duplicate_of_id)
+
+    def test_admin_filter_and_column(self):
+        get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        original = self.create(self.ORIGINAL)
+        copy = self.create(self.ORIGINAL + " Merci !", author="Copie")
+        response = self.client.get(
+            reverse('admin:content_testimonial_changelist'), {'duplicate': 'yes'}
+        )
+        self.assertContains(response, f"Doublon de n°{original.pk}")
+        self.assertEqual(list(response.context['cl'].result_list), [copy])
+
+    def test_cluster_command(self):
+        first = self.create(self.ORIGINAL)
+        second = self.create(self.ORIGINAL.replace("propre", "très propre"))
+        third = self.create(self.ORIGINAL + " Je recommande.")
+        self.create("Prestation honnête, rien à signaler de particulier sur ce projet.")
+        Testimonial.objects.update(minhash_signature=None, suspected_duplicate_of=None)
+        TestimonialLSHBucket.objects.all().delete()
+
+        out = io.StringIO()
+        call_command('cluster_testimonials', rebuild=True, update_flags=True, stdout=out)
+        self.assertIn("1 groupe(s), 2 doublon(s) suspecté(s).", out.getvalue())
+        self.assertEqual(
+            set(Testimonial.objects.filter(suspected_duplicate_of=first).values_list('pk', flat=True)),
+            {second.pk, third.pk}
+        )
+
+
+class SlowQueryLogTest(APITestCase):
+    """Journal des requêtes lentes et rapport par empreinte"""
+
+    def setUp(self):
+        cache.clear()
+        self.log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.log_dir.cleanup)
+        self.log_path = Path(self.log_dir.name) / 'slow.jsonl'
+        self.service = Service.objects.create(title="Service", description="Desc", icon="fa-1")
+
+    def test_records_view_frame_and_params(self):
+        with override_settings(
+            CONTENT_SLOW_QUERY_LOG_ENABLED=True, CONTENT_SLOW_QUERY_THRESHOLD_MS=0,
+            CONTENT_SLOW_QUERY_LOG=self.log_path, CONTENT_SLOW_QUERY_EXPLAIN_SAMPLE_RATE=1,
+        ), mock.patch.object(slow_query_logger, 'limiter', ExplainRateLimiter()):
+            self.client = self.client_class()
+            with connection.execute_wrapper(slow_query_logger):
+                response = self.client.get(reverse('content:service_list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entries = load_entries(self.log_path)
+        self.assertTrue(entries)
+        self.assertTrue(all(entry['view'] == 'content:service_list' for entry in entries))
+        self.assertTrue(any(entry['frame'].startswith('content/') for entry in entries))
+        # Paramètres propres au moteur (booléens en littéral sous PostgreSQL) :
+        # seul celui de la requête par identifiants est commun
+        self.assertTrue(any(entry['params'] == [self.service.pk] for entry in entries))
+        # EXPLAIN réservé à PostgreSQL
+        self.assertEqual(
+            any('explain' in entry for entry in entries), connection.vendor == 'postgresql'
+        )
+
+    def test_fast_queries_are_ignored(self):
+        with override_settings(CONTENT_SLOW_QUERY_THRESHOLD_MS=10_000, CONTENT_SLOW_QUERY_LOG=self.log_path):
+            with connection.execute_wrapper(slow_query_logger):
+                list(Service.objects.all())
+        self.assertFalse(self.log_path.exists())
+
+    def test_explain_rate_limit(self):
+        limiter = ExplainRateLimiter()
+        self.assertEqual([limiter.acquire(2) for _ in range(3)], [True, True, False])
+
+    def test_fingerprint_collapses_in_lists(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s) AND rating >= 4'),
+            'SELECT * FROM t WHERE id IN (...) AND rating >= ?'
+        )
+
+    def test_report_groups_by_fingerprint(self):
+        entries = [
+            {'fingerprint': 'SELECT A', 'duration_ms': 300, 'view': 'content:project_list',
+             'frame': 'content/views.py:10 in list', 'params': [1]},
+            {'fingerprint': 'SELECT A', 'duration_ms': 500, 'view': 'content:project_list',
+             'frame': 'content/views.py:10 in list', 'params': [2], 'explain': 'Seq Scan on t'},
+            {'fingerprint': 'SELECT B', 'duration_ms': 250, 'view': 'content:dashboard_stats',
+             'frame': None, 'params': []},
+        ]
+        self.log_path.write_text(''.join(json.dumps(entry) + '\n' for entry in entries))
+        out = io.StringIO()
+        call_command('slow_query_report', log=str(self.log_path), explain=True, stdout=out)
+        report = out.getvalue()
+        self.assertIn("3 requête(s) lente(s), 2 empreinte(s)", report)
+        self.assertLess(report.index("SELECT A"), report.index("SELECT B"))
+        self.assertIn("2x  total 800 ms", report)
+        self.assertIn("Paramètres (plus lente) : [2]", report)
+        self.assertIn("Seq Scan on t", report)
+
+
+class CompressedStaticFilesTest(TestCase):
+    """collectstatic compressé et service des fichiers statiques par l'application"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.TemporaryDirectory()
+        storages = {
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'staticfiles': {'BACKEND': 'content.staticfiles.CompressedManifestStaticFilesStorage'},
+        }
+        with override_settings(STATIC_ROOT=cls.static_root.name, STORAGES=storages):
+            call_command('collectstatic', interactive=False, verbosity=0)
+        manifest = json.loads((Path(cls.static_root.name) / 'staticfiles.json').read_text())
+        cls.css_name = manifest['paths']['admin/css/base.css']
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.static_root.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.index = StaticFilesIndex(root=self.static_root.name, prefix='/static/')
+        self.handler = StaticFilesWSGIHandler(self.fallback, index=self.index)
+
+    @staticmethod
+    def fallback(environ, start_response):
+        start_response('404 Not Found', [('Content-Type', 'text/plain')])
+        return [b'django']
+
+    def request(self, path, **headers):
+        environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path}
+        environ.update({f"HTTP_{name.upper()}": value for name, value in headers.items()})
+        captured = {}
+
+        def start_response(status_line, response_headers):
+            captured['status'] = int(status_line.split()[0])
+            captured['headers'] = dict(response_headers)
+
+        body = b''.join(self.handler(environ, start_response))
+        return captured['status'], captured['headers'], body
+
+    def test_collectstatic_writes_hashed_gzip_siblings(self):
+        root = Path(self.static_root.name)
+        self.assertRegex(self.css_name, r'^admin/css/base\.[0-9a-f]{12}\.css$')
+        original = (root / self.css_name).read_bytes()
+        self.assertEqual(gzip.decompress((root / (self.css_name + '.gz')).read_bytes()), original)
+        # Les images déjà compressées ne reçoivent pas de variante
+        self.assertFalse(list(root.glob('img/admin/*.gz')))
+
+    def test_negotiates_encoding_and_caches_forever(self):
+        url = '/static/' + self.css_name
+        status_code, headers, body = self.request(url, accept_encoding='br;q=0.5, gzip')
+        self.assertEqual(status_code, 200)
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(headers['Cache-Control'], 'public, max-age=31536000, immutable')
+        plain_status, plain_headers, plain = self.request(url, accept_encoding='gzip;q=0')
+        self.assertNotIn('Content-Encoding', plain_headers)
+        self.assertEqual(gzip.decompress(body), plain)
+        self.assertNotEqual(headers['ETag'], plain_headers['ETag'])
+
+        status_code, _, body = self.request(url, accept_encoding='gzip', if_none_match=headers['ETag'])
+        self.assertEqual((status_code, body), (304, b''))
+
+    def test_unhashed_copy_and_unknown_paths(self):
+        _, headers, _ = self.request('/static/admin/css/base.css')
+        self.assertEqual(headers['Cache-Control'], 'public, max-age=60')
+        self.assertEqual(self.request('/static/absent.css')[2], b'django')
+        self.assertEqual(self.request('/api/services/')[2], b'django')
+
+    def test_choose_encoding(self):
+        available = {None: 1, 'gzip': 1, 'br': 1}
+        self.assertEqual(choose_encoding('gzip, deflate, br', available), 'br')
+        self.assertEqual(choose_encoding('*;q=0.1, br;q=0', available), 'gzip')
+        self.assertIsNone(choose_encoding('identity', available))
+        self.assertIsNone(choose_encoding('br', {None: 1, 'gzip': 1}))
+
+    def test_asgi_handler(self):
+        handler = StaticFilesASGIHandler(None, index=self.index)
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': '/static/' + self.css_name,
+            'headers': [(b'accept-encoding', b'gzip')],
+        }
+        asyncio.run(handler(scope, None, send))
+        self.assertEqual(messages[0]['status'], 200)
+        self.assertIn((b'content-encoding', b'gzip'), messages[0]['headers'])
+        body = b''.join(message.get('body', b'') for message in messages[1:])
+        self.assertEqual(gzip.decompress(body), (Path(self.static_root.name) / self.css_name).read_bytes())
+
+
+class ServiceReorderTest(APITestCase):
+    """Réordonnancement des services en une seule instruction"""
+
+    def setUp(self):
+        cache.clear()
+        self.services = [
+            Service.objects.create(
+                title=f"Service {i}", description="Desc", icon="fa-1", display_order=i
+            )
+            for i in range(1, 5)
+        ]
+        self.admin_user = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.url = reverse('content:service_reorder')
+
+    def test_requires_admin(self):
+        response = self.client.post(self.url, {'order': [1]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_requires_change_permission(self):
+        staff = get_user_model().objects.create_user('staff', 'staff@example.com', 'password', is_staff=True)
+        self.client.force_authenticate(staff)
+        pks = [service.pk for service in self.services]
+        response = self.client.post(self.url, {'order': pks}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        staff.user_permissions.add(Permission.objects.get(codename='change_service'))
+        self.client.force_authenticate(get_user_model().objects.get(pk=staff.pk))
+        response = self.client.post(self.url, {'order': pks}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_single_update_and_single_invalidation(self):
+        self.client.force_authenticate(self.admin_user)
+        a, b, c, d = self.services
+        version = ContentVersion.objects.get(scope='service').version
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'order': [a.pk, c.pk, b.pk, d.pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'moved': 2})
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "content_service"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('CASE', updates[0])
+        self.assertEqual(
+            list(Service.objects.order_by('display_order').values_list('pk', flat=True)),
+            [a.pk, c.pk, b.pk, d.pk]
+        )
+        self.assertEqual(ContentVersion.objects.get(scope='service').version, version + 1)
+        # Services non déplacés : updated_at inchangé
+        a_before = a.updated_at
+        a.refresh_from_db()
+        self.assertEqual(a.updated_at, a_before)
+
+    def test_incomplete_or_duplicate_ordering_is_rejected(self):
+        self.client.force_authenticate(self.admin_user)
+        pks = [service.pk for service in self.services]
+        for order in (pks[:3], pks + [pks[0]], pks[:3] + [999], 'abc'):
+            response = self.client.post(self.url, {'order': order}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, pks, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            list(Service.objects.order_by('display_order').values_list('pk', flat=True)), pks
+        )
+
+    def test_admin_drag_and_drop_view(self):
+        self.client.force_login(self.admin_user)
+        url = reverse('admin:content_service_reorder')
+        response = self.client.get(url)
+        self.assertContains(response, 'draggable="true"', count=4)
+        self.assertContains(self.client.get(reverse('admin:content_service_changelist')), url)
+
+        order = ','.join(str(service.pk) for service in reversed(self.services))
+        response = self.client.post(url, {'order': order})
+        self.assertRedirects(response, reverse('admin:content_service_changelist'))
+        self.assertEqual(
+            list(Service.objects.order_by('display_order').values_list('pk', flat=True)),
+            [service.pk for service in reversed(self.services)]
+        )
+
+
+class RandomTestimonialsTest(APITestCase):
+    """Tirage aléatoire de témoignages à partir des bandes de notes en mémoire"""
+
+    def setUp(self):
+        rating_band_index.reset()
+        self.addCleanup(rating_band_index.reset)
+        self.url = reverse('content:testimonial_random')
+        self.testimonials = [
+            Testimonial.objects.create(
+                author=f"Auteur {i}", position="CEO", company="Corp",
+                content="Contenu", rating=i % 5 + 1, is_approved=i != 9
+            )
+            for i in range(10)
+        ]
+
+    def test_draws_distinct_testimonials_above_min_rating(self):
+        response = self.client.get(self.url, {'count': 3, 'min_rating': 4})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(len({row['id'] for row in response.data}), 3)
+        self.assertTrue(all(row['rating'] >= 4 for row in response.data))
+
+    def test_count_is_capped_by_available_rows(self):
+        # Notes 5 : i = 4 (approuvé) et i = 9 (non approuvé)
+        response = self.client.get(self.url, {'count': 10, 'min_rating': 5})
+        self.assertEqual([row['author'] for row in response.data], ["Auteur 4"])
+
+    def test_seed_is_reproducible(self):
+        first = self.client.get(self.url, {'count': 5, 'seed': 42}).data
+        second = self.client.get(self.url, {'count': 5, 'seed': 42}).data
+        self.assertEqual([row['id'] for row in first], [row['id'] for row in second])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.client.get(self.url)  # Chargement de l'index
+        hidden = self.testimonials[4]
+        hidden.is_approved = False
+        hidden.save()
+        self.testimonials[3].delete()
+        response = self.client.get(self.url, {'count': 20, 'min_rating': 4})
+        self.assertEqual([row['author'] for row in response.data], ["Auteur 8"])
+
+
+class ProjectFacetsTest(APITestCase):
+    """Facettes technologies / années maintenues de façon incrémentale"""
+
+    def setUp(self):
+        technology_index.reset()
+        self.addCleanup(technology_index.reset)
+        self.url = reverse('content:project_facets')
+        self.create("A", "Django, React", date(2024, 3, 1))
+        self.create("B", "Django, PostgreSQL", date(2024, 6, 1))
+        self.create("C", "React, React Native", date(2023, 1, 1))
+
+    def create(self, name, technologies, completion_date):
+        return Project.objects.create(
+            name=name, description="Desc", technologies=technologies,
+            completion_date=completion_date
+        )
+
+    def counts(self, data):
+        return (
+            {item['name']: item['count'] for item in data['technologies']},
+            {item['year']: item['count'] for item in data['years']},
+        )
+
+    def expected(self, technology=None):
+        """Facettes recalculées naïvement à partir de la base"""
+        projects = Project.objects.all()
+        if technology:
+            projects = projects.filter(technologies__icontains=technology)
+        techs, years = Counter(), Counter()
+        for project in projects:
+            techs.update(project.technologies_list)
+            years[project.completion_date.year] += 1
+        return dict(techs), dict(years)
+
+    def test_unfiltered_and_filtered_counts(self):
+        data = self.client.get(self.url).data
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(self.counts(data), self.expected())
+        self.assertEqual(data['technologies'][0], {'name': 'Django', 'count': 2})
+        for technology in ('django', 'postgres', 'react', 'native', 'go, react', ' react', 'django,'):
+            data = self.client.get(self.url, {'technology': technology}).data
+            self.assertEqual(self.counts(data), self.expected(technology), technology)
+
+    def test_single_technology_reads_aggregates_without_queries(self):
+        self.client.get(self.url)
+        with override_settings(CONTENT_INDEX_CHECK_INTERVAL=3600):
+            with self.assertNumQueries(0):
+                data = self.client.get(self.url, {'technology': 'postgresql'}).data
+        self.assertEqual(self.counts(data), ({'Django': 1, 'PostgreSQL': 1}, {2024: 1}))
+
+    def test_aggregates_follow_saves_and_deletes(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.get(name="A")
+            project.technologies = "Vue"
+            project.completion_date = date(2022, 5, 1)
+            project.save()
+            Project.objects.get(name="C").delete()
+        self.assertEqual(self.counts(self.client.get(self.url).data), self.expected())
+        self.assertEqual(
+            self.counts(self.client.get(self.url, {'technology': 'react'}).data), ({}, {})
+        )
+
+
+class AutocompleteTest(APITestCase):
+    """Suggestions servies par les index de préfixes en mémoire"""
+
+    def setUp(self):
+        technology_index.reset()
+        company_index.reset()
+        self.addCleanup(technology_index.reset)
+        self.addCleanup(company_index.reset)
+        self.url = reverse('content:autocomplete')
+        for name, technologies in [("A", "Django, React"), ("B", "Django, Docker"), ("C", "Dart")]:
+            Project.objects.create(
+                name=name, description="Desc", technologies=technologies,
+                completion_date=date(2024, 1, 1)
+            )
+        for company, approved in [("Énergie SA", True), ("Elan", True), ("Elan", True), ("Edf", False)]:
+            Testimonial.objects.create(
+                author="Auteur", position="CEO", company=company,
+                content="Contenu", rating=5, is_approved=approved
+            )
+
+    def suggestions(self, field, prefix, **params):
+        response = self.client.get(self.url, {'field': field, 'prefix': prefix, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item['value'], item['count']) for item in response.data['suggestions']]
+
+    def test_prefix_ranked_by_frequency(self):
+        self.assertEqual(
+            self.suggestions('technology', 'd'), [('Django', 2), ('Dart', 1), ('Docker', 1)]
+        )
+        self.assertEqual(self.suggestions('technology', 'DJ'), [('Django', 2)])
+        self.assertEqual(self.suggestions('technology', 'd', limit=1), [('Django', 2)])
+        self.assertEqual(self.suggestions('technology', 'x'), [])
+
+    def test_companies_ignore_accents_and_unapproved(self):
+        self.assertEqual(self.suggestions('company', 'e'), [('Elan', 2), ('Énergie SA', 1)])
+        self.assertEqual(self.suggestions('company', 'ener'), [('Énergie SA', 1)])
+
+    def test_index_follows_saves_without_queries_per_keystroke(self):
+        self.suggestions('technology', 'd')
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.get(name="C").delete()
+            project = Project.objects.get(name="A")
+            project.technologies = "Deno"
+            project.save()
+        self.assertEqual(self.suggestions('technology', 'd'), [('Deno', 1), ('Django', 1), ('Docker', 1)])
+        with override_settings(CONTENT_INDEX_CHECK_INTERVAL=3600):
+            with self.assertNumQueries(0):
+                self.suggestions('technology', 'do')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            testimonial = Testimonial.objects.get(company="Edf")
+            testimonial.is_approved = True
+            testimonial.save()
+        self.assertEqual(self.suggestions('company', 'ed'), [('Edf', 1)])
+
+    def test_unknown_field_rejected(self):
+        response = self.client.get(self.url, {'field': 'author', 'prefix': 'a'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_prefix_index_removes_values(self):
+        index = PrefixIndex()
+        for value in ["Go", "Go", "Golang"]:
+            index.add(value)
+        index.remove("go")
+        index.remove("Golang")
+        self.assertEqual(index.keys, ['go'])
+        self.assertEqual(index.complete('g', 5), [('Go', 1)])
+
+
+@override_settings(
+    CONTENT_STATEMENT_TIMEOUT_PUBLIC_MS=2000,
+    CONTENT_STATEMENT_TIMEOUT_ADMIN_MS=30000,
+    CONTENT_STATEMENT_TIMEOUT_MS=5000,
+)
+class StatementTimeoutTest(TestCase):
+    """Choix de la limite par vue et pose paresseuse de statement_timeout"""
+
+    def timeout(self, method, path, view_func=None):
+        request = getattr(RequestFactory(), method)(path)
+        request.resolver_match = resolve(path)
+        return timeout_for(request, view_func or request.resolver_match.func)
+
+    def test_public_admin_and_default_limits(self):
+        self.assertEqual(self.timeout('get', reverse('content:project_list')), 2000)
+        self.assertEqual(self.timeout('get', reverse('admin:content_project_changelist')), 30000)
+        self.assertEqual(self.timeout('post', reverse('content:testimonial_list')), 5000)
+
+    def test_view_override(self):
+        view = statement_timeout(10000)(lambda request: None)
+        self.assertEqual(self.timeout('get', reverse('content:project_list'), view), 10000)
+        self.assertIsNone(self.timeout('get', reverse('content:project_list'), statement_timeout(0)(lambda r: None)))
+
+    def test_set_issued_once_after_view_resolution(self):
+        raw = mock.Mock()
+        context = {'cursor': mock.Mock(cursor=raw)}
+        execute = mock.Mock(return_value='ok')
+        wrapper = StatementTimeout(mock.Mock(in_atomic_block=False))
+        wrapper(execute, 'SELECT 1', None, False, context)
+        raw.execute.assert_not_called()
+        wrapper.milliseconds = 2000
+        self.assertEqual(wrapper(execute, 'SELECT 1', None, False, context), 'ok')
+        wrapper(execute, 'SELECT 2', None, False, context)
+        raw.execute.assert_called_once_with('SET statement_timeout = 2000')
+        self.assertEqual(execute.call_count, 3)
+
+    def test_set_reissued_after_rollback(self):
+        raw = mock.Mock()
+        context = {'cursor': mock.Mock(cursor=raw)}
+        execute = mock.Mock()
+        connection = mock.Mock(in_atomic_block=True, run_on_commit=[])
+        connection.on_commit.side_effect = lambda func: connection.run_on_commit.append((set(), func, False))
+        wrapper = StatementTimeout(connection, 2000)
+        wrapper(execute, 'SELECT 1', None, False, context)
+        wrapper(execute, 'SELECT 2', None, False, context)
+        self.assertEqual(raw.execute.call_count, 1)
+        # Retour arrière : le SET et son callback sont abandonnés
+        connection.run_on_commit.clear()
+        wrapper(execute, 'SELECT 3', None, False, context)
+        self.assertEqual(raw.execute.call_count, 2)
+        # Validation : le SET reste acquis hors de la transaction
+        connection.run_on_commit.pop()[1]()
+        connection.in_atomic_block = False
+        wrapper(execute, 'SELECT 4', None, False, context)
+        self.assertEqual(raw.execute.call_count, 2)
+
+    @skipUnless(connection.vendor == 'postgresql', "statement_timeout propre à PostgreSQL")
+    def test_reset_is_not_counted_as_a_view_query(self):
+        """Le RESET de fin de requête ne passe pas par les curseurs comptés"""
+        Service.objects.create(title="Service", description="Desc", icon="fa")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('content:service_list'))
+        self.assertFalse([q for q in queries if 'statement_timeout' in q['sql']])
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            self.assertEqual(cursor.fetchone()[0], '0')
+
+
+class DatabaseCommandsTest(TestCase):
+    """Export en flux et comparaison des modes de connexion"""
+
+    def test_export_content_csv_and_jsonl(self):
+        for i in range(3):
+            Service.objects.create(title=f"Service {i}", description="Desc", icon="fa", display_order=i)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'services.csv'
+            call_command('export_content', 'services', output=str(path), chunk_size=2, stderr=io.StringIO())
+            lines = path.read_text(encoding='utf-8').splitlines()
+            self.assertEqual(len(lines), 4)
+            self.assertIn('title', lines[0])
+
+            path = Path(directory) / 'testimonials.jsonl'
+            Testimonial.objects.create(
+                author="Auteur", position="CEO", company="Corp", content="Contenu", rating=5
+            )
+            call_command('export_content', 'testimonials', format='jsonl', output=str(path), stderr=io.StringIO())
+            row = json.loads(path.read_text(encoding='utf-8'))
+            self.assertEqual(row['company'], "Corp")
+            self.assertNotIn('minhash_signature', row)
+
+    def test_db_benchmark_reports_both_modes(self):
+        out = io.StringIO()
+        call_command('db_benchmark', iterations=5, stdout=out)
+        output = out.getvalue()
+        self.assertIn('nouvelle connexion', output)
+        self.assertIn('configuration courante', output)
+        self.assertIn('Gain sur p50', output)
+
+
+@override_settings(CONTENT_JOB_BACKOFF_BASE=10, CONTENT_JOB_BACKOFF_MAX=3600)
+class BackgroundJobTest(TestCase):
+    """File de tâches de fond en base et commande run_worker"""
+
+    def setUp(self):
+        self.calls = []
+        self.failures = 0
+        patcher = mock.patch.dict(TASKS, {'record': self.record, 'flaky': self.flaky})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record(self, value=None):
+        self.calls.append(value)
+
+    def flaky(self):
+        self.failures += 1
+        raise ValueError("indisponible")
+
+    def test_dedup_key_joins_the_queued_job(self):
+        first = enqueue('record', {'value': 1}, dedup_key='k')
+        self.assertEqual(enqueue('record', {'value': 2}, dedup_key='k').pk, first.pk)
+        self.assertEqual(claim('w').pk, first.pk)
+        # La tâche en cours ne compte plus : une nouvelle demande est mise en file
+        self.assertNotEqual(enqueue('record', dedup_key='k').pk, first.pk)
+        with self.assertRaises(ValueError):
+            enqueue('inconnue')
+
+    def test_worker_runs_due_jobs_in_order(self):
+        enqueue('record', {'value': 'b'})
+        enqueue('record', {'value': 'later'}, delay=3600)
+        BackgroundJob.objects.filter(pk=enqueue('record', {'value': 'a'}).pk).update(
+            run_at=timezone.now() - timedelta(minutes=1)
+        )
+        out = io.StringIO()
+        call_command('run_worker', once=True, stdout=out)
+        self.assertEqual(self.calls, ['a', 'b'])
+        self.assertIn("2 tâche(s) exécutée(s)", out.getvalue())
+        self.assertEqual(BackgroundJob.objects.filter(status='done').count(), 2)
+
+    def test_failures_retry_with_backoff_then_fail(self):
+        job = enqueue('flaky', max_attempts=2)
+        before = timezone.now()
+        with self.assertLogs('content.jobs', 'ERROR'):
+            self.assertTrue(run_next('w'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('queued', 1))
+        self.assertIn("ValueError: indisponible", job.last_error)
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=5))
+        self.assertFalse(run_next('w'))  # pas encore échue
+
+        BackgroundJob.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs('content.jobs', 'ERROR'):
+            self.assertTrue(run_next('w'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, self.failures), ('failed', 2, 2))
+
+    def test_backoff_grows_and_is_capped(self):
+        for attempts, delay in [(1, 10), (3, 40), (20, 3600)]:
+            value = backoff_delay(attempts)
+            self.assertTrue(delay / 2 <= value <= delay, (attempts, value))
+
+    @override_settings(CONTENT_JOB_LOCK_TIMEOUT=60)
+    def test_job_of_a_dead_worker_is_taken_over(self):
+        job = enqueue('record', {'value': 'x'})
+        claim('mort')
+        BackgroundJob.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(minutes=5))
+        self.assertTrue(run_next('vivant'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), ('done', 2, 'vivant'))
+
+    @override_settings(CONTENT_JOB_LOCK_TIMEOUT=60)
+    def test_heartbeat_keeps_a_long_job_from_being_taken_over(self):
+        def long_task():
+            BackgroundJob.objects.filter(task='long').update(locked_at=timezone.now() - timedelta(minutes=5))
+            heartbeat()
+            self.calls.append(claim('autre'))
+
+        TASKS['long'] = long_task
+        job = enqueue('long')
+        self.assertTrue(run_next('w'))
+        self.assertEqual(self.calls, [None])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('done', 1))
+        heartbeat()  # hors d'une tâche : sans effet
+
+    def test_new_project_image_is_processed_by_worker(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        buffer = io.BytesIO()
+        Image.new('RGB', (1200, 600), color='blue').save(buffer, format='JPEG')
+        with self.settings(MEDIA_ROOT=media_root.name, CONTENT_IMAGE_VARIANT_WIDTHS=(480, 2000)):
+            project = Project.objects.create(
+                name="Projet", description="Desc", technologies="Django",
+                completion_date=date.today(),
+                image=SimpleUploadedFile('photo.jpg', buffer.getvalue(), 'image/jpeg'),
+            )
+            project.save()  # image déjà enregistrée : pas de nouvelle tâche
+            self.assertEqual(BackgroundJob.objects.filter(task='process_project_image').count(), 1)
+            call_command('run_worker', once=True, stdout=io.StringIO())
+            project.refresh_from_db()
+            self.assertEqual(sorted(project.image_variants), ['1200', '480'])
+            with Image.open(Path(media_root.name) / project.image_variants['480']) as variant:
+                self.assertEqual((variant.format, variant.size), ('WEBP', (480, 240)))
+            self.assertEqual(
+                ProjectSerializer(project).data['image_variants'],
+                {width: f"/media/{name}" for width, name in project.image_variants.items()},
+            )
+
+
+@override_settings(CONTENT_UPLOAD_MAX_CHUNK_SIZE=1024)
+class ChunkedImageUploadTest(APITestCase):
+    """Envoi d'image par morceaux, reprise, vérification et rattachement"""
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.media_root = Path(media_root.name)
+        settings_override = self.settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.admin_user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.admin_user)
+        buffer = io.BytesIO()
+        Image.effect_noise((64, 64), 80).convert('RGB').save(buffer, format='PNG')
+        self.data = buffer.getvalue()
+        self.assertGreater(len(self.data), 2048)
+        self.project = Project.objects.create(
+            name="Projet", description="Desc", technologies="Django", completion_date=date.today()
+        )
+
+    def start(self, checksum=None):
+        response = self.client.post(reverse('content:image_upload_create'), {
+            'filename': '../photo finale.png', 'size': len(self.data),
+            'checksum': checksum or hashlib.sha256(self.data).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id']
+
+    def send(self, upload_id, offset, chunk):
+        return self.client.generic(
+            'PATCH', reverse('content:image_upload_detail', args=[upload_id]), chunk,
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def send_all(self, upload_id):
+        for offset in range(0, len(self.data), 1024):
+            self.assertEqual(self.send(upload_id, offset, self.data[offset:offset + 1024]).status_code, 200)
+
+    def complete(self, upload_id, project=None):
+        return self.client.post(
+            reverse('content:image_upload_complete', args=[upload_id]),
+            {'project': (project or self.project).pk}, format='json'
+        )
+
+    def test_resumable_upload_is_attached_without_copy(self):
+        upload_id = self.start()
+        self.send(upload_id, 0, self.data[:1024])
+        # Morceau renvoyé à une position périmée : le serveur indique où reprendre
+        response = self.send(upload_id, 0, self.data[:1024])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response['Upload-Offset'], '1024')
+        state = self.client.get(reverse('content:image_upload_detail', args=[upload_id])).data
+        self.assertEqual(state['offset'], 1024)
+
+        for offset in range(1024, len(self.data), 1024):
+            self.send(upload_id, offset, self.data[offset:offset + 1024])
+        partial = self.media_root / 'uploads' / 'partial' / upload_id
+        inode = partial.stat().st_ino
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.complete(upload_id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.project.refresh_from_db()
+        self.assertTrue(self.project.image.name.startswith('projects/photo_finale'))
+        final = self.media_root / self.project.image.name
+        self.assertEqual(final.read_bytes(), self.data)
+        self.assertEqual(final.stat().st_ino, inode)
+        self.assertFalse(partial.exists())
+        self.assertEqual(ImageUpload.objects.get(pk=upload_id).status, 'attached')
+        self.assertTrue(BackgroundJob.objects.filter(task='process_project_image', status='queued').exists())
+        self.assertEqual(self.complete(upload_id).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_checksum_and_size_are_verified(self):
+        upload_id = self.start(checksum='0' * 64)
+        self.send(upload_id, 0, self.data[:1024])
+        response = self.complete(upload_id)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        for offset in range(1024, len(self.data), 1024):
+            self.send(upload_id, offset, self.data[offset:offset + 1024])
+        response = self.complete(upload_id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("SHA-256", response.data['detail'])
+        self.project.refresh_from_db()
+        self.assertFalse(self.project.image)
+
+        big = self.send(upload_id, len(self.data), b'x' * 2048)
+        self.assertEqual(big.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_only_and_extension_checked(self):
+        response = self.client.post(reverse('content:image_upload_create'), {
+            'filename': 'script.js', 'size': 10, 'checksum': '0' * 64,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.logout()
+        response = self.client.post(reverse('content:image_upload_create'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_admin_form_attaches_chunked_upload(self):
+        upload_id = self.start()
+        self.send_all(upload_id)
+        response = self.client.post(reverse('admin:content_project_add'), {
+            'name': "Nouveau", 'description': "Desc", 'technologies': "Vue",
+            'completion_date': date.today().isoformat(), 'chunked_upload': upload_id,
+        })
+        self.assertEqual(response.status_code, 302)
+        project = Project.objects.get(name="Nouveau")
+        self.assertEqual((self.media_root / project.image.name).read_bytes(), self.data)
+
+    def test_admin_form_rejects_invalid_upload_without_saving(self):
+        upload_id = self.start(checksum='0' * 64)
+        self.send_all(upload_id)
+        response = self.client.post(reverse('admin:content_project_add'), {
+            'name': "Nouveau", 'description': "Desc", 'technologies': "Vue",
+            'completion_date': date.today().isoformat(), 'chunked_upload': upload_id,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "SHA-256")
+        self.assertFalse(Project.objects.filter(name="Nouveau").exists())
+
+    def test_name_taken_concurrently_is_not_overwritten(self):
+        upload_id = self.start()
+        self.send_all(upload_id)
+        taken = self.media_root / 'projects' / 'pris.png'
+        taken.parent.mkdir(parents=True, exist_ok=True)
+        taken.write_bytes(b'autre envoi')
+        # Nom libre au moment du choix, pris par un autre envoi avant le lien
+        with mock.patch(
+            'django.core.files.storage.FileSystemStorage.get_available_name',
+            side_effect=['projects/pris.png', 'projects/libre.png'],
+        ):
+            response = self.complete(upload_id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(taken.read_bytes(), b'autre envoi')
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.image.name, 'projects/libre.png')
+
+    def test_abandoned_uploads_are_purged(self):
+        upload_id = self.start()
+        ImageUpload.objects.filter(pk=upload_id).update(updated_at=timezone.now() - timedelta(days=2))
+        self.assertEqual(purge_stale_uploads(), 1)
+        self.assertFalse((self.media_root / 'uploads' / 'partial' / upload_id).exists())
+
+
+class SurrogateKeyTest(APITestCase):
+    """En-têtes Surrogate-Key / Cache-Tag et purge ciblée du cache partagé"""
+
+    def setUp(self):
+        # Versions du contenu remises à zéro entre les tests : résultats en cache périmés
+        cache.clear()
+        self.service = Service.objects.create(title="Web", description="D", icon="fas fa-code")
+        self.project = Project.objects.create(
+            name="Site", description="D", technologies="Django", completion_date=date.today()
+        )
+        self.testimonial = Testimonial.objects.create(
+            author="Alice", position="CTO", company="Acme", content="Bien", rating=5, is_approved=True
+        )
+        reset_purger()
+        self.addCleanup(reset_purger)
+
+    def purging(self, stub, **extra):
+        reset_purger()
+        return override_settings(
+            CONTENT_PURGER_BACKEND='content.surrogate_keys.HTTPPurger',
+            CONTENT_PURGER_URL=stub.url, **extra
+        )
+
+    def test_list_and_stats_responses_are_tagged(self):
+        response = self.client.get(reverse('content:project_list'))
+        self.assertEqual(response['Surrogate-Key'], f"project project:{self.project.pk}")
+        self.assertEqual(response['Cache-Tag'], f"project,project:{self.project.pk}")
+
+        response = self.client.get(reverse('content:project_similar', kwargs={'pk': self.project.pk}))
+        self.assertEqual(response['Surrogate-Key'], f"project:{self.project.pk} project")
+
+        response = self.client.get(reverse('content:dashboard_stats'))
+        self.assertEqual(response['Surrogate-Key'], "service project testimonial")
+
+        with override_settings(CONTENT_SURROGATE_KEY_PREFIX='fiitech-'):
+            response = self.client.get(reverse('content:testimonial_random'))
+        self.assertEqual(
+            response['Surrogate-Key'], f"fiitech-testimonial fiitech-testimonial:{self.testimonial.pk}"
+        )
+
+    def test_errors_and_writes_are_not_tagged(self):
+        response = self.client.get(reverse('content:autocomplete'), {'field': 'inconnu'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn('Surrogate-Key', response)
+        response = self.client.post(reverse('content:testimonial_list'), {}, format='json')
+        self.assertNotIn('Surrogate-Key', response)
+
+    def test_display_only_change_purges_the_object_only(self):
+        with PurgeStubServer() as stub, self.purging(stub):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.project.description = "Nouvelle description"
+                self.project.save()
+            self.assertEqual(stub.tags, [f"project:{self.project.pk}"])
+
+            service_pk = self.service.pk
+            with self.captureOnCommitCallbacks(execute=True):
+                self.project.name = "Autre nom"
+                self.project.save()
+                self.service.delete()
+            # Une seule purge par transaction, des seules clés de collection
+            self.assertEqual(len(stub.requests), 2)
+            self.assertEqual(sorted(stub.requests[1]['tags']), ['project', 'service'])
+            self.assertNotIn(f"service:{service_pk}", stub.tags)
+            self.assertEqual(stub.requests[1]['headers']['Content-Type'], 'application/json')
+
+    def test_rolled_back_change_does_not_block_later_purges(self):
+        with PurgeStubServer() as stub, self.purging(stub):
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        mark_changed(Service, [self.service.pk])
+                        raise DatabaseError("retour arrière")
+                except DatabaseError:
+                    pass
+                mark_changed(Project, [self.project.pk], lists=False)
+            self.assertEqual(stub.tags, [f"project:{self.project.pk}"])
+
+    def test_bulk_action_purges_the_collection_once(self):
+        """Une action en masse purge la seule clé de collection, en un appel"""
+        others = [
+            Testimonial.objects.create(author=f"A{i}", position="P", company="C", content="C", rating=4)
+            for i in range(4)
+        ]
+        pks = sorted(t.pk for t in others + [self.testimonial])
+        job = BulkActionJob.objects.create(action='unapprove', object_ids=pks, total=len(pks))
+        with PurgeStubServer() as stub, self.purging(stub, CONTENT_PURGER_BATCH_SIZE=2):
+            with self.captureOnCommitCallbacks(execute=True):
+                run_bulk_action(job.pk)
+            self.assertEqual(len(stub.requests), 1)
+            self.assertEqual(stub.tags, ['testimonial'])
+            self.assertEqual(stub.requests[0]['headers']['Surrogate-Key'], 'testimonial')
+
+    def test_failed_purge_is_retried_by_the_worker(self):
+        with PurgeStubServer(status=500) as stub, self.purging(stub, CONTENT_PURGER_TOKEN='secret'):
+            with self.assertLogs('content.surrogate_keys', 'WARNING'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    Testimonial.objects.filter(pk=self.testimonial.pk).update(
+                        is_approved=False, updated_at=timezone.now()
+                    )
+                    mark_changed(Testimonial, [self.testimonial.pk])
+            job = BackgroundJob.objects.get(task='purge_surrogate_keys')
+            self.assertEqual(job.payload, {'keys': ['testimonial']})
+            self.assertEqual(stub.requests[0]['headers']['Authorization'], 'Bearer secret')
+
+            stub.status = 200
+            call_command('run_worker', once=True, stdout=io.StringIO())
+            job.refresh_from_db()
+            self.assertEqual(job.status, 'done')
+            self.assertEqual(len(stub.requests), 2)
+
+    def test_no_purge_without_backend(self):
+        with mock.patch('content.surrogate_keys.HTTPPurger.purge') as purge:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.service.save()
+        purge.assert_not_called()
+
+
+@skipUnless(msgpack, "paquet msgpack non installé")
+class MessagePackTest(APITestCase):
+    """Négociation du format MessagePack et encodage natif des dates"""
+
+    def setUp(self):
+        # Versions du contenu remises à zéro entre les tests : résultats en cache périmés
+        cache.clear()
+        self.project = Project.objects.create(
+            name="Site", description="D", technologies="Django", completion_date=date(2024, 5, 17)
+        )
+        self.testimonial = Testimonial.objects.create(
+            author="Alice", position="CTO", company="Acme", content="Bien", rating=5, is_approved=True
+        )
+
+    def test_format_parameter_and_accept_header(self):
+        response = self.client.get(reverse('content:project_list'), {'format': 'msgpack'})
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        data = msgpack.unpackb(response.content, timestamp=3)
+        self.assertEqual(data['results'][0]['name'], "Site")
+        self.assertEqual(data['results'][0]['completion_date'], '2024-05-17')
+
+        response = self.client.get(reverse('content:testimonial_list'), HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        data = msgpack.unpackb(response.content, timestamp=3)
+        self.assertEqual(data['results'][0]['created_at'], self.testimonial.created_at)
+
+    def test_json_dates_unchanged(self):
+        response = self.client.get(reverse('content:testimonial_list'))
+        expected = self.testimonial.created_at.isoformat().replace('+00:00', 'Z')
+        self.assertEqual(response.json()['results'][0]['created_at'], expected)
+
+    def test_msgpack_request_body(self):
+        spool = tempfile.TemporaryDirectory()
+        self.addCleanup(spool.cleanup)
+        # Spool temporaire, sans vidage différé : aucun thread ne survit au test
+        override = self.settings(CONTENT_TESTIMONIAL_SPOOL_DIR=Path(spool.name), CONTENT_TESTIMONIAL_FLUSH_INTERVAL=0)
+        override.enable()
+        self.addCleanup(override.disable)
+        body = msgpack.packb({
+            'author': "Bob", 'position': "Dev", 'company': "Corp", 'content': "Très bien", 'rating': 4,
+        })
+        response = self.client.post(
+            reverse('content:testimonial_list'), body, content_type='application/msgpack'
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        response = self.client.post(
+            reverse('content:testimonial_list'), b'\xc1', content_type='application/msgpack'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_render_benchmark_command(self):
+        out = io.StringIO()
+        call_command('render_benchmark', iterations=2, stdout=out)
+        self.assertIn("msgpack", out.getvalue())
+        self.assertIn("plus léger", out.getvalue())
+
+
+@override_settings(CONTENT_INDEX_CHECK_INTERVAL=3600)
+class SingleFlightTest(APITestCase):
+    """Un seul calcul simultané par clé, dans un worker et entre workers"""
+
+    def setUp(self):
+        cache.clear()
+        # Versions relues à la première requête du test, puis plus avant la fin
+        version_check.reset()
+        self.addCleanup(version_check.reset)
+
+    def test_concurrent_callers_share_one_computation(self):
+        calls = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return {'value': 42}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(single_flight('k:1', compute)))
+        leader.start()
+        started.wait(1)
+        followers = [
+            threading.Thread(target=lambda: results.append(single_flight('k:1', compute)))
+            for _ in range(5)
+        ]
+        for thread in followers:
+            thread.start()
+        for thread in [leader] + followers:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [({'value': 42}, False)] * 6)
+        # Résultat mis en cache : plus aucun calcul
+        self.assertEqual(single_flight('k:1', compute), ({'value': 42}, False))
+        self.assertEqual(len(calls), 1)
+
+    def test_waiting_callers_get_their_own_exception(self):
+        started = threading.Event()
+        errors = []
+
+        def compute():
+            started.set()
+            time.sleep(0.2)
+            raise ValueError("panne")
+
+        def call():
+            try:
+                single_flight('k:5', compute)
+            except ValueError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call)]
+        threads[0].start()
+        started.wait(1)
+        threads += [threading.Thread(target=call) for _ in range(2)]
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Ordre d'arrivée quelconque : l'originale est celle sans cause
+        [leader] = [error for error in errors if error.__cause__ is None]
+        followers = [error for error in errors if error is not leader]
+        self.assertEqual(len(followers), 2)
+        self.assertIsNot(followers[0], followers[1])
+        for error in followers:
+            self.assertIsNot(error, leader)
+            self.assertIs(error.__cause__, leader)
+            self.assertEqual(str(error), "panne")
+
+    @override_settings(CONTENT_SINGLE_FLIGHT_WAIT=0.2)
+    def test_other_worker_holding_the_lock(self):
+        # Sans valeur précédente : attente du résultat, puis calcul
+        cache.add('content:flight:k:2:lock', 'autre-worker', 30)
+        self.assertEqual(single_flight('k:2', lambda: 'calculé', stale_key='k'), ('calculé', False))
+        # Avec une valeur précédente : servie, marquée périmée
+        self.assertEqual(single_flight('k:3', lambda: 'nouveau', stale_key='k'), ('nouveau', False))
+        cache.add('content:flight:k:4:lock', 'autre-worker', 30)
+        self.assertEqual(single_flight('k:4', lambda: 'nouveau', stale_key='k'), ('nouveau', True))
+
+    def test_dashboard_stats_served_from_cache_or_stale(self):
+        Service.objects.create(title="Web", description="D", icon="fas fa-code")
+        url = reverse('content:dashboard_stats')
+        self.assertEqual(self.client.get(url).data['services']['total_services'], 1)
+        # Version vérifiée par intervalle : aucune requête
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertNotIn('no-store', response.get('Cache-Control', ''))
+
+        Service.objects.create(title="Mobile", description="D", icon="fas fa-mobile")
+        versions = '-'.join(version for _, version in sorted(current_versions().items()))
+        cache.add(f"content:flight:dashboard-stats:all:{timezone.now().date()}:{versions}:lock", 'x', 30)
+        response = self.client.get(url)
+        self.assertEqual(response.data['services']['total_services'], 1)
+        self.assertIn('no-store', response['Cache-Control'])
+
+        cache.clear()
+        self.assertEqual(self.client.get(url).data['services']['total_services'], 2)
+
+    def test_list_page_computed_once_per_version(self):
+        Project.objects.create(name="Site", description="D", technologies="Django", completion_date=date.today())
+        url = reverse('content:project_list')
+        self.client.get(url, {'technology': 'django'})
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'technology': 'django'})
+        self.assertEqual(response.data['count'], 1)
+        Project.objects.create(name="App", description="D", technologies="Django", completion_date=date.today())
+        self.assertEqual(self.client.get(url, {'technology': 'django'}).data['count'], 2)
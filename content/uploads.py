@@ -0,0 +1,192 @@
+"""
+Envoi fractionné et reprenable des images de projets.
+
+1. ``create_upload`` enregistre le nom, la taille et le SHA-256 attendus ;
+2. chaque morceau est lu par blocs depuis le flux de la requête et écrit à
+   sa position dans un fichier partiel (``uploads/partial/<id>``, hors des
+   préfixes servis) : ni tampon mémoire complet, ni fichier temporaire ;
+3. un envoi interrompu reprend à ``offset`` (un morceau à une autre position
+   est refusé et la position attendue renvoyée) ;
+4. ``complete_upload`` vérifie la taille, l'empreinte et l'image, puis
+   lie le fichier sous ``projects/`` et l'attache au projet : le fichier
+   n'est jamais recopié.
+
+Le stockage doit être local (``Storage.path``), comme pour content.media.
+"""
+import hashlib
+import os
+from datetime import timedelta
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from PIL import Image, UnidentifiedImageError
+
+from .jobs import enqueue
+from .models import ImageUpload, Project
+
+READ_SIZE = 64 * 1024
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+
+
+class UploadError(ValueError):
+    """Envoi refusé ; ``offset`` est la position attendue en cas de décalage"""
+
+    def __init__(self, message, offset=None):
+        super().__init__(message)
+        self.offset = offset
+
+
+def max_chunk_size():
+    return getattr(settings, 'CONTENT_UPLOAD_MAX_CHUNK_SIZE', 8 * 1024 * 1024)
+
+
+def create_upload(filename, size, checksum, user=None):
+    """Ouvre un envoi après validation de sa description"""
+    filename = get_valid_filename(PurePosixPath(str(filename)).name)
+    if PurePosixPath(filename).suffix.lower() not in IMAGE_EXTENSIONS:
+        raise UploadError(f"Extension non prise en charge : {', '.join(sorted(IMAGE_EXTENSIONS))}.")
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("size doit être un entier.")
+    if not 0 < size <= getattr(settings, 'CONTENT_UPLOAD_MAX_SIZE', 50 * 1024 * 1024):
+        raise UploadError("Taille de fichier invalide ou trop grande.")
+    checksum = str(checksum or '').lower()
+    if len(checksum) != 64 or any(char not in '0123456789abcdef' for char in checksum):
+        raise UploadError("checksum doit être l'empreinte SHA-256 du fichier (64 caractères hexadécimaux).")
+
+    upload = ImageUpload.objects.create(
+        filename=filename, size=size, checksum=checksum,
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+    path = default_storage.path(upload.partial_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    return upload
+
+
+def append_chunk(upload_id, offset, stream, length):
+    """
+    Écrit ``length`` octets lus dans ``stream`` à la position ``offset`` ;
+    retourne la nouvelle position.
+    """
+    if length <= 0 or length > max_chunk_size():
+        raise UploadError(f"Un morceau doit faire entre 1 et {max_chunk_size()} octets.")
+    with transaction.atomic():
+        # Verrou : deux morceaux du même envoi ne s'écrivent pas en même temps
+        upload = ImageUpload.objects.select_for_update().get(pk=upload_id)
+        if upload.status != 'pending':
+            raise UploadError("Envoi déjà terminé.", upload.offset)
+        if offset != upload.offset:
+            raise UploadError(f"Position attendue : {upload.offset}.", upload.offset)
+        if offset + length > upload.size:
+            raise UploadError("Le morceau dépasse la taille annoncée.", upload.offset)
+
+        written = 0
+        with open(default_storage.path(upload.partial_name), 'r+b') as partial:
+            # Un morceau précédent interrompu a pu laisser des octets au-delà de offset
+            partial.seek(offset)
+            partial.truncate()
+            while written < length:
+                block = stream.read(min(READ_SIZE, length - written))
+                if not block:
+                    break
+                partial.write(block)
+                written += len(block)
+        if written != length:
+            raise UploadError("Morceau incomplet : renvoyer à partir de la position attendue.", upload.offset)
+        upload.offset = offset + written
+        upload.save(update_fields=['offset', 'updated_at'])
+    return upload.offset
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(READ_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def verify_upload(upload):
+    """Vérifie l'empreinte et l'image d'un envoi terminé (une relecture, sans copie)"""
+    if upload.offset != upload.size:
+        raise UploadError(f"Envoi incomplet : {upload.offset} / {upload.size} octets.", upload.offset)
+    partial_path = default_storage.path(upload.partial_name)
+    # L'empreinte ne peut pas être cumulée entre requêtes
+    if file_checksum(partial_path) != upload.checksum:
+        raise UploadError("L'empreinte SHA-256 ne correspond pas au fichier reçu.")
+    try:
+        with Image.open(partial_path) as image:
+            image.verify()
+    except (UnidentifiedImageError, OSError):
+        raise UploadError("Le fichier reçu n'est pas une image valide.")
+
+
+def _link_available_name(partial_path, project, filename):
+    """
+    Donne au fichier partiel un nom libre sous ``projects/`` par lien dur :
+    contrairement à un renommage, le lien échoue si un autre envoi a pris ce
+    nom entre-temps, au lieu d'écraser son fichier.
+    """
+    field = Project._meta.get_field('image')
+    while True:
+        name = default_storage.get_available_name(field.generate_filename(project, filename))
+        final_path = default_storage.path(name)
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        try:
+            os.link(partial_path, final_path)
+        except FileExistsError:
+            continue
+        return name, final_path
+
+
+def complete_upload(upload_id, project, verify=True):
+    """
+    Vérifie l'envoi terminé et l'attache comme image de ``project`` ;
+    ``verify=False`` si ``verify_upload`` vient d'être appelé (formulaire).
+    """
+    with transaction.atomic():
+        upload = ImageUpload.objects.select_for_update().get(pk=upload_id)
+        if upload.status != 'pending':
+            raise UploadError("Envoi déjà rattaché.")
+        if upload.offset != upload.size:
+            raise UploadError(f"Envoi incomplet : {upload.offset} / {upload.size} octets.", upload.offset)
+        if verify:
+            verify_upload(upload)
+
+        partial_path = default_storage.path(upload.partial_name)
+        name, final_path = _link_available_name(partial_path, project, upload.filename)
+        try:
+            project.image.name = name
+            project.save(update_fields=['image', 'updated_at'])
+            upload.status = 'attached'
+            upload.project = project
+            upload.save(update_fields=['status', 'project', 'updated_at'])
+            # Le fichier n'est pas vu comme nouveau par le signal de sauvegarde
+            enqueue('process_project_image', {'project_id': project.pk}, dedup_key=f'project-image:{project.pk}')
+        except Exception:
+            os.unlink(final_path)
+            raise
+        # Fichier partiel retiré à la validation : un retour arrière le laisse en place
+        transaction.on_commit(lambda: os.unlink(partial_path))
+    return project
+
+
+def purge_stale_uploads(max_age_hours=None):
+    """Supprime les envois abandonnés et leurs fichiers partiels"""
+    if max_age_hours is None:
+        max_age_hours = getattr(settings, 'CONTENT_UPLOAD_EXPIRY_HOURS', 24)
+    stale = ImageUpload.objects.filter(
+        status='pending', updated_at__lt=timezone.now() - timedelta(hours=max_age_hours)
+    )
+    count = 0
+    for upload in stale:
+        default_storage.delete(upload.partial_name)
+        upload.delete()
+        count += 1
+    return count
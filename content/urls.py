@@ -9,14 +9,30 @@ urlpatterns = [
     
     # Services endpoints
     path('api/services/', views.ServiceListView.as_view(), name='service_list'),
+    path('api/services/reorder/', views.service_reorder, name='service_reorder'),
     
     # Projects endpoints  
     path('api/projects/', views.ProjectListView.as_view(), name='project_list'),
+    path('api/projects/facets/', views.project_facets, name='project_facets'),
+    path('api/projects/<int:pk>/similar/', views.SimilarProjectsView.as_view(), name='project_similar'),
     
     # Testimonials endpoints
     path('api/testimonials/', views.TestimonialListView.as_view(), name='testimonial_list'),
+    path('api/testimonials/random/', views.RandomTestimonialsView.as_view(), name='testimonial_random'),
     
     # Dashboard endpoints
     path('api/dashboard/stats/', views.dashboard_stats, name='dashboard_stats'),
+    path('api/dashboard/companies/', views.CompanyRatingStatsView.as_view(), name='company_rating_stats'),
+    
+    # Chunked image uploads (admin)
+    path('api/uploads/', views.image_upload_create, name='image_upload_create'),
+    path('api/uploads/<uuid:pk>/', views.image_upload_detail, name='image_upload_detail'),
+    path('api/uploads/<uuid:pk>/complete/', views.image_upload_complete, name='image_upload_complete'),
+    
+    # Autocomplete endpoint
+    path('api/autocomplete/', views.autocomplete, name='autocomplete'),
+    
+    # Batch endpoint
+    path('api/batch/', views.batch, name='batch'),
     
 ]
\ No newline at end of file
@@ -1,17 +1,41 @@
 from rest_framework import generics, status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import BasePermission, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
 from django.db.models import Avg, Count
+from django.urls import Resolver404, resolve
 from django.utils import timezone
+from django.utils.cache import add_never_cache_headers
 from datetime import timedelta
 from django.shortcuts import render
+from urllib.parse import urlsplit
+import hashlib
+import io
+import logging
 
-from .models import Service, Project, Testimonial
+from .models import Service, Project, Testimonial, ImageUpload
 from .serializers import (
     ServiceSerializer, ProjectSerializer, TestimonialSerializer,
-    DashboardStatsSerializer
+    TestimonialSubmissionSerializer, DashboardStatsSerializer,
+    CompanyRatingStatsSerializer
 )
+from .read_model import read_model, with_absolute_image_urls
+from .write_behind import submission_buffer
+from .partitioning import year_range
+from .analytics import company_rating_stats
+from .indexes import technology_index, rating_band_index, company_index
+from .fragments import fragments_enabled, render_fragments
+from .ordering import InvalidOrdering, reorder_services
+from .uploads import UploadError, append_chunk, complete_upload, create_upload, max_chunk_size
+from .jobs import enqueue
+from .surrogate_keys import SurrogateKeyMixin, object_key, surrogate_keys
+from .invalidation import SCOPES, current_versions
+from .single_flight import single_flight, single_flight_enabled
+
+logger = logging.getLogger(__name__)
 
 class StandardResultsSetPagination(PageNumberPagination):
     """Pagination standard pour les APIs"""
@@ -20,18 +44,113 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class ServiceListView(generics.ListAPIView):
+def get_year_param(request):
+    """
+    Retourne l'année demandée (?year=) si elle est valide. Filtrer sur une
+    année borne created_at, ce qui limite la lecture à ses partitions
+    lorsque la table des témoignages est partitionnée.
+    """
+    try:
+        year = int(request.query_params.get('year', ''))
+    except ValueError:
+        return None
+    return year if 1900 <= year <= 9999 else None
+
+
+class FragmentListMixin:
+    """
+    Assemble les listes à partir des fragments mis en cache par objet :
+    une requête étroite (pk, updated_at) par page, puis seulement les
+    objets absents du cache sont relus et sérialisés.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not fragments_enabled():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values_list('pk', 'updated_at')
+        page = self.paginate_queryset(rows)
+        data = render_fragments(
+            self.get_serializer_class(), queryset.model, rows if page is None else page
+        )
+        data = with_absolute_image_urls(data, request)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class SingleFlightListMixin:
+    """
+    Une seule construction simultanée de chaque page de liste (même URL,
+    même version du contenu) : les requêtes identiques reçoivent son
+    résultat, ou brièvement la page précédente (content.single_flight).
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not single_flight_enabled():
+            return super().list(request, *args, **kwargs)
+        scope = SCOPES[self.get_queryset().model]
+        # L'URL complète : les liens next/previous et les images en dépendent
+        digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        data, stale = single_flight(
+            f"list:{scope}:{current_versions()[scope]}:{digest}",
+            lambda: super(SingleFlightListMixin, self).list(request, *args, **kwargs).data,
+            stale_key=f"list:{scope}:{digest}",
+        )
+        response = Response(data)
+        if stale:
+            # Page périmée : ni le navigateur ni un proxy ne doivent la garder
+            add_never_cache_headers(response)
+        return response
+
+
+class ServiceListView(SurrogateKeyMixin, SingleFlightListMixin, FragmentListMixin, generics.ListAPIView):
     """API endpoint pour lister tous les services actifs"""
     queryset = Service.objects.filter(is_active=True)
     serializer_class = ServiceSerializer
     pagination_class = None  # Pas de pagination pour les services
+    surrogate_models = (Service,)
+
+    def list(self, request, *args, **kwargs):
+        snapshot = read_model.get_snapshot()
+        if snapshot is None:
+            return super().list(request, *args, **kwargs)
+        return Response(list(snapshot.services))
 
 
-class ProjectListView(generics.ListAPIView):
+class CanChangeServices(BasePermission):
+    """Droit de modification des services, comme la page de l'admin"""
+
+    def has_permission(self, request, view):
+        return request.user.has_perm('content.change_service')
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser, CanChangeServices])
+def service_reorder(request):
+    """
+    Applique un nouvel ordre complet des services : {"order": [id, id, ...]}
+    (réservé aux administrateurs autorisés à modifier les services)
+    """
+    order = request.data.get('order') if hasattr(request.data, 'get') else None
+    if not isinstance(order, list):
+        return Response(
+            {'detail': "Le champ 'order' doit être une liste d'identifiants."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        moved = reorder_services(order)
+    except InvalidOrdering as exc:
+        return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'moved': moved})
+
+
+class ProjectListView(SurrogateKeyMixin, SingleFlightListMixin, FragmentListMixin, generics.ListAPIView):
     """API endpoint pour lister tous les projets"""
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     pagination_class = StandardResultsSetPagination
+    surrogate_models = (Project,)
 
     def get_queryset(self):
         """Permet de filtrer par technologie si spécifiée"""
@@ -41,30 +160,261 @@ class ProjectListView(generics.ListAPIView):
             queryset = queryset.filter(technologies__icontains=technology)
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        snapshot = read_model.get_snapshot()
+        if snapshot is None:
+            return super().list(request, *args, **kwargs)
+        rows = snapshot.filter_projects(request.query_params.get('technology'))
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(with_absolute_image_urls(page, request))
+
+
+@surrogate_keys(Project)
+@api_view(['GET'])
+def project_facets(request):
+    """
+    API endpoint des facettes de projets : nombre de projets par technologie
+    et par année d'achèvement, pour le filtre ?technology= courant
+    """
+    return Response(technology_index.facets(request.query_params.get('technology')))
+
 
-class TestimonialListView(generics.ListAPIView):
-    """API endpoint pour lister tous les témoignages approuvés"""
+class SimilarProjectsView(SurrogateKeyMixin, generics.GenericAPIView):
+    """API endpoint des projets similaires (technologies communes)"""
+    serializer_class = ProjectSerializer
+    max_limit = 20
+    surrogate_models = (Project,)
+
+    def get_surrogate_keys(self, response):
+        return [object_key(Project, self.kwargs['pk'])] + super().get_surrogate_keys(response)
+
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 5)), 1), self.max_limit)
+        except ValueError:
+            limit = 5
+        ranked = technology_index.similar(pk, limit)
+        if ranked is None:
+            return Response({'detail': 'Projet introuvable.'}, status=status.HTTP_404_NOT_FOUND)
+
+        projects = Project.objects.in_bulk([other for other, _ in ranked])
+        results = []
+        for other, score in ranked:
+            if other in projects:
+                data = self.get_serializer(projects[other]).data
+                data['similarity'] = score
+                results.append(data)
+        return Response({'project': pk, 'results': results})
+
+
+class TestimonialListView(SurrogateKeyMixin, SingleFlightListMixin, FragmentListMixin, generics.ListAPIView):
+    """
+    API endpoint pour lister tous les témoignages approuvés (GET) et en
+    soumettre de nouveaux (POST, modérés avant publication)
+    """
     queryset = Testimonial.objects.filter(is_approved=True)
     serializer_class = TestimonialSerializer
     pagination_class = StandardResultsSetPagination
+    surrogate_models = (Testimonial,)
 
-    def get_queryset(self):
-        """Permet de filtrer par note minimale si spécifiée"""
-        queryset = Testimonial.objects.filter(is_approved=True)
+    def get_min_rating(self):
+        """Retourne la note minimale demandée si elle est valide"""
         min_rating = self.request.query_params.get('min_rating', None)
         if min_rating:
             try:
                 min_rating = int(min_rating)
                 if 1 <= min_rating <= 5:
-                    queryset = queryset.filter(rating__gte=min_rating)
+                    return min_rating
             except ValueError:
                 pass
+        return None
+
+    def get_queryset(self):
+        """Permet de filtrer par note minimale et par année si spécifiées"""
+        queryset = Testimonial.objects.filter(is_approved=True)
+        min_rating = self.get_min_rating()
+        if min_rating:
+            queryset = queryset.filter(rating__gte=min_rating)
+        year = get_year_param(self.request)
+        if year:
+            start, end = year_range(year)
+            queryset = queryset.filter(created_at__gte=start, created_at__lt=end)
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        snapshot = read_model.get_snapshot()
+        if snapshot is None:
+            return super().list(request, *args, **kwargs)
+        rows = snapshot.filter_testimonials(self.get_min_rating(), get_year_param(request))
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(list(page))
+
+    def post(self, request, *args, **kwargs):
+        """Valide la soumission et la met en file pour une insertion groupée"""
+        serializer = TestimonialSubmissionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ticket = submission_buffer.submit(serializer.data)
+        return Response(
+            {'ticket': str(ticket), 'status': 'queued'},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+class RandomTestimonialsView(SurrogateKeyMixin, generics.GenericAPIView):
+    """
+    API endpoint de témoignages approuvés tirés au hasard
+    (?count=, ?min_rating=, ?seed= pour un tirage reproductible)
+    """
+    serializer_class = TestimonialSerializer
+    max_count = 20
+    surrogate_models = (Testimonial,)
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        try:
+            count = min(max(int(params.get('count', 3)), 1), self.max_count)
+        except ValueError:
+            count = 3
+        try:
+            min_rating = min(max(int(params.get('min_rating', 1)), 1), 5)
+        except ValueError:
+            min_rating = 1
+        try:
+            seed = int(params['seed']) if 'seed' in params else None
+        except ValueError:
+            seed = None
+
+        ids = rating_band_index.sample(count, min_rating, seed)
+        testimonials = Testimonial.objects.filter(is_approved=True).in_bulk(ids)
+        # Ordre du tirage ; un témoignage retiré entre-temps est simplement omis
+        rows = [testimonials[pk] for pk in ids if pk in testimonials]
+        return Response(self.get_serializer(rows, many=True).data)
+
 
+def upload_state(upload):
+    return {
+        'id': str(upload.pk),
+        'filename': upload.filename,
+        'size': upload.size,
+        'offset': upload.offset,
+        'status': upload.status,
+        'max_chunk_size': max_chunk_size(),
+    }
+
+
+def upload_error(exc, status_code=status.HTTP_400_BAD_REQUEST):
+    if exc.offset is None:
+        return Response({'detail': str(exc)}, status=status_code)
+    # Décalage : le client reprend à la position renvoyée
+    response = Response({'detail': str(exc), 'offset': exc.offset}, status=status.HTTP_409_CONFLICT)
+    response['Upload-Offset'] = str(exc.offset)
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def image_upload_create(request):
+    """
+    Ouvre un envoi fractionné d'image : {"filename", "size", "checksum"}
+    (SHA-256 hexadécimal du fichier complet) ; réservé aux administrateurs
+    """
+    try:
+        upload = create_upload(
+            request.data.get('filename', ''), request.data.get('size'),
+            request.data.get('checksum'), request.user,
+        )
+    except UploadError as exc:
+        return upload_error(exc)
+    # Nettoyage des envois abandonnés, une fois le délai d'expiration écoulé
+    enqueue(
+        'purge_stale_uploads', dedup_key='purge-stale-uploads',
+        delay=getattr(settings, 'CONTENT_UPLOAD_EXPIRY_HOURS', 24) * 3600,
+    )
+    return Response(upload_state(upload), status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'PATCH'])
+@permission_classes([IsAdminUser])
+def image_upload_detail(request, pk):
+    """
+    GET : position atteinte, pour reprendre un envoi interrompu.
+    PATCH : morceau suivant, corps brut, à la position de l'en-tête Upload-Offset.
+    """
+    try:
+        upload = ImageUpload.objects.get(pk=pk)
+    except ImageUpload.DoesNotExist:
+        return Response({'detail': 'Envoi introuvable.'}, status=status.HTTP_404_NOT_FOUND)
+    if request.method == 'GET':
+        return Response(upload_state(upload))
+
+    try:
+        offset = int(request.headers['Upload-Offset'])
+        length = int(request.headers['Content-Length'])
+    except (KeyError, ValueError):
+        return Response(
+            {'detail': "En-têtes Upload-Offset et Content-Length requis."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        # Flux brut de la requête : le morceau n'est pas chargé en mémoire
+        offset = append_chunk(upload.pk, offset, request.stream, length)
+    except UploadError as exc:
+        return upload_error(exc)
+    response = Response({'offset': offset, 'size': upload.size})
+    response['Upload-Offset'] = str(offset)
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def image_upload_complete(request, pk):
+    """Vérifie l'envoi terminé et l'attache au projet : {"project": id}"""
+    try:
+        project = Project.objects.get(pk=request.data.get('project'))
+    except (Project.DoesNotExist, ValueError, TypeError):
+        return Response({'detail': 'Projet introuvable.'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        project = complete_upload(pk, project)
+    except ImageUpload.DoesNotExist:
+        return Response({'detail': 'Envoi introuvable.'}, status=status.HTTP_404_NOT_FOUND)
+    except UploadError as exc:
+        return upload_error(exc)
+    return Response(ProjectSerializer(project, context={'request': request}).data)
+
+
+AUTOCOMPLETE_INDEXES = {
+    'technology': technology_index,
+    'company': company_index,
+}
+
+
+@surrogate_keys(Project, Testimonial)
 @api_view(['GET'])
-def dashboard_stats(request):
-    """API endpoint pour les statistiques du dashboard"""
+def autocomplete(request):
+    """
+    API endpoint d'autocomplétion (?field=technology|company&prefix=&limit=),
+    servi par les index en mémoire : aucune requête par frappe
+    """
+    field = request.query_params.get('field', '')
+    index = AUTOCOMPLETE_INDEXES.get(field)
+    if index is None:
+        return Response(
+            {'detail': f"field doit valoir {' ou '.join(AUTOCOMPLETE_INDEXES)}."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    prefix = request.query_params.get('prefix', '').strip()
+    try:
+        limit = min(max(int(request.query_params.get('limit', 8)), 1), 20)
+    except ValueError:
+        limit = 8
+    suggestions = [
+        {'value': value, 'count': count} for value, count in index.complete(prefix, limit)
+    ]
+    return Response({'field': field, 'prefix': prefix, 'suggestions': suggestions})
+
+
+def compute_dashboard_stats(year=None):
+    """Statistiques du dashboard (toutes années, ou ``year`` pour les témoignages)"""
     # Statistiques des services
     total_services = Service.objects.count()
     active_services = Service.objects.filter(is_active=True).count()
@@ -75,23 +425,27 @@ def dashboard_stats(request):
     thirty_days_ago = timezone.now().date() - timedelta(days=30)
     recent_projects = Project.objects.filter(completion_date__gte=thirty_days_ago).count()
 
-    # Statistiques des témoignages
-    total_testimonials = Testimonial.objects.count()
-    approved_testimonials = Testimonial.objects.filter(is_approved=True).count()
+    # Statistiques des témoignages (limitées à une année si ?year= est fourni)
+    testimonials = Testimonial.objects.all()
+    if year:
+        start, end = year_range(year)
+        testimonials = testimonials.filter(created_at__gte=start, created_at__lt=end)
+    total_testimonials = testimonials.count()
+    approved_testimonials = testimonials.filter(is_approved=True).count()
     pending_testimonials = total_testimonials - approved_testimonials
     
-    avg_rating = Testimonial.objects.filter(is_approved=True).aggregate(
+    avg_rating = testimonials.filter(is_approved=True).aggregate(
         avg=Avg('rating')
     )['avg'] or 0
 
     # Distribution des notes
-    rating_distribution = Testimonial.objects.filter(is_approved=True).values(
+    rating_distribution = testimonials.filter(is_approved=True).values(
         'rating'
     ).annotate(
         count=Count('rating')
     ).order_by('rating')
 
-    stats_data = {
+    return {
         'services': {
             'total_services': total_services,
             'active_services': active_services,
@@ -110,32 +464,167 @@ def dashboard_stats(request):
         'rating_distribution': list(rating_distribution)
     }
 
+
+@surrogate_keys(Service, Project, Testimonial)
+@api_view(['GET'])
+def dashboard_stats(request):
+    """
+    API endpoint pour les statistiques du dashboard, calculées une seule
+    fois par version du contenu (et par jour : projets récents)
+    """
+    year = get_year_param(request)
+    if not single_flight_enabled():
+        return _dashboard_stats_response(compute_dashboard_stats(year))
+    versions = '-'.join(version for _, version in sorted(current_versions().items()))
+    stats_data, stale = single_flight(
+        f"dashboard-stats:{year or 'all'}:{timezone.now().date()}:{versions}",
+        lambda: compute_dashboard_stats(year),
+        stale_key=f"dashboard-stats:{year or 'all'}",
+    )
+    response = _dashboard_stats_response(stats_data)
+    if stale:
+        # Statistiques périmées : ni le navigateur ni un proxy ne doivent les garder
+        add_never_cache_headers(response)
+    return response
+
+
+def _dashboard_stats_response(stats_data):
     serializer = DashboardStatsSerializer(data=stats_data)
     if serializer.is_valid():
         return Response(serializer.data)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class CompanyRatingStatsView(SurrogateKeyMixin, generics.GenericAPIView):
+    """API endpoint pour les statistiques de notes par entreprise"""
+    serializer_class = CompanyRatingStatsSerializer
+    pagination_class = StandardResultsSetPagination
+    surrogate_models = (Testimonial,)
+
+    def get(self, request, *args, **kwargs):
+        page = self.paginate_queryset(company_rating_stats())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+def _run_sub_request(request, path):
+    """Exécute une requête GET interne sur une URL de l'application content"""
+    url = urlsplit(path)
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return status.HTTP_404_NOT_FOUND, {'detail': 'URL inconnue.'}
+    if match.namespace != 'content' or match.url_name == 'batch':
+        return status.HTTP_400_BAD_REQUEST, {'detail': 'URL non autorisée dans un lot.'}
+
+    environ = dict(
+        request.META,
+        REQUEST_METHOD='GET',
+        PATH_INFO=url.path,
+        QUERY_STRING=url.query,
+        CONTENT_LENGTH='0',
+    )
+    environ['wsgi.input'] = io.BytesIO()
+    # Absent de META sous ASGI : URLs absolues des sous-réponses
+    environ['wsgi.url_scheme'] = request.scheme
+    sub_request = WSGIRequest(environ)
+    sub_request.user = request.user
+    sub_request.session = getattr(request._request, 'session', None)
+    sub_request.resolver_match = match
+
+    try:
+        response = match.func(sub_request, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception("Échec de la sous-requête %s", path)
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, {'detail': 'Erreur interne.'}
+    if hasattr(response, 'data'):
+        return response.status_code, response.data
+    return response.status_code, response.content.decode(response.charset)
+
+
+@api_view(['POST'])
+def batch(request):
+    """
+    Exécute plusieurs requêtes GET internes en un seul aller-retour.
+
+    Corps attendu : {"requests": ["/api/services/", {"id": "p", "path": "/api/projects/?page_size=6"}]}
+
+    Les sous-requêtes sont exécutées dans ce processus, l'une après l'autre,
+    sur la connexion à la base de la requête courante : les connexions Django
+    étant propres à chaque thread, une exécution parallèle ouvrirait une
+    connexion par sous-requête.
+    """
+    items = request.data.get('requests') if hasattr(request.data, 'get') else None
+    if not isinstance(items, list) or not items:
+        return Response(
+            {'detail': 'Le champ "requests" doit être une liste non vide.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    max_requests = getattr(settings, 'CONTENT_BATCH_MAX_REQUESTS', 10)
+    if len(items) > max_requests:
+        return Response(
+            {'detail': f'Un lot est limité à {max_requests} requêtes.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    responses = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            item = {'path': item}
+        path = item.get('path') if isinstance(item, dict) else None
+        if not isinstance(path, str) or not path.startswith('/'):
+            item_status, body = status.HTTP_400_BAD_REQUEST, {'detail': 'Chemin invalide.'}
+        else:
+            item_status, body = _run_sub_request(request, path)
+        responses.append({
+            'id': item.get('id', index) if isinstance(item, dict) else index,
+            'path': path,
+            'status': item_status,
+            'body': body,
+        })
+    return Response({'responses': responses})
+
+
 @api_view(['GET'])
 def api_overview(request):
     """Vue d'ensemble de l'API avec tous les endpoints disponibles"""
     api_urls = {
         'Services': {
             'List active services': '/api/services/',
+            'Reorder services (admin)': 'POST /api/services/reorder/',
             'Service detail': '/api/services/{id}/',
         },
         'Projects': {
             'List all projects': '/api/projects/',
             'Filter by technology': '/api/projects/?technology={tech_name}',
+            'Facets (technologies, years)': '/api/projects/facets/?technology={tech_name}',
+            'Similar projects': '/api/projects/{id}/similar/?limit={n}',
             'Project detail': '/api/projects/{id}/',
         },
         'Testimonials': {
             'List approved testimonials': '/api/testimonials/',
+            'Submit a testimonial': 'POST /api/testimonials/',
             'Filter by min rating': '/api/testimonials/?min_rating={1-5}',
+            'Filter by year': '/api/testimonials/?year={yyyy}',
+            'Random selection': '/api/testimonials/random/?count={n}&min_rating={1-5}',
             'Testimonial detail': '/api/testimonials/{id}/',
         },
         'Dashboard': {
             'Statistics': '/api/dashboard/stats/',
+            'Statistics for one year': '/api/dashboard/stats/?year={yyyy}',
+            'Ratings per company': '/api/dashboard/companies/',
+        },
+        'Uploads': {
+            'Start a chunked image upload (admin)': 'POST /api/uploads/',
+            'Upload state / next chunk (admin)': 'GET, PATCH /api/uploads/{id}/',
+            'Attach to a project (admin)': 'POST /api/uploads/{id}/complete/',
+        },
+        'Autocomplete': {
+            'Technologies': '/api/autocomplete/?field=technology&prefix={text}',
+            'Companies': '/api/autocomplete/?field=company&prefix={text}',
+        },
+        'Batch': {
+            'Several GET requests in one round trip': 'POST /api/batch/',
         },
         'API Info': {
             'This overview': '/api/',
@@ -0,0 +1,202 @@
+"""
+Tampon d'écriture différée pour les témoignages soumis publiquement.
+
+Les soumissions validées sont ajoutées à un fichier spool local (une ligne
+JSON par soumission, écrite avec fsync) puis insérées par lots avec
+``bulk_create`` dès que le lot atteint CONTENT_TESTIMONIAL_BATCH_SIZE ou que
+la plus ancienne soumission attend depuis CONTENT_TESTIMONIAL_FLUSH_INTERVAL
+secondes. Le spool survit à un redémarrage : tout worker (ou la commande
+``flush_testimonials``) reprend les fichiers restants au vidage suivant.
+
+Chaque soumission porte un ticket (``Testimonial.submission_ticket``) : un lot
+rejoué après un arrêt brutal n'insère pas deux fois la même ligne.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .models import Testimonial
+from .invalidation import mark_changed
+from .minhash import assign_signature, index_testimonials
+
+try:
+    import fcntl
+except ImportError:  # Windows : verrou limité au processus courant
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PENDING_NAME = 'pending.jsonl'
+BATCH_PATTERN = 'batch-*.jsonl'
+CLAIMED_PATTERN = 'claimed-*.jsonl'
+# Un lot réservé depuis plus longtemps appartient à un worker disparu
+STALE_CLAIM_SECONDS = 300
+
+
+class TestimonialSubmissionBuffer:
+    """Tampon des soumissions de témoignages, partagé par les workers via le spool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._oldest = None
+        self._timer = None
+
+    @property
+    def directory(self):
+        return Path(getattr(
+            settings, 'CONTENT_TESTIMONIAL_SPOOL_DIR',
+            settings.BASE_DIR / 'spool' / 'testimonials'
+        ))
+
+    @property
+    def batch_size(self):
+        return getattr(settings, 'CONTENT_TESTIMONIAL_BATCH_SIZE', 50)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'CONTENT_TESTIMONIAL_FLUSH_INTERVAL', 5)
+
+    @contextmanager
+    def _spool_lock(self):
+        """Verrou exclusif sur le spool, entre threads et entre processus"""
+        directory = self.directory
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(directory / 'spool.lock', 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield directory
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def submit(self, data):
+        """Ajoute une soumission validée au spool et retourne son ticket"""
+        ticket = uuid.uuid4()
+        line = json.dumps({'ticket': str(ticket), 'data': data}, ensure_ascii=False)
+        with self._spool_lock() as directory:
+            with open(directory / PENDING_NAME, 'a', encoding='utf-8') as spool:
+                spool.write(line + '\n')
+                spool.flush()
+                os.fsync(spool.fileno())
+            self._pending += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            due = (
+                self._pending >= self.batch_size
+                or (self.flush_interval and time.monotonic() - self._oldest >= self.flush_interval)
+            )
+
+        if due:
+            try:
+                self.flush()
+            except Exception:
+                # La soumission est déjà dans le spool : la requête ne doit pas
+                # échouer (un nouvel essai du client créerait un doublon)
+                logger.exception("Échec du vidage des témoignages, nouvel essai différé")
+                self._schedule_flush()
+        else:
+            self._schedule_flush()
+        return ticket
+
+    def _schedule_flush(self):
+        """Programme un vidage différé pour borner l'attente des soumissions"""
+        if not self.flush_interval or (self._timer and self._timer.is_alive()):
+            return
+        self._timer = threading.Timer(self.flush_interval, self._flush_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Échec du vidage différé des témoignages")
+        finally:
+            # Le thread du timer possède sa propre connexion à la base
+            close_old_connections()
+
+    def flush(self):
+        """Insère tous les lots en attente et retourne le nombre de lignes créées"""
+        with self._spool_lock() as directory:
+            pending = directory / PENDING_NAME
+            if pending.exists() and pending.stat().st_size:
+                os.replace(pending, directory / f"batch-{uuid.uuid4().hex}.jsonl")
+            self._pending = 0
+            self._oldest = None
+
+        created = 0
+        claimed = self._claim_batches(directory)
+        try:
+            for path in claimed:
+                created += self._insert_batch(path)
+                path.unlink()
+        except Exception:
+            # Lots rendus : repris au prochain vidage, sans attendre STALE_CLAIM_SECONDS
+            for path in claimed:
+                if path.exists():
+                    os.replace(path, directory / f"batch-{uuid.uuid4().hex}.jsonl")
+            raise
+        finally:
+            if created:
+                mark_changed(Testimonial)
+        return created
+
+    def _claim_batches(self, directory):
+        """Réserve les lots (renommage atomique) pour qu'un seul worker les traite"""
+        now = time.time()
+        candidates = sorted(directory.glob(BATCH_PATTERN)) + [
+            path for path in sorted(directory.glob(CLAIMED_PATTERN))
+            if now - path.stat().st_mtime > STALE_CLAIM_SECONDS
+        ]
+        claimed = []
+        for path in candidates:
+            target = directory / f"claimed-{os.getpid()}-{uuid.uuid4().hex}.jsonl"
+            try:
+                os.replace(path, target)
+            except FileNotFoundError:
+                continue  # Déjà réservé par un autre worker
+            os.utime(target)
+            claimed.append(target)
+        return claimed
+
+    def _insert_batch(self, path):
+        records = {}
+        with open(path, encoding='utf-8') as spool:
+            for line in spool:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Ligne tronquée par un arrêt brutal
+                records[uuid.UUID(record['ticket'])] = record['data']
+
+        with transaction.atomic():
+            existing = set(Testimonial.objects.filter(
+                submission_ticket__in=list(records)
+            ).values_list('submission_ticket', flat=True))
+            rows = [
+                Testimonial(submission_ticket=ticket, is_approved=False, **data)
+                for ticket, data in records.items()
+                if ticket not in existing
+            ]
+            # bulk_create ne déclenche pas les signaux : signatures et seaux ici
+            for row in rows:
+                assign_signature(row)
+            Testimonial.objects.bulk_create(rows, batch_size=500)
+            index_testimonials(rows)
+        return len(rows)
+
+
+submission_buffer = TestimonialSubmissionBuffer()
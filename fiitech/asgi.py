@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "fiitech.settings")
 
 application = get_asgi_application()
+
+# Fichiers statiques servis directement (désactivé en DEBUG, cf. settings)
+from content.staticfiles import wrap_asgi  # noqa: E402
+
+application = wrap_asgi(application)
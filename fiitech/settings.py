@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import importlib.util
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -51,6 +53,9 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "content.middleware.SamplingProfilerMiddleware",
+    "content.middleware.QueryContextMiddleware",
+    "content.middleware.StatementTimeoutMiddleware",
 ]
 
 ROOT_URLCONF = "fiitech.urls"
@@ -77,14 +82,50 @@ WSGI_APPLICATION = "fiitech.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Connexion configurée par l'environnement (valeurs par défaut : développement local)
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'postgres',       
-        'USER': 'postgres',             
-        'PASSWORD': 'neuja',     
-        'HOST': 'localhost',            
-        'PORT': '5432',                 
+        'NAME': os.environ.get('DB_NAME', 'postgres'),
+        'USER': os.environ.get('DB_USER', 'postgres'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', 'neuja'),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '5432'),
+        # Vérifie une connexion réutilisée avant la première requête qui la sert
+        'CONN_HEALTH_CHECKS': True,
+        # Derrière PgBouncer en mode transaction, les curseurs nommés ne
+        # survivent pas à la transaction : DB_DISABLE_SERVER_SIDE_CURSORS=1
+        'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_DISABLE_SERVER_SIDE_CURSORS', '0') == '1',
+        'OPTIONS': {
+            'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', '5')),
+            'application_name': os.environ.get('DB_APPLICATION_NAME', 'fiitech'),
+        },
+    }
+}
+
+# Pool de connexions psycopg (paquet psycopg[pool]) ; à défaut, connexions
+# persistantes réutilisées pendant DB_CONN_MAX_AGE secondes
+DB_POOL = os.environ.get('DB_POOL', '1') == '1' and importlib.util.find_spec('psycopg_pool') is not None
+if DB_POOL:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+        # Attente maximale (secondes) d'une connexion libre
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+
+
+# Cache
+# Par défaut en mémoire locale ; en production utiliser un cache partagé
+# (ex: DJANGO_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache)
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'fiitech'),
     }
 }
 
@@ -131,20 +172,188 @@ STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
 
+# collectstatic : noms à empreinte et variantes .gz/.br (content.staticfiles),
+# activé par défaut hors DEBUG
+CONTENT_STATIC_COMPRESSION = os.environ.get(
+    'CONTENT_STATIC_COMPRESSION', '0' if DEBUG else '1'
+) == '1'
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "content.staticfiles.CompressedManifestStaticFilesStorage"
+            if CONTENT_STATIC_COMPRESSION
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
+
+# Service de STATIC_ROOT par l'application WSGI/ASGI (content.staticfiles)
+CONTENT_STATIC_HANDLER_ENABLED = os.environ.get(
+    'CONTENT_STATIC_HANDLER_ENABLED', '0' if DEBUG else '1'
+) == '1'
+# Cache des fichiers sans empreinte (secondes) et taille maximale gardée en mémoire
+CONTENT_STATIC_MAX_AGE = int(os.environ.get('CONTENT_STATIC_MAX_AGE', '60'))
+CONTENT_STATIC_MEMORY_LIMIT = int(os.environ.get('CONTENT_STATIC_MEMORY_LIMIT', str(512 * 1024)))
+
+# Fichiers media (uploads)
+MEDIA_URL = "media/"
+
+# Par défaut la racine du projet, où les images existantes sont enregistrées
+# (projects/...) ; seuls les préfixes de CONTENT_MEDIA_PREFIXES y sont servis.
+# Pour un autre emplacement, y déplacer le dossier projects/ avant de changer
+# DJANGO_MEDIA_ROOT.
+MEDIA_ROOT = Path(os.environ.get('DJANGO_MEDIA_ROOT', BASE_DIR))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Configuration Django REST Framework
+# Rendu MessagePack (?format=msgpack) si le paquet msgpack est installé (content.renderers)
+MSGPACK_ENABLED = importlib.util.find_spec('msgpack') is not None
+
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
-    ],
+    ] + (['content.renderers.MessagePackRenderer'] if MSGPACK_ENABLED else []),
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ] + (['content.renderers.MessagePackParser'] if MSGPACK_ENABLED else []),
+    # datetime laissés tels quels par les sérialiseurs : ISO 8601 en JSON
+    # (TIME_ZONE = UTC, sortie inchangée), horodatage natif en MessagePack
+    'DATETIME_FORMAT': None,
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
 }
+
+# Modèle de lecture en mémoire du catalogue public (content.read_model)
+CONTENT_READ_MODEL_ENABLED = os.environ.get('CONTENT_READ_MODEL_ENABLED', '0') == '1'
+# Intervalle minimal (secondes) entre deux vérifications de version
+CONTENT_READ_MODEL_CHECK_INTERVAL = float(os.environ.get('CONTENT_READ_MODEL_CHECK_INTERVAL', '2'))
+# Durée maximale (secondes) pendant laquelle un instantané non confirmé reste servi
+CONTENT_READ_MODEL_MAX_STALENESS = float(os.environ.get('CONTENT_READ_MODEL_MAX_STALENESS', '30'))
+
+# Profilage par échantillonnage des requêtes (content.middleware)
+CONTENT_PROFILER_ENABLED = os.environ.get('CONTENT_PROFILER_ENABLED', '0') == '1'
+# Fraction des requêtes profilées (0.0 à 1.0)
+CONTENT_PROFILER_SAMPLE_RATE = float(os.environ.get('CONTENT_PROFILER_SAMPLE_RATE', '0'))
+# Jeton attendu dans l'en-tête X-Profile-Token pour forcer le profilage
+CONTENT_PROFILER_TOKEN = os.environ.get('CONTENT_PROFILER_TOKEN', '')
+CONTENT_PROFILER_INTERVAL = float(os.environ.get('CONTENT_PROFILER_INTERVAL', '0.005'))
+CONTENT_PROFILER_DIR = Path(os.environ.get('CONTENT_PROFILER_DIR', BASE_DIR / 'profiles'))
+# 'collapsed' (flamegraph.pl) ou 'speedscope'
+CONTENT_PROFILER_FORMAT = os.environ.get('CONTENT_PROFILER_FORMAT', 'collapsed')
+
+# Nombre maximal de sous-requêtes par appel à /api/batch/
+CONTENT_BATCH_MAX_REQUESTS = int(os.environ.get('CONTENT_BATCH_MAX_REQUESTS', '10'))
+
+# Soumissions publiques de témoignages (content.write_behind)
+CONTENT_TESTIMONIAL_SPOOL_DIR = Path(os.environ.get(
+    'CONTENT_TESTIMONIAL_SPOOL_DIR', BASE_DIR / 'spool' / 'testimonials'
+))
+# Taille de lot et délai maximal (secondes) avant insertion en base
+CONTENT_TESTIMONIAL_BATCH_SIZE = int(os.environ.get('CONTENT_TESTIMONIAL_BATCH_SIZE', '50'))
+CONTENT_TESTIMONIAL_FLUSH_INTERVAL = float(os.environ.get('CONTENT_TESTIMONIAL_FLUSH_INTERVAL', '5'))
+
+# Service des fichiers media (content.media)
+# Préfixes servis sous MEDIA_URL (les autres fichiers de MEDIA_ROOT restent privés)
+CONTENT_MEDIA_PREFIXES = ('projects/',)
+CONTENT_MEDIA_MAX_AGE = int(os.environ.get('CONTENT_MEDIA_MAX_AGE', '3600'))
+# Noms considérés immuables (empreinte du contenu dans le nom) : cache d'un an
+CONTENT_MEDIA_IMMUTABLE_PATTERN = r'\.[0-9a-f]{8,}\.\w+$'
+# Délégation au serveur web : None, 'x-sendfile' (Apache, lighttpd) ou 'x-accel-redirect' (nginx)
+CONTENT_MEDIA_SENDFILE = os.environ.get('CONTENT_MEDIA_SENDFILE') or None
+# Emplacement interne nginx correspondant à MEDIA_ROOT
+CONTENT_MEDIA_ACCEL_PREFIX = os.environ.get('CONTENT_MEDIA_ACCEL_PREFIX', '/protected-media/')
+
+# Partitionnement PostgreSQL des témoignages (commande testimonial_partitions)
+CONTENT_TESTIMONIAL_PARTITION_GRANULARITY = os.environ.get(
+    'CONTENT_TESTIMONIAL_PARTITION_GRANULARITY', 'month'
+)
+CONTENT_TESTIMONIAL_PARTITIONS_AHEAD = int(os.environ.get('CONTENT_TESTIMONIAL_PARTITIONS_AHEAD', '3'))
+
+# Intervalle minimal (secondes) entre deux vérifications de version des index
+# en mémoire (content.indexes) ; les écritures locales sont appliquées aussitôt
+CONTENT_INDEX_CHECK_INTERVAL = float(os.environ.get('CONTENT_INDEX_CHECK_INTERVAL', '2'))
+
+# Actions en masse de l'admin (content.bulk_actions)
+# Lignes modifiées par transaction
+CONTENT_BULK_ACTION_CHUNK_SIZE = int(os.environ.get('CONTENT_BULK_ACTION_CHUNK_SIZE', '500'))
+# Exécution par la file de tâches de fond (désactiver pour un traitement immédiat)
+CONTENT_BULK_ACTIONS_ASYNC = os.environ.get('CONTENT_BULK_ACTIONS_ASYNC', '1') == '1'
+
+# Cache des fragments sérialisés par objet pour les listes (content.fragments)
+CONTENT_FRAGMENT_CACHE_ENABLED = os.environ.get('CONTENT_FRAGMENT_CACHE_ENABLED', '1') == '1'
+
+# Similarité estimée (0 à 1) à partir de laquelle un témoignage est signalé
+# comme doublon d'un témoignage plus ancien (content.minhash)
+CONTENT_DUPLICATE_THRESHOLD = float(os.environ.get('CONTENT_DUPLICATE_THRESHOLD', '0.6'))
+
+# Journal des requêtes SQL lentes (content.slow_queries, commande slow_query_report)
+CONTENT_SLOW_QUERY_LOG_ENABLED = os.environ.get('CONTENT_SLOW_QUERY_LOG_ENABLED', '0') == '1'
+CONTENT_SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('CONTENT_SLOW_QUERY_THRESHOLD_MS', '200'))
+CONTENT_SLOW_QUERY_LOG = Path(os.environ.get(
+    'CONTENT_SLOW_QUERY_LOG', BASE_DIR / 'logs' / 'slow_queries.jsonl'
+))
+# PostgreSQL : fraction des SELECT lents rejoués avec EXPLAIN (ANALYZE, BUFFERS),
+# et plafond de rejeux par minute et par processus
+CONTENT_SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.environ.get('CONTENT_SLOW_QUERY_EXPLAIN_SAMPLE_RATE', '0.1'))
+CONTENT_SLOW_QUERY_EXPLAIN_PER_MINUTE = int(os.environ.get('CONTENT_SLOW_QUERY_EXPLAIN_PER_MINUTE', '6'))
+
+# Durée maximale (ms) d'une instruction SQL pendant une requête HTTP, sur
+# PostgreSQL (content.database) : listes publiques, admin, autres vues.
+# Une vue peut fixer sa propre limite avec @statement_timeout(ms) ; 0 désactive.
+CONTENT_STATEMENT_TIMEOUT_PUBLIC_MS = int(os.environ.get('CONTENT_STATEMENT_TIMEOUT_PUBLIC_MS', '2000'))
+CONTENT_STATEMENT_TIMEOUT_ADMIN_MS = int(os.environ.get('CONTENT_STATEMENT_TIMEOUT_ADMIN_MS', '30000'))
+CONTENT_STATEMENT_TIMEOUT_MS = int(os.environ.get('CONTENT_STATEMENT_TIMEOUT_MS', '5000'))
+
+# File de tâches de fond en base (content.jobs, commande run_worker)
+CONTENT_JOB_MAX_ATTEMPTS = int(os.environ.get('CONTENT_JOB_MAX_ATTEMPTS', '5'))
+# Délai avant nouvelle tentative : base * 2^(tentative - 1), plafonné (secondes)
+CONTENT_JOB_BACKOFF_BASE = float(os.environ.get('CONTENT_JOB_BACKOFF_BASE', '10'))
+CONTENT_JOB_BACKOFF_MAX = float(os.environ.get('CONTENT_JOB_BACKOFF_MAX', '3600'))
+# Tâche « en cours » sans nouvelles au-delà de ce délai (secondes) : worker arrêté, reprise
+CONTENT_JOB_LOCK_TIMEOUT = int(os.environ.get('CONTENT_JOB_LOCK_TIMEOUT', '600'))
+CONTENT_JOB_POLL_INTERVAL = float(os.environ.get('CONTENT_JOB_POLL_INTERVAL', '1'))
+# Largeurs (px) des dérivés WebP des images de projets
+CONTENT_IMAGE_VARIANT_WIDTHS = (480, 960)
+
+# Envois fractionnés des images de projets (content.uploads)
+CONTENT_UPLOAD_MAX_SIZE = int(os.environ.get('CONTENT_UPLOAD_MAX_SIZE', str(50 * 1024 * 1024)))
+CONTENT_UPLOAD_MAX_CHUNK_SIZE = int(os.environ.get('CONTENT_UPLOAD_MAX_CHUNK_SIZE', str(8 * 1024 * 1024)))
+# Envois sans nouveau morceau depuis ce délai (heures) : supprimés
+CONTENT_UPLOAD_EXPIRY_HOURS = int(os.environ.get('CONTENT_UPLOAD_EXPIRY_HOURS', '24'))
+
+# Purge ciblée du cache partagé (CDN, Varnish) par clés de substitution (content.surrogate_keys)
+CONTENT_PURGER_URL = os.environ.get('CONTENT_PURGER_URL', '')
+CONTENT_PURGER_TOKEN = os.environ.get('CONTENT_PURGER_TOKEN', '')
+# Sans URL de purge, aucun appel : NullPurger
+CONTENT_PURGER_BACKEND = os.environ.get(
+    'CONTENT_PURGER_BACKEND',
+    'content.surrogate_keys.HTTPPurger' if CONTENT_PURGER_URL else 'content.surrogate_keys.NullPurger'
+)
+CONTENT_PURGER_TIMEOUT = float(os.environ.get('CONTENT_PURGER_TIMEOUT', '5'))
+# Clés par appel (les API de purge limitent leur nombre)
+CONTENT_PURGER_BATCH_SIZE = int(os.environ.get('CONTENT_PURGER_BATCH_SIZE', '30'))
+# Préfixe des clés quand plusieurs sites partagent le même service de cache
+CONTENT_SURROGATE_KEY_PREFIX = os.environ.get('CONTENT_SURROGATE_KEY_PREFIX', '')
+
+# Un seul calcul simultané par page de liste ou statistique (content.single_flight)
+CONTENT_SINGLE_FLIGHT_ENABLED = os.environ.get('CONTENT_SINGLE_FLIGHT_ENABLED', '1') == '1'
+# Durée de vie (secondes) du verrou entre workers : un worker arrêté ne bloque pas au-delà
+CONTENT_SINGLE_FLIGHT_LOCK_TIMEOUT = float(os.environ.get('CONTENT_SINGLE_FLIGHT_LOCK_TIMEOUT', '30'))
+# Attente maximale (secondes) du résultat d'un autre calcul avant de calculer soi-même
+CONTENT_SINGLE_FLIGHT_WAIT = float(os.environ.get('CONTENT_SINGLE_FLIGHT_WAIT', '5'))
+# Âge maximal (secondes) de la valeur précédente servie pendant un calcul
+CONTENT_SINGLE_FLIGHT_STALE_TTL = int(os.environ.get('CONTENT_SINGLE_FLIGHT_STALE_TTL', '300'))
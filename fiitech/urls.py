@@ -1,7 +1,10 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from content.media import serve_media
 
 # Personnalisation du titre de l'admin
 admin.site.site_header = "FiiTech Solutions - Administration"
@@ -11,8 +14,10 @@ admin.site.index_title = "Panneau d'administration"
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('content.urls')),
+    # Fichiers media (images des projets), en développement comme en production
+    re_path(
+        r'^%s(?P<path>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')),
+        serve_media,
+        name='media'
+    ),
 ]
-
-# Servir les fichiers media en développement
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
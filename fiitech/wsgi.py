@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "fiitech.settings")
 
 application = get_wsgi_application()
+
+# Fichiers statiques servis directement (désactivé en DEBUG, cf. settings)
+from content.staticfiles import wrap_wsgi  # noqa: E402
+
+application = wrap_wsgi(application)